@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from django.core.validators import validate_email
+from django.db.models.functions import Lower
 
 from apps.usuarios.models import User
 
@@ -30,15 +31,14 @@ class AlteracaoEmailSerializer(serializers.Serializer):
 
     def validate_new_email(self, value):
 
+        value = value.strip().lower()
+
         usuario = self.context["request"].user
-        if usuario.email == value:
+        if (usuario.email or "").lower() == value:
             raise serializers.ValidationError("O novo e-mail não pode ser igual ao atual.")
 
         if not value.endswith("@sme.prefeitura.sp.gov.br"):
             raise serializers.ValidationError("Utilize seu e-mail institucional.")
-        
-        if User.objects.filter(email=value).exists():
-            raise serializers.ValidationError("Este e-mail já está cadastrado.")
 
         try:
             validate_email(value)
@@ -46,4 +46,8 @@ class AlteracaoEmailSerializer(serializers.Serializer):
         except Exception:
             raise serializers.ValidationError("Digite um e-mail válido!")
 
+        # Consulta única pelo índice funcional em lower(email)
+        if User.objects.alias(email_lower=Lower("email")).filter(email_lower=value).exists():
+            raise serializers.ValidationError("Este e-mail já está cadastrado.")
+
         return value
\ No newline at end of file
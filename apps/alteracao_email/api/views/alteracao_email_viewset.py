@@ -7,6 +7,7 @@ from rest_framework.permissions import IsAuthenticated
 
 from apps.alteracao_email.api.serializers.alteracao_email_serializer import AlteracaoEmailSerializer
 from apps.alteracao_email.services.alteracao_email_service import AlteracaoEmailService
+from apps.helpers.idempotencia import idempotente
 from apps.usuarios.services.sme_integracao_service import SmeIntegracaoService
 
 from apps.helpers.exceptions import (
@@ -20,6 +21,7 @@ logger = logging.getLogger(__name__)
 
 class SolicitarAlteracaoEmailViewSet(viewsets.ViewSet):
     permission_classes = [IsAuthenticated]
+    orcamento_consultas = 3
 
     def create(self, request):
         serializer = AlteracaoEmailSerializer(data=request.data, context={"request": request})
@@ -42,20 +44,20 @@ class SolicitarAlteracaoEmailViewSet(viewsets.ViewSet):
 
 class ValidarAlteracaoEmailViewSet(viewsets.ViewSet):
     permission_classes = [IsAuthenticated]
+    orcamento_consultas = 4
 
+    @idempotente
     def update(self, request, pk=None):
 
+        usuario = None
         try:
             with transaction.atomic():
-                usuario , email_request = AlteracaoEmailService.validar(pk)
+                usuario, novo_email = AlteracaoEmailService.consumir(pk)
 
-                SmeIntegracaoService.altera_email(usuario.username, email_request.novo_email)
+                SmeIntegracaoService.altera_email(usuario.username, novo_email)
 
-                usuario.email = email_request.novo_email
-                usuario.save()
-
-                email_request.ja_usado = True
-                email_request.save()
+                usuario.email = novo_email
+                usuario.save(update_fields=["email"])
 
                 return Response(
                     {"message": "E-mail alterado com sucesso.", "email": usuario.email},
@@ -69,7 +71,7 @@ class ValidarAlteracaoEmailViewSet(viewsets.ViewSet):
             return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
         
         except SmeIntegracaoException as e:
-            logger.error("Erro na integração SME para alteração de email do usuário ID %s: %s", usuario, str(e))
+            logger.error("Erro na integração SME para alteração de email do usuário ID %s: %s", getattr(usuario, "id", None), str(e))
             return Response(
                 {"detail": str(e)},
                 status=status.HTTP_400_BAD_REQUEST,
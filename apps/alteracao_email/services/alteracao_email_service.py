@@ -1,7 +1,11 @@
+import uuid
 import logging
 import environ
+from django.db import connection
+from django.http import Http404
 from django.utils.timezone import now, timedelta
 from django.shortcuts import get_object_or_404
+from django.contrib.auth import get_user_model
 
 from apps.alteracao_email.models.alteracao_email import AlteracaoEmail
 from apps.usuarios.services.envia_email_service import EnviaEmailService
@@ -12,10 +16,13 @@ from apps.helpers.exceptions import (
 
 env = environ.Env()
 logger = logging.getLogger(__name__)
+User = get_user_model()
 
 
 class AlteracaoEmailService:
 
+    VALIDADE_TOKEN = timedelta(minutes=30)
+
     @staticmethod
     def solicitar(usuario, novo_email):
         
@@ -46,8 +53,72 @@ class AlteracaoEmailService:
         if email_request.ja_usado:
             raise TokenJaUtilizadoException("Este token já foi utilizado.")
 
-        if email_request.criado_em < now() - timedelta(minutes=30):
+        if email_request.criado_em < now() - AlteracaoEmailService.VALIDADE_TOKEN:
             raise TokenExpiradoException("Token expirado.")
 
         logger.info(f"E-mail alterado com sucesso: {usuario.email}")
-        return usuario, email_request
\ No newline at end of file
+        return usuario, email_request
+
+    @staticmethod
+    def consumir(token):
+        """
+        Marca o token como utilizado em um único UPDATE condicional.
+
+        Apenas uma confirmação concorrente consegue consumir o token: as demais
+        não encontram mais a linha com ja_usado = false. Deve ser chamado dentro
+        de uma transação para que uma falha posterior (ex.: integração SME)
+        desfaça o consumo.
+
+        Returns:
+            tuple[User, str]: usuário dono da solicitação e o novo e-mail.
+        """
+        try:
+            token = uuid.UUID(str(token))
+        except ValueError:
+            raise Http404("Token inválido.")
+
+        meta = AlteracaoEmail._meta
+        quote = connection.ops.quote_name
+        limite = now() - AlteracaoEmailService.VALIDADE_TOKEN
+
+        sql = (
+            f"UPDATE {quote(meta.db_table)} "
+            f"SET {quote('ja_usado')} = %s "
+            f"WHERE {quote('token')} = %s AND {quote('ja_usado')} = %s AND {quote('criado_em')} > %s "
+            f"RETURNING {quote('usuario_id')}, {quote('novo_email')}"
+        )
+        params = [
+            True,
+            meta.get_field("token").get_db_prep_value(token, connection),
+            False,
+            meta.get_field("criado_em").get_db_prep_value(limite, connection),
+        ]
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            row = cursor.fetchone()
+
+        if row is None:
+            AlteracaoEmailService._motivo_falha_consumo(token, limite)
+
+        usuario_id, novo_email = row
+        usuario = User.objects.get(pk=usuario_id)
+
+        logger.info("Token de alteração de e-mail consumido para o usuário ID %s", usuario_id)
+        return usuario, novo_email
+
+    @staticmethod
+    def _motivo_falha_consumo(token, limite):
+        """ Identifica por que o token não pôde ser consumido (caminho de erro). """
+
+        email_request = get_object_or_404(
+            AlteracaoEmail.objects.only("ja_usado", "criado_em"), token=token
+        )
+
+        if email_request.ja_usado:
+            raise TokenJaUtilizadoException("Este token já foi utilizado.")
+
+        if email_request.criado_em <= limite:
+            raise TokenExpiradoException("Token expirado.")
+
+        raise TokenJaUtilizadoException("Este token já foi utilizado.")
@@ -83,6 +83,35 @@ class TestAlteracaoEmailSerializer:
         assert not serializer.is_valid()
         assert serializer.errors["detail"] == "Este e-mail já está cadastrado."
 
+    def test_email_ja_em_uso_ignora_maiusculas(self, user, user_factory):
+        user_factory(
+            username="outro",
+            email="existente@sme.prefeitura.sp.gov.br",
+            cpf="98765432100",
+        )
+
+        serializer = self.get_serializer(user, "Existente@SME.prefeitura.sp.gov.br")
+
+        assert not serializer.is_valid()
+        assert serializer.errors["detail"] == "Este e-mail já está cadastrado."
+
+    def test_email_normalizado(self, user):
+        serializer = self.get_serializer(user, " Novo.Email@SME.Prefeitura.SP.gov.br ")
+
+        assert serializer.is_valid(), serializer.errors
+        assert serializer.validated_data["new_email"] == "novo.email@sme.prefeitura.sp.gov.br"
+
+    def test_validacoes_sintaticas_nao_consultam_banco(self, user, django_assert_num_queries):
+        with django_assert_num_queries(0):
+            assert not self.get_serializer(user, "novo@gmail.com").is_valid()
+            assert not self.get_serializer(user, "invalido@@sme.prefeitura.sp.gov.br").is_valid()
+
+    def test_verificacao_de_duplicidade_em_uma_consulta(self, user, django_assert_num_queries):
+        serializer = self.get_serializer(user, "novo_email@sme.prefeitura.sp.gov.br")
+
+        with django_assert_num_queries(1):
+            assert serializer.is_valid(), serializer.errors
+
     def test_formato_de_email_invalido(self, user):
         email_invalido = "novo@gmail.com@"
         serializer = self.get_serializer(user, email_invalido)
@@ -80,7 +80,7 @@ class TestValidarAlteracaoEmailViewSet:
 
         with (
             patch.object(
-                AlteracaoEmailService, "validar", return_value=(user, email_request)
+                AlteracaoEmailService, "consumir", return_value=(user, email_request.novo_email)
             ),
             patch("apps.alteracao_email.api.views.alteracao_email_viewset.SmeIntegracaoService.altera_email") as mock_integracao,
         ):
@@ -92,18 +92,73 @@ class TestValidarAlteracaoEmailViewSet:
         assert response.data["message"] == "E-mail alterado com sucesso."
         assert response.data["email"] == email_request.novo_email
 
+        user.refresh_from_db()
+        assert user.email == email_request.novo_email
+
+    def test_update_consome_token(self, api_client, user):
+        api_client.force_authenticate(user=user)
+
+        email_request = AlteracaoEmail.objects.create(
+            usuario=user,
+            novo_email="novo@sme.prefeitura.sp.gov.br",
+        )
+
+        with patch("apps.alteracao_email.api.views.alteracao_email_viewset.SmeIntegracaoService.altera_email"):
+            response = api_client.put(f"{self.endpoint}{email_request.token}/")
+            segunda = api_client.put(f"{self.endpoint}{email_request.token}/")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert segunda.status_code == status.HTTP_400_BAD_REQUEST
+        assert segunda.data["detail"] == "Este token já foi utilizado."
+
         user.refresh_from_db()
         email_request.refresh_from_db()
         assert user.email == email_request.novo_email
         assert email_request.ja_usado is True
 
+    def test_update_repetido_com_idempotency_key_nao_chama_o_sme(self, api_client, user):
+        api_client.force_authenticate(user=user)
+
+        email_request = AlteracaoEmail.objects.create(
+            usuario=user,
+            novo_email="novo@sme.prefeitura.sp.gov.br",
+        )
+
+        with patch("apps.alteracao_email.api.views.alteracao_email_viewset.SmeIntegracaoService.altera_email") as mock_integracao:
+            response = api_client.put(f"{self.endpoint}{email_request.token}/", HTTP_IDEMPOTENCY_KEY="chave-1")
+            repetida = api_client.put(f"{self.endpoint}{email_request.token}/", HTTP_IDEMPOTENCY_KEY="chave-1")
+
+        mock_integracao.assert_called_once()
+        assert repetida.status_code == status.HTTP_200_OK
+        assert repetida.data == response.data
+        assert repetida["Idempotent-Replayed"] == "true"
+
+    def test_update_falha_sme_nao_consome_token(self, api_client, user):
+        api_client.force_authenticate(user=user)
+
+        email_request = AlteracaoEmail.objects.create(
+            usuario=user,
+            novo_email="novo@sme.prefeitura.sp.gov.br",
+        )
+
+        with patch(
+            "apps.alteracao_email.api.views.alteracao_email_viewset.SmeIntegracaoService.altera_email",
+            side_effect=SmeIntegracaoException("Falha na SME"),
+        ):
+            response = api_client.put(f"{self.endpoint}{email_request.token}/")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        email_request.refresh_from_db()
+        assert email_request.ja_usado is False
+
     def test_update_token_ja_utilizado(self, api_client, user):
         api_client.force_authenticate(user=user)
         pk = "456"
 
         with patch.object(
             AlteracaoEmailService,
-            "validar",
+            "consumir",
             side_effect=TokenJaUtilizadoException("Token já foi utilizado."),
         ):
             response = api_client.put(f"{self.endpoint}{pk}/")
@@ -117,7 +172,7 @@ class TestValidarAlteracaoEmailViewSet:
 
         with patch.object(
             AlteracaoEmailService,
-            "validar",
+            "consumir",
             side_effect=TokenExpiradoException("Token expirado."),
         ):
             response = api_client.put(f"{self.endpoint}{pk}/")
@@ -131,7 +186,7 @@ class TestValidarAlteracaoEmailViewSet:
 
         with patch.object(
             AlteracaoEmailService,
-            "validar",
+            "consumir",
             side_effect=Exception("Falha inesperada"),
         ):
             response = api_client.put(f"{self.endpoint}{pk}/")
@@ -150,7 +205,7 @@ class TestValidarAlteracaoEmailViewSet:
 
         with (
             patch.object(
-                AlteracaoEmailService, "validar", return_value=(user, email_request)
+                AlteracaoEmailService, "consumir", return_value=(user, email_request.novo_email)
             ),
             patch(
                 "apps.alteracao_email.api.views.alteracao_email_viewset.SmeIntegracaoService.altera_email",
@@ -1,7 +1,9 @@
 import uuid
 import secrets
+import threading
 import pytest
 from unittest.mock import patch
+from django.db import connection, transaction, OperationalError
 from django.http import Http404
 from django.utils.timezone import now, timedelta
 
@@ -91,4 +93,110 @@ class TestValidar:
         token_inexistente = uuid.uuid4()
 
         with pytest.raises(Http404):
-            AlteracaoEmailService.validar(token_inexistente)
\ No newline at end of file
+            AlteracaoEmailService.validar(token_inexistente)
+
+@pytest.mark.django_db
+class TestConsumir:
+
+    def test_consumir_sucesso(self, user):
+        email_request = AlteracaoEmail.objects.create(
+            usuario=user,
+            novo_email="novo@sme.prefeitura.sp.gov.br",
+        )
+
+        usuario, novo_email = AlteracaoEmailService.consumir(email_request.token)
+
+        assert usuario == user
+        assert novo_email == "novo@sme.prefeitura.sp.gov.br"
+        email_request.refresh_from_db()
+        assert email_request.ja_usado is True
+
+    def test_consumir_token_ja_usado(self, user):
+        email_request = AlteracaoEmail.objects.create(
+            usuario=user,
+            novo_email="novo@sme.prefeitura.sp.gov.br",
+            ja_usado=True,
+        )
+
+        with pytest.raises(TokenJaUtilizadoException):
+            AlteracaoEmailService.consumir(email_request.token)
+
+    def test_consumir_duas_vezes(self, user):
+        email_request = AlteracaoEmail.objects.create(
+            usuario=user,
+            novo_email="novo@sme.prefeitura.sp.gov.br",
+        )
+
+        AlteracaoEmailService.consumir(email_request.token)
+
+        with pytest.raises(TokenJaUtilizadoException):
+            AlteracaoEmailService.consumir(email_request.token)
+
+    def test_consumir_token_expirado(self, user):
+        email_request = AlteracaoEmail.objects.create(
+            usuario=user,
+            novo_email="novo@sme.prefeitura.sp.gov.br",
+        )
+        email_request.criado_em = now() - timedelta(minutes=31)
+        email_request.save(update_fields=["criado_em"])
+
+        with pytest.raises(TokenExpiradoException):
+            AlteracaoEmailService.consumir(email_request.token)
+
+        email_request.refresh_from_db()
+        assert email_request.ja_usado is False
+
+    def test_consumir_token_inexistente(self):
+        with pytest.raises(Http404):
+            AlteracaoEmailService.consumir(uuid.uuid4())
+
+    def test_consumir_token_malformado(self):
+        with pytest.raises(Http404):
+            AlteracaoEmailService.consumir("123")
+
+    def test_consumir_usa_um_unico_update(self, user, django_assert_max_num_queries):
+        email_request = AlteracaoEmail.objects.create(
+            usuario=user,
+            novo_email="novo@sme.prefeitura.sp.gov.br",
+        )
+
+        with django_assert_max_num_queries(2):
+            AlteracaoEmailService.consumir(email_request.token)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_consumir_confirmacoes_concorrentes(user):
+    email_request = AlteracaoEmail.objects.create(
+        usuario=user,
+        novo_email="novo@sme.prefeitura.sp.gov.br",
+    )
+
+    tentativas = 8
+    barreira = threading.Barrier(tentativas)
+    resultados = []
+
+    def confirmar():
+        barreira.wait()
+        try:
+            with transaction.atomic():
+                AlteracaoEmailService.consumir(email_request.token)
+            resultados.append("ok")
+        except TokenJaUtilizadoException:
+            resultados.append("ja_usado")
+        except OperationalError:
+            # SQLite serializa escritas concorrentes recusando a conexão
+            resultados.append("bloqueado")
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=confirmar) for _ in range(tentativas)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(resultados) == tentativas
+    assert resultados.count("ok") == 1
+
+    email_request.refresh_from_db()
+    assert email_request.ja_usado is True
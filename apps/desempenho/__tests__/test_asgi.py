@@ -0,0 +1,100 @@
+import asyncio
+import json
+import pytest
+from unittest.mock import patch
+
+from apps.helpers import cliente_sme
+from config.asgi import LimiteConcorrencia, Lifespan
+
+
+async def _chamar(app, scope, mensagens=()):
+    fila = asyncio.Queue()
+    for mensagem in mensagens:
+        fila.put_nowait(mensagem)
+    enviadas = []
+
+    async def send(mensagem):
+        enviadas.append(mensagem)
+
+    await app(scope, fila.get, send)
+    return enviadas
+
+
+def test_limite_concorrencia_responde_503_quando_esgotado():
+    liberar = asyncio.Event()
+    atendidas = []
+
+    async def app_lenta(scope, receive, send):
+        atendidas.append(scope["path"])
+        await liberar.wait()
+
+    async def cenario():
+        app = LimiteConcorrencia(app_lenta, max_concorrencia=1, espera_maxima=0.05)
+        primeira = asyncio.create_task(_chamar(app, {"type": "http", "method": "GET", "path": "/a"}))
+        await asyncio.sleep(0)
+        recusada = await _chamar(app, {"type": "http", "method": "GET", "path": "/b"})
+        liberar.set()
+        await primeira
+        await _chamar(app, {"type": "http", "method": "GET", "path": "/c"})
+        return recusada
+
+    recusada = asyncio.run(cenario())
+
+    assert recusada[0]["status"] == 503
+    assert (b"retry-after", b"1") in recusada[0]["headers"]
+    assert json.loads(recusada[1]["body"])["detail"]
+    assert atendidas == ["/a", "/c"]
+
+
+def test_lifespan_inicia_e_encerra():
+    async def app(scope, receive, send):
+        raise AssertionError("lifespan não deve chegar ao Django")
+
+    with patch("config.asgi.iniciar") as iniciar, patch("config.asgi.encerrar") as encerrar:
+        enviadas = asyncio.run(_chamar(
+            Lifespan(app),
+            {"type": "lifespan"},
+            [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}],
+        ))
+
+    assert [m["type"] for m in enviadas] == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
+    iniciar.assert_called_once()
+    encerrar.assert_called_once()
+
+
+def test_lifespan_falha_no_startup():
+    with patch("config.asgi.iniciar", side_effect=RuntimeError("SME_INTEGRACAO_URL inválida")):
+        enviadas = asyncio.run(_chamar(Lifespan(None), {"type": "lifespan"}, [{"type": "lifespan.startup"}]))
+
+    assert enviadas == [{"type": "lifespan.startup.failed", "message": "SME_INTEGRACAO_URL inválida"}]
+
+
+@pytest.mark.django_db
+def test_iniciar_e_encerrar_abrem_e_fecham_a_sessao_sme():
+    import gc
+    from config.asgi import encerrar, iniciar
+
+    try:
+        iniciar()
+    finally:
+        gc.unfreeze()
+    sessao = cliente_sme._sessao
+    assert sessao is not None
+    assert cliente_sme.sessao_sme() is sessao
+
+    encerrar()
+
+    assert cliente_sme._sessao is None
+    assert cliente_sme.sessao_sme() is not sessao
+
+
+def test_sessao_sme_compartilhada_sem_cookies(settings):
+    settings.SME_INTEGRACAO_POOL_CONEXOES = 7
+    cliente_sme.fechar_sessao_sme()
+    sessao = cliente_sme.sessao_sme()
+
+    assert cliente_sme.sessao_sme() is sessao
+    assert sessao.get_adapter("https://sme.test")._pool_maxsize == 7
+    # a sessão atende todos os usuários: nenhum domínio pode gravar cookies
+    assert sessao.cookies._policy.allowed_domains() == ()
+    cliente_sme.fechar_sessao_sme()
@@ -0,0 +1,150 @@
+import json
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from apps.desempenho.carga import (
+    ExecutorCarga,
+    baseline_do_relatorio,
+    comparar_com_baseline,
+    interpretar_mix,
+    relatorio_carga,
+)
+from apps.desempenho.estatisticas import percentil, resumo_latencias
+from apps.desempenho.sme_fake import ConfiguracaoSmeFake, ServidorSmeFake
+
+
+class TestEstatisticas:
+
+    def test_percentil_nearest_rank(self):
+        valores = list(range(1, 101))
+
+        assert percentil(valores, 50) == 50
+        assert percentil(valores, 95) == 95
+        assert percentil(valores, 100) == 100
+
+    def test_percentil_lista_vazia(self):
+        assert percentil([], 95) == 0.0
+
+    def test_resumo_latencias(self):
+        resumo = resumo_latencias([10, 20, 30, 40])
+
+        assert resumo["media_ms"] == 25
+        assert resumo["p50_ms"] == 20
+        assert resumo["max_ms"] == 40
+
+
+class TestMix:
+
+    def test_interpretar_mix(self):
+        assert interpretar_mix("login=2, dres=3,me") == {"login": 2.0, "dres": 3.0, "me": 1.0}
+
+    @pytest.mark.parametrize("mix", ["", "inexistente=1", "login=0"])
+    def test_mix_invalido(self, mix):
+        with pytest.raises(ValueError):
+            interpretar_mix(mix)
+
+
+class TestRelatorio:
+
+    def test_agrupa_por_endpoint_e_conta_erros(self):
+        amostras = [
+            ("login", 100.0, 200),
+            ("login", 300.0, 401),
+            ("dres", 50.0, 500),
+            ("dres", 70.0, "erro"),
+        ]
+
+        relatorio = relatorio_carga(amostras, decorrido=2.0, concorrencia=2)
+
+        assert relatorio["total"]["requisicoes"] == 4
+        assert relatorio["total"]["throughput_rps"] == 2.0
+        assert relatorio["endpoints"]["login"]["erros"] == 0
+        assert relatorio["endpoints"]["dres"]["taxa_erro"] == 1.0
+
+    def test_sem_regressao(self):
+        relatorio = relatorio_carga([("dres", 100.0, 200)] * 10, 1.0, 1)
+        baseline = baseline_do_relatorio(relatorio)
+
+        assert comparar_com_baseline(relatorio, baseline) == []
+        assert "throughput_rps" not in baseline["endpoints"]["dres"]
+        assert "throughput_rps" in baseline["endpoints"]["total"]
+
+    def test_regressao_de_latencia(self):
+        baseline = baseline_do_relatorio(relatorio_carga([("dres", 100.0, 200)] * 10, 1.0, 1))
+        atual = relatorio_carga([("dres", 200.0, 200)] * 10, 1.0, 1)
+
+        violacoes = comparar_com_baseline(atual, baseline, tolerancia=0.2)
+
+        assert any(v.startswith("dres: p95_ms") for v in violacoes)
+
+    def test_folga_absoluta_para_endpoints_rapidos(self):
+        baseline = baseline_do_relatorio(relatorio_carga([("me", 4.0, 200)] * 10, 1.0, 1))
+        atual = relatorio_carga([("me", 9.0, 200)] * 10, 1.0, 1)
+
+        assert comparar_com_baseline(atual, baseline, tolerancia=0.2, folga_ms=10) == []
+
+    def test_regressao_de_throughput_e_erros(self):
+        baseline = baseline_do_relatorio(relatorio_carga([("dres", 100.0, 200)] * 10, 1.0, 1))
+        atual = relatorio_carga([("dres", 100.0, 500)] * 10, 10.0, 1)
+
+        violacoes = comparar_com_baseline(atual, baseline)
+
+        assert any("throughput" in v for v in violacoes)
+        assert any("taxa de erro" in v for v in violacoes)
+
+
+@pytest.fixture
+def servidor_sme(monkeypatch):
+    monkeypatch.setenv("GUIDE_PERFIL_SIGNA", "0000")
+    monkeypatch.setenv("AMBIENTE_URL", "http://testserver")
+
+    servidor = ServidorSmeFake(
+        ("127.0.0.1", 0), ConfiguracaoSmeFake(dres=2, ues_por_dre=3, usuarios=5, perfil="0000")
+    )
+    servidor.iniciar_em_thread()
+    monkeypatch.setenv("SME_INTEGRACAO_URL", servidor.url)
+    yield servidor
+    servidor.shutdown()
+    servidor.server_close()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_carga_contra_live_server(live_server, servidor_sme, settings):
+    settings.EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
+
+    relatorio = ExecutorCarga(
+        live_server.url,
+        interpretar_mix("login=1,dres=1,ues=1,designacao=1,me=1,esqueci_senha=1"),
+        concorrencia=1,
+        duracao=None,
+        requisicoes=30,
+        usuarios=5,
+        total_dres=2,
+    ).executar()
+
+    assert relatorio["total"]["requisicoes"] == 30
+    assert relatorio["total"]["erros"] == 0
+    assert "login" in relatorio["endpoints"]
+
+
+def test_comando_mix_invalido():
+    with pytest.raises(CommandError):
+        call_command("teste_carga", "--mix", "inexistente=1")
+
+
+def test_comando_falha_com_regressao(tmp_path, servidor_sme, monkeypatch):
+    relatorio = relatorio_carga([("dres", 1.0, 200)] * 5, 1.0, 1)
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps(baseline_do_relatorio(relatorio)))
+    saida = tmp_path / "saida.json"
+
+    lento = relatorio_carga([("dres", 500.0, 200)] * 5, 1.0, 1)
+    monkeypatch.setattr(ExecutorCarga, "executar", lambda self: lento)
+
+    with pytest.raises(CommandError):
+        call_command(
+            "teste_carga", "--url", "http://localhost", "--baseline", str(baseline), "--saida", str(saida)
+        )
+
+    assert json.loads(saida.read_text())["endpoints"]["dres"]["p95_ms"] == 500.0
@@ -0,0 +1,45 @@
+import brotli
+import pytest
+from django.core.management import call_command
+from django.templatetags.static import static
+from django.test import Client, override_settings
+
+CSS = "body { color: #333; }\n" * 200
+
+
+@pytest.fixture
+def estaticos_coletados(tmp_path, settings):
+    origem = tmp_path / "origem"
+    origem.mkdir()
+    (origem / "app.css").write_text(CSS)
+
+    settings.STATICFILES_DIRS = [origem]
+    settings.STATICFILES_FINDERS = ["django.contrib.staticfiles.finders.FileSystemFinder"]
+    settings.STATIC_ROOT = tmp_path / "staticfiles"
+    settings.STORAGES = {
+        **settings.STORAGES,
+        "staticfiles": {"BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"},
+    }
+    with override_settings(DEBUG=False):
+        call_command("collectstatic", interactive=False, verbosity=0)
+        yield settings.STATIC_ROOT
+
+
+def test_collectstatic_gera_hash_e_versoes_comprimidas(estaticos_coletados):
+    url = static("app.css")
+    nome = url.rsplit("/", 1)[-1]
+
+    assert nome != "app.css" and nome.startswith("app.")
+    assert (estaticos_coletados / nome).exists()
+    assert (estaticos_coletados / f"{nome}.gz").exists()
+    assert (estaticos_coletados / f"{nome}.br").exists()
+
+
+def test_whitenoise_serve_pre_comprimido_com_cache_longo(estaticos_coletados):
+    response = Client().get(static("app.css"), HTTP_ACCEPT_ENCODING="gzip, br")
+
+    assert response.status_code == 200
+    assert response["Content-Encoding"] == "br"
+    assert "immutable" in response["Cache-Control"]
+    assert "max-age=315360000" in response["Cache-Control"]
+    assert brotli.decompress(b"".join(response.streaming_content)).decode() == CSS
@@ -0,0 +1,57 @@
+import gc
+import json
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from apps.desempenho.importacao import formatar_arvore, interpretar_importtime
+
+SAIDA = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 |     c
+import time:       200 |        300 |   b
+import time:      5000 |       5000 |   d
+import time:      1000 |       6300 | a
+import time:        50 |         50 | e
+"""
+
+
+def test_interpretar_importtime_monta_arvore():
+    raizes = interpretar_importtime(SAIDA)
+
+    assert [r.nome for r in raizes] == ["a", "e"]
+    a = raizes[0]
+    assert (a.proprio_us, a.acumulado_us) == (1000, 6300)
+    assert [f.nome for f in a.filhos] == ["b", "d"]
+    assert a.filhos[0].filhos[0].nome == "c"
+
+
+def test_formatar_arvore_ordena_e_filtra():
+    linhas = formatar_arvore(interpretar_importtime(SAIDA), minimo_ms=0.2, profundidade=2)
+
+    assert [linha.split()[-1] for linha in linhas] == ["a", "d", "b"]
+
+
+def test_comando_json(capsys):
+    call_command("perfil_importacao", "--modulo", "apps.helpers.utils", "--json", "--minimo-ms", "0")
+
+    raizes = json.loads(capsys.readouterr().out)
+    assert "apps.helpers.utils" in [r["nome"] for r in raizes]
+
+
+def test_comando_modulo_inexistente():
+    with pytest.raises(CommandError):
+        call_command("perfil_importacao", "--modulo", "apps.nao_existe")
+
+
+@pytest.mark.django_db
+def test_aquecer_carrega_urlconf():
+    from django.urls import get_resolver
+    from config.aquecimento import aquecer
+
+    try:
+        aquecer()
+        assert gc.get_freeze_count() > 0
+        assert "url_patterns" in get_resolver().__dict__
+    finally:
+        gc.unfreeze()
@@ -0,0 +1,59 @@
+import json
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from apps.desempenho.microbenchmarks import BENCHMARKS, comparar_com_baseline, executar, medir
+from apps.usuarios.models import User
+
+
+def test_medir_retorna_tempo_por_operacao():
+    resultado = medir(lambda: sum(range(10)), repeticoes=2, tempo_minimo=0.001)
+
+    assert resultado["repeticoes"] == 2
+    assert resultado["loops"] >= 1
+    assert 0 < resultado["min_us"] <= resultado["mediana_us"] <= resultado["max_us"]
+
+
+@pytest.mark.django_db
+def test_executar_todos_sem_deixar_dados():
+    resultados = executar(repeticoes=1, tempo_minimo=0.001)
+
+    assert set(resultados) == set(BENCHMARKS)
+    assert not User.objects.exists()
+
+
+@pytest.mark.django_db
+def test_executar_benchmark_desconhecido():
+    with pytest.raises(ValueError):
+        executar(["inexistente"])
+
+
+def test_comparar_com_baseline():
+    baseline = {"anonimizar_email": {"mediana_us": 1.0}}
+
+    assert comparar_com_baseline({"anonimizar_email": {"mediana_us": 1.2}}, baseline, 0.25) == []
+    assert comparar_com_baseline({"anonimizar_email": {"mediana_us": 1.3}}, baseline, 0.25)
+    assert comparar_com_baseline({"outro": {"mediana_us": 99}}, baseline) == []
+
+
+@pytest.mark.django_db
+def test_comando_atualiza_e_compara_baseline(tmp_path, monkeypatch):
+    baseline = tmp_path / "baseline.json"
+    argumentos = ["anonimizar_email", "--repeticoes", "1", "--tempo-minimo", "0.001", "--baseline", str(baseline)]
+
+    call_command("microbenchmarks", *argumentos, "--atualizar-baseline")
+    assert "anonimizar_email" in json.loads(baseline.read_text())["resultados"]
+
+    documento = json.loads(baseline.read_text())
+    documento["resultados"]["anonimizar_email"]["mediana_us"] = 1e-6
+    baseline.write_text(json.dumps(documento))
+
+    with pytest.raises(CommandError):
+        call_command("microbenchmarks", *argumentos)
+
+
+@pytest.mark.django_db
+def test_comando_benchmark_desconhecido():
+    with pytest.raises(CommandError):
+        call_command("microbenchmarks", "inexistente")
@@ -0,0 +1,79 @@
+import datetime
+import io
+import uuid
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+
+from apps.helpers import renderers
+from apps.helpers.renderers import JSONRapidoParser, JSONRapidoRenderer
+
+CASOS = {
+    "decimal": {"valor": Decimal("10.50"), "zero": Decimal("0")},
+    "uuid": {"id": uuid.UUID("12345678-1234-5678-1234-567812345678")},
+    "datetime_utc": {"em": datetime.datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc)},
+    "datetime_fuso": {"em": timezone.make_aware(datetime.datetime(2024, 5, 1, 9, 0), timezone.get_fixed_timezone(-180))},
+    "datetime_ingenuo": {"em": datetime.datetime(2024, 5, 1, 9, 0, 0, 500)},
+    "date_time_timedelta": {"d": datetime.date(2024, 5, 1), "t": datetime.time(8, 15, 1, 999), "td": datetime.timedelta(hours=1, seconds=3)},
+    "lazy": {"mensagem": gettext_lazy("Usuário não encontrado")},
+    "acentos_e_separadores": {"nome": "João d'Ávila \u2028\u2029 🎓"},
+    "chaves_nao_str": {1: "um", 2.5: "dois e meio", None: "nulo", True: "verdadeiro"},
+    "aninhado": ReturnList(
+        [ReturnDict({"codigo_eol": "000191", "itens": (1, 2, 3), "ativo": False}, serializer=None)],
+        serializer=None,
+    ),
+    "inteiro_grande": {"n": 2 ** 70},
+}
+
+
+@pytest.mark.parametrize("nome", CASOS)
+def test_mesma_saida_do_json_renderer_do_drf(nome):
+    assert JSONRapidoRenderer().render(CASOS[nome]) == JSONRenderer().render(CASOS[nome])
+
+
+def test_none_vira_corpo_vazio():
+    assert JSONRapidoRenderer().render(None) == b""
+
+
+def test_indent_usa_a_stdlib():
+    corpo = JSONRapidoRenderer().render({"a": 1}, "application/json; indent=2")
+
+    assert corpo == b'{\n  "a": 1\n}'
+
+
+def test_sem_orjson_usa_a_stdlib():
+    dados = CASOS["datetime_utc"]
+
+    with patch.object(renderers, "orjson", None):
+        assert JSONRapidoRenderer().render(dados) == JSONRenderer().render(dados)
+        assert JSONRapidoParser().parse(io.BytesIO(b'{"a": [1, 2]}')) == {"a": [1, 2]}
+
+
+@pytest.mark.parametrize("corpo", [b'{"username": "1234567", "senha": "S\xc3\xa9nha"}', b'[1, 2.5, null, true]'])
+def test_parser_igual_ao_do_drf(corpo):
+    assert JSONRapidoParser().parse(io.BytesIO(corpo)) == JSONParser().parse(io.BytesIO(corpo))
+
+
+@pytest.mark.parametrize("corpo", [b'{"a": ', b"", b'{"a": NaN}'])
+def test_parser_json_invalido(corpo):
+    with pytest.raises(ParseError, match="JSON parse error"):
+        JSONRapidoParser().parse(io.BytesIO(corpo))
+
+
+def test_parser_charset_latin1():
+    corpo = '{"nome": "João"}'.encode("latin-1")
+
+    assert JSONRapidoParser().parse(io.BytesIO(corpo), parser_context={"encoding": "latin-1"}) == {"nome": "João"}
+
+
+def test_api_usa_o_renderer_rapido(client):
+    response = client.get("/api/unidades/")
+
+    assert isinstance(response.accepted_renderer, JSONRapidoRenderer)
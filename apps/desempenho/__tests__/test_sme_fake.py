@@ -0,0 +1,160 @@
+import pytest
+import requests
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from apps.desempenho.sme_fake import ConfiguracaoSmeFake, DadosSmeFake, DistribuicaoLatencia, ServidorSmeFake
+from apps.unidades.api.serializers.unidades_serializer import UnidadeSerializer
+from apps.unidades.services.unidades_service import DREIntegracaoService, UnidadeIntegracaoService
+from apps.usuarios.services.sme_integracao_service import SmeIntegracaoService
+from apps.helpers.exceptions import AuthenticationError, SmeIntegracaoException
+
+RF_VALIDO = DadosSmeFake.rf(0)
+
+
+@pytest.fixture
+def servidor_fake(monkeypatch):
+    def _criar(**kwargs):
+        parametros = {"dres": 3, "ues_por_dre": 5, "usuarios": 10, "perfil": "0000", **kwargs}
+        servidor = ServidorSmeFake(("127.0.0.1", 0), ConfiguracaoSmeFake(**parametros))
+        servidor.iniciar_em_thread()
+        monkeypatch.setenv("SME_INTEGRACAO_URL", servidor.url)
+        servidores.append(servidor)
+        return servidor
+
+    servidores = []
+    yield _criar
+
+    for servidor in servidores:
+        servidor.shutdown()
+        servidor.server_close()
+
+
+class TestDistribuicaoLatencia:
+
+    @pytest.mark.parametrize("especificacao", ["0", "120", "fixa:120", "uniforme:50-300", "normal:200,50", "lognormal:150,0.6"])
+    def test_especificacoes_validas(self, especificacao):
+        distribuicao = DistribuicaoLatencia(especificacao, seed=1)
+
+        assert distribuicao.amostrar_segundos() >= 0
+
+    def test_fixa_em_segundos(self):
+        assert DistribuicaoLatencia("fixa:250").amostrar_segundos() == 0.25
+
+    @pytest.mark.parametrize("especificacao", ["abc", "uniforme:10", "gamma:1,2"])
+    def test_especificacao_invalida(self, especificacao):
+        with pytest.raises(ValueError):
+            DistribuicaoLatencia(especificacao)
+
+
+class TestDadosSmeFake:
+
+    def test_dados_deterministicos(self):
+        primeiro = DadosSmeFake(ConfiguracaoSmeFake(dres=2, ues_por_dre=3, seed=7))
+        segundo = DadosSmeFake(ConfiguracaoSmeFake(dres=2, ues_por_dre=3, seed=7))
+
+        codigo = primeiro.dres[0]["codigoDRE"]
+        assert primeiro.unidades(codigo) == segundo.unidades(codigo)
+
+    def test_codigos_eol_unicos(self):
+        dados = DadosSmeFake(ConfiguracaoSmeFake(dres=3, ues_por_dre=50))
+
+        codigos = [ue["codigoEol"] for dre in dados.dres for ue in dados.unidades(dre["codigoDRE"])]
+        assert len(codigos) == len(set(codigos))
+
+    def test_unidades_compativeis_com_serializer(self):
+        dados = DadosSmeFake(ConfiguracaoSmeFake(dres=1, ues_por_dre=3))
+
+        serializer = UnidadeSerializer(dados.unidades(dados.dres[0]["codigoDRE"]), many=True)
+
+        assert len(serializer.data) == 3
+        assert serializer.data[0]["tipo_nome_ue"]
+
+    def test_usuario_fora_da_massa(self):
+        dados = DadosSmeFake(ConfiguracaoSmeFake(usuarios=5))
+
+        assert dados.usuario(DadosSmeFake.rf(4)) is not None
+        assert dados.usuario(DadosSmeFake.rf(5)) is None
+        assert dados.usuario("abc") is None
+
+
+class TestServidorSmeFake:
+
+    def test_dres_e_unidades(self, servidor_fake):
+        servidor_fake()
+
+        dres = DREIntegracaoService.get_dres()
+        unidades = UnidadeIntegracaoService.get_unidades_by_dre(dres[0]["codigoDRE"])
+
+        assert len(dres) == 3
+        assert len(unidades) == 5
+
+    def test_unidades_dre_inexistente(self, servidor_fake):
+        servidor_fake()
+
+        with pytest.raises(LookupError):
+            UnidadeIntegracaoService.get_unidades_by_dre("999999")
+
+    def test_autenticacao(self, servidor_fake):
+        servidor_fake()
+
+        dados = SmeIntegracaoService.autentica(RF_VALIDO, "Signa@123")
+
+        assert dados["perfis"] == ["0000"]
+        with pytest.raises(AuthenticationError):
+            SmeIntegracaoService.autentica(RF_VALIDO, "errada")
+
+    def test_dados_e_cargos(self, servidor_fake):
+        servidor_fake()
+
+        assert SmeIntegracaoService.informacao_usuario_sgp(RF_VALIDO)["codigoRf"] == RF_VALIDO
+        assert SmeIntegracaoService.consulta_cargos_funcionario(RF_VALIDO)[0]["cargoBase"]
+
+    def test_alterar_senha_e_email(self, servidor_fake):
+        servidor_fake()
+
+        assert SmeIntegracaoService.redefine_senha(RF_VALIDO, "NovaSenha@1") == "OK"
+        assert SmeIntegracaoService.altera_email(RF_VALIDO, "novo@sme.prefeitura.sp.gov.br") == "OK"
+
+        assert SmeIntegracaoService.autentica(RF_VALIDO, "NovaSenha@1")
+        assert SmeIntegracaoService.informacao_usuario_sgp(RF_VALIDO)["email"] == "novo@sme.prefeitura.sp.gov.br"
+
+    def test_alterar_senha_usuario_inexistente(self, servidor_fake):
+        servidor_fake()
+
+        with pytest.raises(SmeIntegracaoException):
+            SmeIntegracaoService.redefine_senha("9999999", "NovaSenha@1")
+
+    def test_injecao_de_erros(self, servidor_fake):
+        servidor = servidor_fake(taxa_erro=1.0)
+
+        response = requests.get(f"{servidor.url}/DREs", timeout=5)
+
+        assert response.status_code == 500
+
+    def test_injecao_de_timeout(self, servidor_fake):
+        servidor = servidor_fake(taxa_timeout=1.0, duracao_timeout=1.0)
+
+        with pytest.raises(requests.exceptions.Timeout):
+            requests.get(f"{servidor.url}/DREs", timeout=0.2)
+
+    def test_exige_token(self, servidor_fake):
+        servidor = servidor_fake(token="chave")
+
+        assert requests.get(f"{servidor.url}/DREs", timeout=5).status_code == 401
+        assert requests.get(f"{servidor.url}/DREs", headers={"x-api-eol-key": "chave"}, timeout=5).status_code == 200
+
+    def test_rota_inexistente(self, servidor_fake):
+        servidor = servidor_fake()
+
+        assert requests.get(f"{servidor.url}/inexistente", timeout=5).status_code == 404
+
+
+def test_comando_valida_taxas():
+    with pytest.raises(CommandError):
+        call_command("servidor_sme_fake", "--taxa-erro", "0.8", "--taxa-timeout", "0.5")
+
+
+def test_comando_valida_latencia():
+    with pytest.raises(CommandError):
+        call_command("servidor_sme_fake", "--latencia", "gamma:1")
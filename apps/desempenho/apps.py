@@ -0,0 +1,6 @@
+from django.apps import AppConfig
+
+
+class DesempenhoConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.desempenho'
@@ -0,0 +1,284 @@
+"""
+Teste de carga ponta a ponta.
+
+Executa uma mistura ponderada de operações (login, unidades, designação,
+senha) com N usuários concorrentes e mede throughput e latência por
+endpoint. O relatório pode ser comparado com uma baseline armazenada
+para detectar regressões de SLO.
+"""
+import random
+import threading
+import time
+
+import requests
+
+from apps.desempenho.estatisticas import resumo_latencias
+from apps.desempenho.sme_fake import DadosSmeFake
+
+
+class Operacao:
+    """ Uma operação da carga; ``autenticada`` exige um token de login. """
+
+    def __init__(self, nome, metodo, caminho, autenticada=False, corpo=None, parametros=None):
+        self.nome = nome
+        self.metodo = metodo
+        self.caminho = caminho
+        self.autenticada = autenticada
+        self.corpo = corpo
+        self.parametros = parametros
+
+    def executar(self, sessao, url_base, usuario, timeout):
+        headers = {}
+        if self.autenticada:
+            headers["Authorization"] = f"Bearer {usuario.token}"
+
+        return sessao.request(
+            self.metodo,
+            f"{url_base}{self.caminho}",
+            json=self.corpo(usuario) if self.corpo else None,
+            params=self.parametros(usuario) if self.parametros else None,
+            headers=headers,
+            timeout=timeout,
+        )
+
+
+def _codigo_dre(usuario):
+    return str(DadosSmeFake.CODIGO_DRE_INICIAL + usuario.random.randrange(usuario.total_dres) * 100)
+
+
+OPERACOES = {
+    "login": Operacao(
+        "login", "POST", "/api/usuario/login",
+        corpo=lambda u: {"username": u.rf, "password": u.senha},
+    ),
+    "dres": Operacao(
+        "dres", "GET", "/api/unidades/",
+        parametros=lambda u: {"tipo": "DRE"},
+    ),
+    "ues": Operacao(
+        "ues", "GET", "/api/unidades/",
+        parametros=lambda u: {"tipo": "UE", "dre": _codigo_dre(u)},
+    ),
+    "designacao": Operacao(
+        "designacao", "POST", "/api/designacao/servidor", autenticada=True,
+        corpo=lambda u: {"rf": u.rf},
+    ),
+    "me": Operacao("me", "GET", "/api/usuario/me", autenticada=True),
+    "esqueci_senha": Operacao(
+        "esqueci_senha", "POST", "/api/usuario/esqueci-senha",
+        corpo=lambda u: {"username": u.rf},
+    ),
+}
+
+MIX_PADRAO = "login=2,dres=4,ues=4,designacao=2,me=3,esqueci_senha=1"
+
+
+def interpretar_mix(mix):
+    """ Converte "login=2,dres=4" em {"login": 2, "dres": 4}. """
+    pesos = {}
+    for item in filter(None, (parte.strip() for parte in mix.split(","))):
+        nome, _, peso = item.partition("=")
+        if nome not in OPERACOES:
+            raise ValueError(f"Operação desconhecida no mix: {nome}")
+        pesos[nome] = float(peso or 1)
+
+    if not pesos or sum(pesos.values()) <= 0:
+        raise ValueError("O mix precisa ter ao menos uma operação com peso positivo.")
+    return pesos
+
+
+class UsuarioVirtual:
+    """ Estado de um worker da carga (RF, token e amostras coletadas). """
+
+    def __init__(self, indice, senha, total_dres, seed):
+        self.rf = DadosSmeFake.rf(indice)
+        self.senha = senha
+        self.total_dres = max(total_dres, 1)
+        self.token = None
+        self.random = random.Random(f"{seed}-{indice}")
+        self.amostras = []
+
+
+class ExecutorCarga:
+    """
+    Dispara a carga com ``concorrencia`` usuários virtuais até atingir
+    ``duracao`` segundos ou ``requisicoes`` requisições (o que vier antes).
+    """
+
+    def __init__(
+        self,
+        url_base,
+        pesos,
+        concorrencia=10,
+        duracao=30.0,
+        requisicoes=None,
+        usuarios=1000,
+        senha="Signa@123",
+        total_dres=13,
+        timeout=30.0,
+        seed=42,
+    ):
+        self.url_base = url_base.rstrip("/")
+        self.pesos = pesos
+        self.concorrencia = concorrencia
+        self.duracao = duracao
+        self.requisicoes = requisicoes
+        self.usuarios = usuarios
+        self.senha = senha
+        self.total_dres = total_dres
+        self.timeout = timeout
+        self.seed = seed
+        self._restantes = requisicoes
+        self._lock = threading.Lock()
+
+    def _reservar_requisicao(self):
+        if self._restantes is None:
+            return True
+        with self._lock:
+            if self._restantes <= 0:
+                return False
+            self._restantes -= 1
+            return True
+
+    def _medir(self, operacao, sessao, usuario):
+        inicio = time.perf_counter()
+        try:
+            response = operacao.executar(sessao, self.url_base, usuario, self.timeout)
+            status = response.status_code
+        except requests.RequestException:
+            response, status = None, "erro"
+        latencia_ms = (time.perf_counter() - inicio) * 1000
+
+        usuario.amostras.append((operacao.nome, latencia_ms, status))
+        return response
+
+    def _login(self, sessao, usuario):
+        response = self._medir(OPERACOES["login"], sessao, usuario)
+        if response is not None and response.status_code == 200:
+            usuario.token = response.json().get("token")
+
+    def _worker(self, usuario, fim):
+        nomes = list(self.pesos)
+        pesos = list(self.pesos.values())
+
+        with requests.Session() as sessao:
+            while time.perf_counter() < fim and self._reservar_requisicao():
+                operacao = OPERACOES[usuario.random.choices(nomes, pesos)[0]]
+
+                if operacao.nome == "login" or (operacao.autenticada and not usuario.token):
+                    self._login(sessao, usuario)
+                    continue
+
+                self._medir(operacao, sessao, usuario)
+
+    def executar(self):
+        usuarios = [
+            UsuarioVirtual(i % self.usuarios, self.senha, self.total_dres, self.seed)
+            for i in range(self.concorrencia)
+        ]
+
+        inicio = time.perf_counter()
+        fim = inicio + self.duracao if self.duracao else float("inf")
+        threads = [threading.Thread(target=self._worker, args=(u, fim)) for u in usuarios]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        decorrido = time.perf_counter() - inicio
+
+        amostras = [amostra for usuario in usuarios for amostra in usuario.amostras]
+        return relatorio_carga(amostras, decorrido, self.concorrencia)
+
+
+def relatorio_carga(amostras, decorrido, concorrencia):
+    """
+    Agrupa as amostras (operação, latência_ms, status) por endpoint.
+
+    Respostas 5xx e falhas de conexão contam como erro; 4xx são respostas
+    válidas do ponto de vista de carga (ex.: senha inválida).
+    """
+    por_operacao = {}
+    for nome, latencia_ms, status in amostras:
+        por_operacao.setdefault(nome, []).append((latencia_ms, status))
+
+    def _resumo(itens):
+        erros = sum(1 for _, status in itens if status == "erro" or status >= 500)
+        return {
+            "requisicoes": len(itens),
+            "erros": erros,
+            "taxa_erro": round(erros / len(itens), 4) if itens else 0.0,
+            "throughput_rps": round(len(itens) / decorrido, 3) if decorrido else 0.0,
+            **resumo_latencias([latencia for latencia, _ in itens]),
+        }
+
+    return {
+        "duracao_s": round(decorrido, 3),
+        "concorrencia": concorrencia,
+        "total": _resumo([(latencia, status) for _, latencia, status in amostras]),
+        "endpoints": {nome: _resumo(itens) for nome, itens in sorted(por_operacao.items())},
+    }
+
+
+def comparar_com_baseline(relatorio, baseline, tolerancia=0.2, folga_ms=10.0):
+    """
+    Compara o relatório com a baseline e devolve a lista de violações de SLO.
+
+    Para cada endpoint da baseline: p95/p99 não podem crescer mais que
+    ``tolerancia`` (fração) nem mais que ``folga_ms`` em valor absoluto
+    (o que for maior, para endpoints de poucos ms), o throughput não pode
+    cair mais que ``tolerancia`` e a taxa de erro não pode passar de
+    ``taxa_erro_max`` (quando definida).
+    """
+    violacoes = []
+    atuais = {"total": relatorio["total"], **relatorio["endpoints"]}
+
+    for nome, limites in baseline.get("endpoints", {}).items():
+        atual = atuais.get(nome)
+        if atual is None:
+            continue
+
+        for chave in ("p95_ms", "p99_ms"):
+            if chave not in limites:
+                continue
+
+            maximo = max(limites[chave] * (1 + tolerancia), limites[chave] + folga_ms)
+            if atual[chave] > maximo:
+                violacoes.append(
+                    f"{nome}: {chave} {atual[chave]:.1f} > máximo {maximo:.1f} (baseline {limites[chave]:.1f})"
+                )
+
+        if "throughput_rps" in limites and atual["throughput_rps"] < limites["throughput_rps"] * (1 - tolerancia):
+            violacoes.append(
+                f"{nome}: throughput {atual['throughput_rps']:.1f} rps < baseline "
+                f"{limites['throughput_rps']:.1f} (-{tolerancia:.0%})"
+            )
+
+        if "taxa_erro_max" in limites and atual["taxa_erro"] > limites["taxa_erro_max"]:
+            violacoes.append(
+                f"{nome}: taxa de erro {atual['taxa_erro']:.2%} > máximo {limites['taxa_erro_max']:.2%}"
+            )
+
+    return violacoes
+
+
+def baseline_do_relatorio(relatorio, taxa_erro_max=0.01):
+    """
+    Gera uma baseline a partir de um relatório (para --atualizar-baseline).
+
+    O throughput só entra no total: por endpoint ele depende do sorteio do mix.
+    """
+    endpoints = {
+        nome: {
+            "p95_ms": dados["p95_ms"],
+            "p99_ms": dados["p99_ms"],
+            "taxa_erro_max": taxa_erro_max,
+        }
+        for nome, dados in relatorio["endpoints"].items()
+    }
+    endpoints["total"] = {
+        "p95_ms": relatorio["total"]["p95_ms"],
+        "p99_ms": relatorio["total"]["p99_ms"],
+        "throughput_rps": relatorio["total"]["throughput_rps"],
+        "taxa_erro_max": taxa_erro_max,
+    }
+    return {"concorrencia": relatorio["concorrencia"], "endpoints": endpoints}
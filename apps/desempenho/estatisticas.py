@@ -0,0 +1,25 @@
+import math
+
+
+def percentil(valores_ordenados, p):
+    """ Percentil pelo método nearest-rank (valores já ordenados). """
+    if not valores_ordenados:
+        return 0.0
+
+    posicao = max(math.ceil(p / 100 * len(valores_ordenados)) - 1, 0)
+    return valores_ordenados[posicao]
+
+
+def resumo_latencias(latencias_ms):
+    """ Média e percentis (p50/p90/p95/p99/máx) de uma lista de latências em ms. """
+    ordenadas = sorted(latencias_ms)
+    total = len(ordenadas)
+
+    return {
+        "media_ms": round(sum(ordenadas) / total, 3) if total else 0.0,
+        "p50_ms": round(percentil(ordenadas, 50), 3),
+        "p90_ms": round(percentil(ordenadas, 90), 3),
+        "p95_ms": round(percentil(ordenadas, 95), 3),
+        "p99_ms": round(percentil(ordenadas, 99), 3),
+        "max_ms": round(ordenadas[-1], 3) if total else 0.0,
+    }
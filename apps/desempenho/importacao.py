@@ -0,0 +1,83 @@
+"""
+Perfil do tempo de importação (``python -X importtime``).
+
+O interpretador é executado em um subprocesso limpo, para que os módulos
+já carregados pelo manage.py não escondam o custo real do boot do worker.
+"""
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+from django.conf import settings
+
+_PREFIXO = "import time:"
+
+
+@dataclass
+class ModuloImportado:
+    nome: str
+    proprio_us: int
+    acumulado_us: int
+    filhos: list = field(default_factory=list)
+
+    @property
+    def acumulado_ms(self):
+        return self.acumulado_us / 1000
+
+    def como_dict(self, minimo_us=0):
+        return {
+            "nome": self.nome,
+            "proprio_us": self.proprio_us,
+            "acumulado_us": self.acumulado_us,
+            "filhos": [f.como_dict(minimo_us) for f in self.filhos if f.acumulado_us >= minimo_us],
+        }
+
+
+def interpretar_importtime(saida):
+    """
+    Monta a árvore de importações a partir do stderr de ``-X importtime``.
+
+    O interpretador emite cada módulo depois dos seus filhos, com dois
+    espaços de indentação por nível; devolve as raízes (nível 0).
+    """
+    pendentes = defaultdict(list)
+    for linha in saida.splitlines():
+        if not linha.startswith(_PREFIXO) or "imported package" in linha:
+            continue
+        proprio, acumulado, nome = linha[len(_PREFIXO):].split("|", 2)
+        nivel = (len(nome) - len(nome.lstrip()) - 1) // 2
+        modulo = ModuloImportado(nome.strip(), int(proprio), int(acumulado), pendentes.pop(nivel + 1, []))
+        pendentes[nivel].append(modulo)
+    return pendentes[0]
+
+
+def medir_importacao(codigo):
+    """ Executa ``codigo`` em um interpretador novo com -X importtime e devolve as raízes. """
+    processo = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo],
+        cwd=settings.BASE_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if processo.returncode != 0:
+        raise RuntimeError(processo.stderr.strip().splitlines()[-1] if processo.stderr else "falha ao importar")
+    return interpretar_importtime(processo.stderr)
+
+
+def formatar_arvore(raizes, minimo_ms=1.0, profundidade=3):
+    """ Linhas de texto com os módulos acima de ``minimo_ms``, dos mais caros para os mais baratos. """
+    linhas = []
+
+    def visitar(modulos, nivel):
+        for modulo in sorted(modulos, key=lambda m: m.acumulado_us, reverse=True):
+            if modulo.acumulado_ms < minimo_ms:
+                continue
+            linhas.append(
+                f"{modulo.acumulado_ms:>9.1f} {modulo.proprio_us / 1000:>8.1f}  {'  ' * nivel}{modulo.nome}"
+            )
+            if nivel + 1 < profundidade:
+                visitar(modulo.filhos, nivel + 1)
+
+    visitar(raizes, 0)
+    return linhas
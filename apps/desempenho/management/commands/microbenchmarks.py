@@ -0,0 +1,60 @@
+import json
+import platform
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.desempenho.microbenchmarks import BENCHMARKS, comparar_com_baseline, executar
+
+BASELINE_PADRAO = Path(__file__).resolve().parents[2] / "baselines" / "microbenchmarks.json"
+
+
+class Command(BaseCommand):
+    help = "Executa os microbenchmarks dos trechos críticos e compara com a baseline."
+
+    def add_arguments(self, parser):
+        parser.add_argument("nomes", nargs="*", help=f"Benchmarks a executar: {', '.join(BENCHMARKS)}.")
+        parser.add_argument("--repeticoes", type=int, default=5)
+        parser.add_argument("--tempo-minimo", type=float, default=0.2, help="Segundos mínimos por repetição.")
+        parser.add_argument("--saida", help="Grava os resultados neste arquivo JSON.")
+        parser.add_argument("--baseline", default=str(BASELINE_PADRAO))
+        parser.add_argument("--tolerancia", type=float, default=0.25, help="Piora tolerada na mediana (fração).")
+        parser.add_argument("--atualizar-baseline", action="store_true")
+
+    def handle(self, *args, **options):
+        try:
+            resultados = executar(options["nomes"], options["repeticoes"], options["tempo_minimo"])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(f"{'benchmark':<38}{'mediana(µs)':>14}{'min(µs)':>12}{'ops/s':>12}")
+        for nome, dados in resultados.items():
+            self.stdout.write(
+                f"{nome:<38}{dados['mediana_us']:>14.2f}{dados['min_us']:>12.2f}{dados['ops_por_segundo']:>12.1f}"
+            )
+
+        documento = {"python": platform.python_version(), "resultados": resultados}
+        if options["saida"]:
+            Path(options["saida"]).write_text(json.dumps(documento, indent=2))
+
+        baseline_path = Path(options["baseline"])
+        if options["atualizar_baseline"]:
+            baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            existente = json.loads(baseline_path.read_text()) if baseline_path.exists() else {"resultados": {}}
+            documento["resultados"] = {**existente["resultados"], **resultados}
+            baseline_path.write_text(json.dumps(documento, indent=2) + "\n")
+            self.stdout.write(self.style.SUCCESS(f"Baseline atualizada em {baseline_path}"))
+            return
+
+        if not baseline_path.exists():
+            return
+
+        violacoes = comparar_com_baseline(
+            resultados, json.loads(baseline_path.read_text())["resultados"], options["tolerancia"]
+        )
+        if violacoes:
+            for violacao in violacoes:
+                self.stderr.write(self.style.ERROR(violacao))
+            raise CommandError(f"{len(violacoes)} microbenchmark(s) regrediram em relação à baseline.")
+
+        self.stdout.write(self.style.SUCCESS("Microbenchmarks dentro da baseline."))
@@ -0,0 +1,45 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.desempenho.importacao import formatar_arvore, medir_importacao
+
+
+class Command(BaseCommand):
+    help = (
+        "Mostra a árvore de tempo de importação (python -X importtime) de um módulo, "
+        "por padrão o boot do worker (config.wsgi)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--modulo", default="config.wsgi")
+        parser.add_argument(
+            "--aquecido",
+            action="store_true",
+            help="Inclui o aquecimento do preload (URLconf, views e serviços de integração).",
+        )
+        parser.add_argument("--minimo-ms", type=float, default=1.0, help="Omite módulos mais baratos que isso.")
+        parser.add_argument("--profundidade", type=int, default=3)
+        parser.add_argument("--json", action="store_true", help="Imprime a árvore completa em JSON.")
+
+    def handle(self, *args, **options):
+        codigo = f"import {options['modulo']}"
+        if options["aquecido"]:
+            codigo += "; from config.aquecimento import aquecer; aquecer()"
+
+        try:
+            raizes = medir_importacao(codigo)
+        except RuntimeError as e:
+            raise CommandError(f"Falha ao importar {options['modulo']}: {e}")
+
+        if options["json"]:
+            minimo_us = int(options["minimo_ms"] * 1000)
+            self.stdout.write(json.dumps([r.como_dict(minimo_us) for r in raizes], indent=2))
+            return
+
+        self.stdout.write(f"{'acum(ms)':>9} {'próprio':>8}  módulo")
+        for linha in formatar_arvore(raizes, options["minimo_ms"], options["profundidade"]):
+            self.stdout.write(linha)
+
+        total = sum(r.acumulado_us for r in raizes) / 1000
+        self.stdout.write(self.style.SUCCESS(f"Total importado: {total:.1f} ms"))
@@ -0,0 +1,75 @@
+import environ
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.desempenho.sme_fake import ConfiguracaoSmeFake, ServidorSmeFake
+
+env = environ.Env()
+
+
+class Command(BaseCommand):
+    help = (
+        "Sobe um servidor local que simula a integração SME (EOL/CoreSSO) "
+        "para testes de carga e latência."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--porta", type=int, default=8001)
+        parser.add_argument("--dres", type=int, default=13, help="Quantidade de DREs geradas.")
+        parser.add_argument("--ues-por-dre", type=int, default=100, help="Quantidade de UEs por DRE.")
+        parser.add_argument("--usuarios", type=int, default=1000, help="Quantidade de RFs válidos.")
+        parser.add_argument("--senha", default="Signa@123", help="Senha aceita para todos os RFs.")
+        parser.add_argument(
+            "--perfil",
+            default=env("GUIDE_PERFIL_SIGNA", default=""),
+            help="Perfil retornado na autenticação (padrão: GUIDE_PERFIL_SIGNA).",
+        )
+        parser.add_argument(
+            "--latencia",
+            default="0",
+            help='Latência em ms: "120", "uniforme:50-300", "normal:200,50" ou "lognormal:150,0.6".',
+        )
+        parser.add_argument("--taxa-erro", type=float, default=0.0, help="Fração de respostas 500.")
+        parser.add_argument("--taxa-timeout", type=float, default=0.0, help="Fração de requisições sem resposta.")
+        parser.add_argument(
+            "--duracao-timeout", type=float, default=60.0,
+            help="Segundos que uma requisição sorteada para timeout fica pendurada.",
+        )
+        parser.add_argument("--token", default="", help="Exige este x-api-eol-key quando informado.")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--verbose-http", action="store_true", help="Loga cada requisição recebida.")
+
+    def handle(self, *args, **options):
+        if not 0 <= options["taxa_erro"] + options["taxa_timeout"] <= 1:
+            raise CommandError("A soma de --taxa-erro e --taxa-timeout deve estar entre 0 e 1.")
+
+        try:
+            configuracao = ConfiguracaoSmeFake(
+                dres=options["dres"],
+                ues_por_dre=options["ues_por_dre"],
+                usuarios=options["usuarios"],
+                senha=options["senha"],
+                perfil=options["perfil"],
+                latencia=options["latencia"],
+                taxa_erro=options["taxa_erro"],
+                taxa_timeout=options["taxa_timeout"],
+                duracao_timeout=options["duracao_timeout"],
+                token=options["token"],
+                seed=options["seed"],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        servidor = ServidorSmeFake(
+            (options["host"], options["porta"]), configuracao, verbose=options["verbose_http"]
+        )
+
+        self.stdout.write(self.style.SUCCESS(f"Servidor SME fake em {servidor.url}"))
+        self.stdout.write(f"Use SME_INTEGRACAO_URL={servidor.url} na aplicação.")
+
+        try:
+            servidor.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            servidor.server_close()
@@ -0,0 +1,183 @@
+import os
+import json
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler, get_internal_wsgi_application
+from django.test.utils import override_settings
+
+from apps.desempenho.carga import (
+    MIX_PADRAO,
+    ExecutorCarga,
+    baseline_do_relatorio,
+    comparar_com_baseline,
+    interpretar_mix,
+)
+from apps.desempenho.sme_fake import ConfiguracaoSmeFake, ServidorSmeFake
+from apps.helpers.configuracao_sme import recarregar_configuracao_sme
+
+BASELINE_PADRAO = Path(__file__).resolve().parents[2] / "baselines" / "carga.json"
+
+
+class _HandlerSilencioso(WSGIRequestHandler):
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Executa uma carga mista (login, unidades, designação, senha) contra a aplicação "
+        "ligada ao servidor SME fake e gera um relatório JSON de throughput e latência."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--url",
+            help="URL de uma aplicação já em execução. Sem ela, a aplicação e o SME fake sobem neste processo.",
+        )
+        parser.add_argument(
+            "--concorrencia", type=int,
+            help="Usuários virtuais simultâneos (padrão: o da baseline, ou 10).",
+        )
+        parser.add_argument("--duracao", type=float, default=30.0, help="Duração máxima em segundos.")
+        parser.add_argument("--requisicoes", type=int, help="Número máximo de requisições.")
+        parser.add_argument("--mix", default=MIX_PADRAO, help=f'Pesos das operações (padrão: "{MIX_PADRAO}").')
+        parser.add_argument("--usuarios", type=int, default=1000, help="RFs válidos no SME fake.")
+        parser.add_argument("--senha", default="Signa@123")
+        parser.add_argument("--dres", type=int, default=13)
+        parser.add_argument("--ues-por-dre", type=int, default=100)
+        parser.add_argument(
+            "--latencia", default="uniforme:40-60",
+            help="Latência do SME fake (ms). Mantenha baixa variância ao comparar com a baseline.",
+        )
+        parser.add_argument("--taxa-erro", type=float, default=0.0)
+        parser.add_argument("--timeout", type=float, default=30.0, help="Timeout do cliente de carga (s).")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--saida", default="carga_resultado.json", help="Arquivo JSON do relatório.")
+        parser.add_argument("--baseline", default=str(BASELINE_PADRAO), help="Baseline de SLO para comparação.")
+        parser.add_argument("--tolerancia", type=float, default=0.2, help="Regressão tolerada (fração).")
+        parser.add_argument("--folga-ms", type=float, default=10.0, help="Regressão absoluta tolerada (ms).")
+        parser.add_argument("--sem-baseline", action="store_true", help="Não compara com a baseline.")
+        parser.add_argument("--atualizar-baseline", action="store_true", help="Grava o resultado como nova baseline.")
+
+    def handle(self, *args, **options):
+        try:
+            pesos = interpretar_mix(options["mix"])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        baseline_path = Path(options["baseline"])
+        if options["concorrencia"] is None:
+            options["concorrencia"] = 10
+            if baseline_path.exists():
+                options["concorrencia"] = json.loads(baseline_path.read_text()).get("concorrencia", 10)
+
+        if options["url"]:
+            relatorio = self._executar(options["url"], pesos, options)
+        else:
+            relatorio = self._executar_local(pesos, options)
+
+        Path(options["saida"]).write_text(json.dumps(relatorio, indent=2, ensure_ascii=False))
+        self._imprimir(relatorio)
+        self.stdout.write(f"Relatório gravado em {options['saida']}")
+
+        if options["atualizar_baseline"]:
+            baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            baseline_path.write_text(json.dumps(baseline_do_relatorio(relatorio), indent=2) + "\n")
+            self.stdout.write(self.style.SUCCESS(f"Baseline atualizada em {baseline_path}"))
+            return
+
+        if options["sem_baseline"] or not baseline_path.exists():
+            return
+
+        baseline = json.loads(baseline_path.read_text())
+        if baseline.get("concorrencia") != relatorio["concorrencia"]:
+            self.stderr.write(self.style.WARNING(
+                f"Baseline medida com concorrência {baseline.get('concorrencia')}; "
+                f"esta execução usou {relatorio['concorrencia']}."
+            ))
+
+        violacoes = comparar_com_baseline(
+            relatorio, baseline, options["tolerancia"], options["folga_ms"]
+        )
+        if violacoes:
+            for violacao in violacoes:
+                self.stderr.write(self.style.ERROR(violacao))
+            raise CommandError(f"{len(violacoes)} violação(ões) de SLO em relação à baseline.")
+
+        self.stdout.write(self.style.SUCCESS("SLOs dentro da baseline."))
+
+    def _executar(self, url, pesos, options):
+        return ExecutorCarga(
+            url,
+            pesos,
+            concorrencia=options["concorrencia"],
+            duracao=options["duracao"],
+            requisicoes=options["requisicoes"],
+            usuarios=options["usuarios"],
+            senha=options["senha"],
+            total_dres=options["dres"],
+            timeout=options["timeout"],
+            seed=options["seed"],
+        ).executar()
+
+    def _executar_local(self, pesos, options):
+        """ Sobe o SME fake e a aplicação (WSGI multithread) neste processo. """
+        perfil = os.environ.setdefault("GUIDE_PERFIL_SIGNA", "SIGNA-CARGA")
+        os.environ.setdefault("AMBIENTE_URL", "http://localhost:3000")
+
+        servidor_sme = ServidorSmeFake(
+            ("127.0.0.1", 0),
+            ConfiguracaoSmeFake(
+                dres=options["dres"],
+                ues_por_dre=options["ues_por_dre"],
+                usuarios=options["usuarios"],
+                senha=options["senha"],
+                perfil=perfil,
+                latencia=options["latencia"],
+                taxa_erro=options["taxa_erro"],
+                seed=options["seed"],
+            ),
+        )
+        servidor_sme.iniciar_em_thread()
+        os.environ["SME_INTEGRACAO_URL"] = servidor_sme.url
+        recarregar_configuracao_sme()
+
+        servidor_app = ThreadedWSGIServer(("127.0.0.1", 0), _HandlerSilencioso)
+        servidor_app.set_app(get_internal_wsgi_application())
+        threading.Thread(target=servidor_app.serve_forever, daemon=True).start()
+        host, porta = servidor_app.server_address[:2]
+
+        self.stdout.write(
+            f"Aplicação em http://{host}:{porta} | SME fake em {servidor_sme.url} "
+            f"| banco: {settings.DATABASES['default']['NAME']}"
+        )
+
+        try:
+            # e-mails de recuperação de senha ficam em memória e os limites por IP/RF
+            # (todos os usuários virtuais saem do mesmo IP) ficam desligados durante a carga
+            with override_settings(
+                EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+                REST_FRAMEWORK={**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": {}},
+            ):
+                return self._executar(f"http://{host}:{porta}", pesos, options)
+        finally:
+            servidor_app.shutdown()
+            servidor_app.server_close()
+            servidor_sme.shutdown()
+            servidor_sme.server_close()
+
+    def _imprimir(self, relatorio):
+        self.stdout.write(
+            f"{'endpoint':<15}{'req':>8}{'erros':>7}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}"
+        )
+        linhas = {**relatorio["endpoints"], "total": relatorio["total"]}
+        for nome, dados in linhas.items():
+            self.stdout.write(
+                f"{nome:<15}{dados['requisicoes']:>8}{dados['erros']:>7}{dados['throughput_rps']:>9.1f}"
+                f"{dados['p50_ms']:>9.1f}{dados['p95_ms']:>9.1f}{dados['p99_ms']:>9.1f}{dados['max_ms']:>9.1f}"
+            )
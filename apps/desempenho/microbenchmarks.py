@@ -0,0 +1,203 @@
+"""
+Microbenchmarks dos trechos de código suspeitos de serem caros.
+
+Cada benchmark é uma função que prepara o cenário e devolve a chamada a
+ser medida. O executor usa timeit para escolher o número de loops e
+reporta o tempo por operação em microssegundos.
+"""
+import json
+import statistics
+import timeit
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.tokens import default_token_generator
+from django.db import transaction
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+from rest_framework.renderers import JSONRenderer
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.desempenho.sme_fake import ConfiguracaoSmeFake, DadosSmeFake
+from apps.helpers.renderers import JSONRapidoRenderer
+from apps.helpers.utils import anonimizar_email
+from apps.unidades.api.serializers.unidades_serializer import UnidadeSerializer
+from apps.unidades.services.unidades_service import UnidadeIntegracaoService
+from apps.usuarios.api.serializers.login_serializer import LoginSerializer
+from apps.usuarios.api.serializers.senha_serializer import RedefinirSenhaSerializer
+from apps.usuarios.api.views.login_view import LoginView
+from apps.usuarios.services.envia_email_service import EnviaEmailService
+from apps.usuarios.services.revogacao_service import RevogacaoService
+
+User = get_user_model()
+
+BENCHMARKS = {}
+
+
+def benchmark(nome):
+    """ Registra um benchmark: a função decorada prepara o cenário e devolve a chamada medida. """
+    def decorator(func):
+        BENCHMARKS[nome] = func
+        return func
+    return decorator
+
+
+@benchmark("login_serializer_validate")
+def _login_serializer_validate():
+    serializer = LoginSerializer()
+    return lambda: serializer.validate({"username": "123.456-7", "password": "senha"})
+
+
+@benchmark("unidade_serializer_1000")
+def _unidade_serializer():
+    dados = DadosSmeFake(ConfiguracaoSmeFake(dres=1, ues_por_dre=1000))
+    unidades = dados.unidades(dados.dres[0]["codigoDRE"])
+    return lambda: UnidadeSerializer(unidades, many=True).data
+
+
+def _ues_serializadas():
+    dados = DadosSmeFake(ConfiguracaoSmeFake(dres=1, ues_por_dre=1000))
+    return UnidadeSerializer(dados.unidades(dados.dres[0]["codigoDRE"]), many=True).data
+
+
+@benchmark("json_render_ues_1000_stdlib")
+def _json_render_stdlib():
+    ues = _ues_serializadas()
+    renderer = JSONRenderer()
+    return lambda: renderer.render(ues)
+
+
+@benchmark("json_render_ues_1000_rapido")
+def _json_render_rapido():
+    ues = _ues_serializadas()
+    renderer = JSONRapidoRenderer()
+    return lambda: renderer.render(ues)
+
+
+def _corpo_ues_eol():
+    dados = DadosSmeFake(ConfiguracaoSmeFake(dres=1, ues_por_dre=1000))
+    corpo = json.dumps(dados.unidades(dados.dres[0]["codigoDRE"])).encode()
+    tamanho = UnidadeIntegracaoService.TAMANHO_BLOCO
+    return [corpo[i:i + tamanho] for i in range(0, len(corpo), tamanho)]
+
+
+@benchmark("ues_1000_decodificar_renderizar")
+def _ues_decodificar_renderizar():
+    blocos = _corpo_ues_eol()
+    renderer = JSONRapidoRenderer()
+    return lambda: renderer.render(json.loads(b"".join(blocos)))
+
+
+@benchmark("ues_1000_repasse")
+def _ues_repasse():
+    blocos = _corpo_ues_eol()
+    resposta = SimpleNamespace(close=lambda: None)
+    return lambda: b"".join(UnidadeIntegracaoService._repassar(resposta, blocos[0], iter(blocos[1:]), "000000"))
+
+
+@benchmark("anonimizar_email")
+def _anonimizar_email():
+    return lambda: anonimizar_email("servidor.publico@sme.prefeitura.sp.gov.br")
+
+
+@benchmark("login_gerar_tokens")
+def _gerar_tokens():
+    user = User(pk=1, username="1234567", name="Servidor Teste", email="servidor@sme.prefeitura.sp.gov.br")
+    view = LoginView()
+    return lambda: view._gerar_tokens(user, ["0000"])
+
+
+@benchmark("jwt_verificar_revogacao")
+def _verificar_revogacao():
+    token = AccessToken.for_user(User(pk=1, username="1234567"))
+    # Primeira verificação consulta o cache; as seguintes usam a resposta guardada no processo.
+    RevogacaoService.revogado(token)
+    return lambda: RevogacaoService.revogado(token)
+
+
+@benchmark("redefinir_senha_serializer_validate")
+def _redefinir_senha_validate():
+    user = User.objects.create_user(username="9999999", password="SenhaAtual@1")
+    dados = {
+        "uid": urlsafe_base64_encode(force_bytes(user.pk)),
+        "token": default_token_generator.make_token(user),
+        "new_pass": "NovaSenha@1",
+        "new_pass_confirm": "NovaSenha@1",
+    }
+    return lambda: RedefinirSenhaSerializer().validate(dict(dados))
+
+
+@benchmark("email_reset_senha_render")
+def _email_render():
+    contexto = {
+        "nome_usuario": "Servidor",
+        "link_reset": "http://localhost:3000/recuperar-senha/MQ/token",
+        "aplicacao_url": "http://localhost:3000",
+    }
+    return lambda: EnviaEmailService.renderizar_corpo("emails/reset_senha.html", contexto)
+
+
+@contextmanager
+def _banco_descartavel():
+    """ Os dados criados pelos benchmarks são desfeitos ao final. """
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+def medir(funcao, repeticoes=5, tempo_minimo=0.2):
+    """
+    Mede ``funcao`` e devolve estatísticas por operação (µs).
+
+    O número de loops é escolhido para que cada repetição dure ao menos
+    ``tempo_minimo`` segundos; a mediana das repetições é a métrica principal.
+    """
+    timer = timeit.Timer(funcao)
+    loops = 1
+    while timer.timeit(loops) < tempo_minimo:
+        loops *= 2
+
+    tempos_us = [t / loops * 1e6 for t in timer.repeat(repeat=repeticoes, number=loops)]
+    mediana = statistics.median(tempos_us)
+
+    return {
+        "loops": loops,
+        "repeticoes": repeticoes,
+        "min_us": round(min(tempos_us), 3),
+        "mediana_us": round(mediana, 3),
+        "max_us": round(max(tempos_us), 3),
+        "ops_por_segundo": round(1e6 / mediana, 1) if mediana else None,
+    }
+
+
+def executar(nomes=None, repeticoes=5, tempo_minimo=0.2):
+    """ Executa os benchmarks selecionados (todos por padrão). """
+    selecionados = nomes or list(BENCHMARKS)
+    desconhecidos = set(selecionados) - set(BENCHMARKS)
+    if desconhecidos:
+        raise ValueError(f"Benchmarks desconhecidos: {', '.join(sorted(desconhecidos))}")
+
+    resultados = {}
+    with _banco_descartavel():
+        for nome in selecionados:
+            funcao = BENCHMARKS[nome]()
+            resultados[nome] = medir(funcao, repeticoes, tempo_minimo)
+    return resultados
+
+
+def comparar_com_baseline(resultados, baseline, tolerancia=0.25):
+    """ Lista os benchmarks cuja mediana piorou mais que ``tolerancia``. """
+    violacoes = []
+    for nome, atual in resultados.items():
+        referencia = baseline.get(nome)
+        if not referencia:
+            continue
+
+        maximo = referencia["mediana_us"] * (1 + tolerancia)
+        if atual["mediana_us"] > maximo:
+            violacoes.append(
+                f"{nome}: mediana {atual['mediana_us']:.1f}µs > máximo {maximo:.1f}µs "
+                f"(baseline {referencia['mediana_us']:.1f}µs)"
+            )
+    return violacoes
@@ -0,0 +1,355 @@
+"""
+Servidor HTTP que simula a API de integração da SME (EOL/CoreSSO).
+
+Usado em testes de carga e latência: serve dados gerados de tamanho
+configurável e permite injetar latência, erros e timeouts, sem depender
+do ambiente real da SME.
+"""
+import json
+import math
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+
+class DistribuicaoLatencia:
+    """
+    Distribuição de latência em milissegundos, a partir de uma especificação:
+
+    - "0" ou "fixa:120"          -> sempre 120ms
+    - "uniforme:50-300"          -> uniforme entre 50 e 300ms
+    - "normal:200,50"            -> normal com média 200 e desvio 50
+    - "lognormal:150,0.6"        -> lognormal com mediana 150 e sigma 0.6 (cauda longa)
+    """
+
+    def __init__(self, especificacao="0", seed=None):
+        self.especificacao = especificacao
+        self._random = random.Random(seed)
+        self._amostrar = self._interpretar(especificacao)
+
+    def _interpretar(self, especificacao):
+        tipo, _, valores = str(especificacao).partition(":")
+        if not valores:
+            tipo, valores = "fixa", tipo
+
+        try:
+            if tipo == "fixa":
+                fixa = float(valores)
+                return lambda: fixa
+
+            if tipo == "uniforme":
+                minimo, maximo = (float(v) for v in valores.split("-"))
+                return lambda: self._random.uniform(minimo, maximo)
+
+            if tipo == "normal":
+                media, desvio = (float(v) for v in valores.split(","))
+                return lambda: self._random.gauss(media, desvio)
+
+            if tipo == "lognormal":
+                mediana, sigma = (float(v) for v in valores.split(","))
+                mu = math.log(mediana)
+                return lambda: self._random.lognormvariate(mu, sigma)
+        except ValueError:
+            pass
+
+        raise ValueError(f"Distribuição de latência inválida: {especificacao}")
+
+    def amostrar_segundos(self):
+        return max(self._amostrar(), 0.0) / 1000
+
+
+class ConfiguracaoSmeFake:
+    """ Parâmetros do servidor fake. """
+
+    def __init__(
+        self,
+        dres=13,
+        ues_por_dre=100,
+        usuarios=1000,
+        senha="Signa@123",
+        perfil="",
+        latencia="0",
+        taxa_erro=0.0,
+        taxa_timeout=0.0,
+        duracao_timeout=60.0,
+        token="",
+        seed=42,
+    ):
+        self.dres = dres
+        self.ues_por_dre = ues_por_dre
+        self.usuarios = usuarios
+        self.senha = senha
+        self.perfil = perfil
+        self.latencia = DistribuicaoLatencia(latencia, seed=seed)
+        self.taxa_erro = taxa_erro
+        self.taxa_timeout = taxa_timeout
+        self.duracao_timeout = duracao_timeout
+        self.token = token
+        self.seed = seed
+
+
+class DadosSmeFake:
+    """
+    Massa de dados determinística (mesma seed -> mesmos dados).
+
+    RFs são sequenciais a partir de RF_INICIAL, o que facilita montar
+    cargas de teste sem consultar o servidor.
+    """
+
+    RF_INICIAL = 1000000
+    CODIGO_DRE_INICIAL = 108100
+    TIPOS_UE = ("EMEF", "EMEI", "CEI DIRET", "EMEFM", "CEMEI")
+
+    def __init__(self, configuracao):
+        self.configuracao = configuracao
+        self.dres = [self._gerar_dre(i) for i in range(configuracao.dres)]
+        self._dres_por_codigo = {dre["codigoDRE"]: (i, dre) for i, dre in enumerate(self.dres)}
+        self._ues_por_dre = {}
+        self._lock = threading.Lock()
+        self.senhas = {}
+        self.emails = {}
+
+    @classmethod
+    def rf(cls, indice):
+        return str(cls.RF_INICIAL + indice)
+
+    def _gerar_dre(self, indice):
+        codigo = str(self.CODIGO_DRE_INICIAL + indice * 100)
+        return {
+            "codigoDRE": codigo,
+            "nomeDRE": f"DIRETORIA REGIONAL DE EDUCACAO {indice + 1:02d}",
+            "siglaDRE": f"DRE-{indice + 1:02d}",
+        }
+
+    def _gerar_ue(self, dre, indice_dre, indice, aleatorio):
+        tipo = self.TIPOS_UE[indice % len(self.TIPOS_UE)]
+        vagas = [aleatorio.randint(0, 400) for _ in range(5)]
+        return {
+            "codigoEol": f"{indice_dre:02d}{indice:04d}",
+            "nomeOficial": f"UNIDADE ESCOLAR {dre['siglaDRE']} {indice + 1:04d}",
+            "nomeNaoOficial": "",
+            "tipoUnidadeAdmin": "ESCOLA",
+            "tipoUE": tipo,
+            "logadouro": f"RUA {aleatorio.randint(1, 999)}",
+            "numero": str(aleatorio.randint(1, 3000)),
+            "bairro": "CENTRO",
+            "cep": aleatorio.randint(1000000, 9999999),
+            "distrito": "SE",
+            "subPrefeitura": "SE",
+            "nomeDre": dre["nomeDRE"],
+            "email": f"ue{indice}@sme.prefeitura.sp.gov.br",
+            "telefone1": "1100000000",
+            "telefone2": "",
+            "anoConstrucao": aleatorio.randint(1950, 2020),
+            "propriedade": "PROPRIO",
+            "capacidadeVagasMatutino": vagas[0],
+            "capacidadeVagasVespertino": vagas[1],
+            "capacidadeVagasNoturno": vagas[2],
+            "capacidadeVagasIntermediario": vagas[3],
+            "capacidadeVagasIntegral": vagas[4],
+            "capacidadeVagasTotal": sum(vagas),
+            "organizacaoParceira": False,
+            "quantidadeDeFuncionarios": aleatorio.randint(5, 120),
+            "status": "ATIVA",
+        }
+
+    def unidades(self, codigo_dre):
+        """ UEs de uma DRE (geradas sob demanda e memorizadas) ou None. """
+        if codigo_dre not in self._dres_por_codigo:
+            return None
+
+        indice_dre, dre = self._dres_por_codigo[codigo_dre]
+
+        with self._lock:
+            if codigo_dre not in self._ues_por_dre:
+                aleatorio = random.Random(f"{self.configuracao.seed}-{codigo_dre}")
+                self._ues_por_dre[codigo_dre] = [
+                    self._gerar_ue(dre, indice_dre, i, aleatorio)
+                    for i in range(self.configuracao.ues_por_dre)
+                ]
+            return self._ues_por_dre[codigo_dre]
+
+    def usuario(self, rf):
+        """ Dados do servidor pelo RF ou None se fora da massa gerada. """
+        if not rf.isdigit():
+            return None
+
+        indice = int(rf) - self.RF_INICIAL
+        if not 0 <= indice < self.configuracao.usuarios:
+            return None
+
+        return {
+            "nome": f"SERVIDOR TESTE {indice:06d}",
+            "codigoRf": rf,
+            "email": self.emails.get(rf, f"servidor{indice}@sme.prefeitura.sp.gov.br"),
+            "cpf": f"{indice:011d}",
+            "numeroDocumento": f"{indice:011d}",
+        }
+
+    def senha_valida(self, rf, senha):
+        return senha == self.senhas.get(rf, self.configuracao.senha)
+
+    def cargos(self, rf):
+        indice = int(rf) - self.RF_INICIAL
+        dre = self.dres[indice % len(self.dres)] if self.dres else {"siglaDRE": ""}
+        return [
+            {
+                "cargoBase": "PROFESSOR DE ENSINO FUNDAMENTAL II E MEDIO",
+                "cargoSobreposto": "COORDENADOR PEDAGOGICO" if indice % 3 == 0 else None,
+                "funcaoAtividade": None,
+                "tipoVinculoCargoSobreposto": "DESIGNADO" if indice % 3 == 0 else None,
+                "ueCargoSobreposto": f"UNIDADE ESCOLAR {dre['siglaDRE']} 0001" if indice % 3 == 0 else None,
+            }
+        ]
+
+
+class SmeFakeHandler(BaseHTTPRequestHandler):
+    """ Roteia as requisições para os endpoints simulados. """
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    ROTAS = (
+        ("GET", re.compile(r"^/DREs/?$"), "_dres"),
+        ("GET", re.compile(r"^/DREs/(?P<codigo>[^/]+)/unidades/?$"), "_unidades"),
+        ("POST", re.compile(r"^/v1/autenticacao/externa/?$"), "_autenticacao"),
+        ("GET", re.compile(r"^/AutenticacaoSgp/(?P<rf>[^/]+)/dados/?$"), "_dados_usuario"),
+        ("POST", re.compile(r"^/AutenticacaoSgp/AlterarSenha/?$"), "_alterar_senha"),
+        ("POST", re.compile(r"^/AutenticacaoSgp/AlterarEmail/?$"), "_alterar_email"),
+        ("GET", re.compile(r"^/funcionarios/cargo/(?P<rf>[^/]+)/?$"), "_cargos"),
+    )
+
+    def do_GET(self):
+        self._despachar("GET")
+
+    def do_POST(self):
+        self._despachar("POST")
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    # ---- infraestrutura -------------------------------------------------
+
+    def _despachar(self, metodo):
+        configuracao = self.server.configuracao
+        caminho = self.path.split("?", 1)[0]
+        corpo = self._ler_corpo()
+
+        time.sleep(configuracao.latencia.amostrar_segundos())
+
+        sorteio = self.server.random.random()
+        if sorteio < configuracao.taxa_timeout:
+            # segura a conexão além do timeout do cliente e encerra sem resposta
+            time.sleep(configuracao.duracao_timeout)
+            self.close_connection = True
+            return
+
+        if sorteio < configuracao.taxa_timeout + configuracao.taxa_erro:
+            return self._responder(500, {"mensagem": "Erro simulado"})
+
+        if configuracao.token and self.headers.get("x-api-eol-key") != configuracao.token:
+            return self._responder(401, {"mensagem": "Não autorizado"})
+
+        for metodo_rota, padrao, nome in self.ROTAS:
+            encontrado = padrao.match(caminho)
+            if encontrado and metodo_rota == metodo:
+                return getattr(self, nome)(corpo, **encontrado.groupdict())
+
+        self._responder(404, {"mensagem": "Recurso não encontrado"})
+
+    def _ler_corpo(self):
+        tamanho = int(self.headers.get("Content-Length") or 0)
+        if not tamanho:
+            return {}
+
+        bruto = self.rfile.read(tamanho).decode("utf-8")
+        if "json" in (self.headers.get("Content-Type") or ""):
+            return json.loads(bruto or "{}")
+        return {chave: valores[0] for chave, valores in parse_qs(bruto).items()}
+
+    def _responder(self, status, dados):
+        conteudo = dados if isinstance(dados, bytes) else json.dumps(dados).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(conteudo)))
+        self.end_headers()
+        self.wfile.write(conteudo)
+
+    # ---- endpoints ------------------------------------------------------
+
+    def _dres(self, corpo):
+        self._responder(200, self.server.dados.dres)
+
+    def _unidades(self, corpo, codigo):
+        unidades = self.server.dados.unidades(codigo)
+        if unidades is None:
+            return self._responder(404, {"mensagem": "DRE não encontrada"})
+        self._responder(200, unidades)
+
+    def _autenticacao(self, corpo):
+        dados = self.server.dados
+        rf = str(corpo.get("usuario", ""))
+        usuario = dados.usuario(rf)
+
+        if usuario is None or not dados.senha_valida(rf, corpo.get("senha")):
+            return self._responder(401, {"mensagem": "Usuário ou senha inválidos"})
+
+        perfis = [self.server.configuracao.perfil] if self.server.configuracao.perfil else []
+        self._responder(200, {**usuario, "perfis": perfis})
+
+    def _dados_usuario(self, corpo, rf):
+        usuario = self.server.dados.usuario(rf)
+        if usuario is None:
+            return self._responder(404, {"mensagem": "Usuário não encontrado"})
+        self._responder(200, usuario)
+
+    def _alterar_senha(self, corpo):
+        dados = self.server.dados
+        rf = corpo.get("Usuario", "")
+        if dados.usuario(rf) is None or not corpo.get("Senha"):
+            return self._responder(400, "Usuário ou senha inválidos".encode("utf-8"))
+
+        dados.senhas[rf] = corpo["Senha"]
+        self._responder(200, b"")
+
+    def _alterar_email(self, corpo):
+        dados = self.server.dados
+        rf = corpo.get("Usuario", "")
+        if dados.usuario(rf) is None or not corpo.get("Email"):
+            return self._responder(400, "Usuário ou e-mail inválidos".encode("utf-8"))
+
+        dados.emails[rf] = corpo["Email"]
+        self._responder(200, b"")
+
+    def _cargos(self, corpo, rf):
+        if self.server.dados.usuario(rf) is None:
+            return self._responder(404, {"mensagem": "Servidor não encontrado"})
+        self._responder(200, self.server.dados.cargos(rf))
+
+
+class ServidorSmeFake(ThreadingHTTPServer):
+    """ Servidor multithread; cada requisição é atendida em sua própria thread. """
+
+    daemon_threads = True
+
+    def __init__(self, endereco, configuracao, verbose=False):
+        super().__init__(endereco, SmeFakeHandler)
+        self.configuracao = configuracao
+        self.dados = DadosSmeFake(configuracao)
+        self.random = random.Random(configuracao.seed)
+        self.verbose = verbose
+
+    @property
+    def url(self):
+        host, porta = self.server_address[:2]
+        return f"http://{host}:{porta}"
+
+    def iniciar_em_thread(self):
+        """ Sobe o servidor em uma thread daemon (uso em testes e na carga). """
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
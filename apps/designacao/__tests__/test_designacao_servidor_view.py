@@ -7,6 +7,7 @@ from rest_framework import status
 from rest_framework.exceptions import ValidationError
 
 from apps.helpers.exceptions import SmeIntegracaoException
+from apps.usuarios.services.perfis_service import PerfisService
 
 User = get_user_model()
 
@@ -16,11 +17,14 @@ def client():
 
 
 @pytest.fixture
-def user(db):
-    return User.objects.create_user(
+def user(db, monkeypatch):
+    monkeypatch.setenv("GUIDE_PERFIL_SIGNA", "0000")
+    user = User.objects.create_user(
         username="usuario",
         password="senha123"
     )
+    PerfisService.registrar(user.username, ["0000"])
+    return user
 
 
 @pytest.fixture
@@ -164,3 +168,11 @@ def test_post_sem_autenticacao(client, url):
     )
 
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_post_sem_perfil_signa(auth_client, user, url):
+    PerfisService.registrar(user.username, ["OUTRO-PERFIL"])
+
+    response = auth_client.post(url, {"rf": "1234567"}, format="json")
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -12,12 +12,14 @@ from apps.designacao.services.designacao_servidor_service import (
     DesignacaoServidorService
 )
 from apps.helpers.exceptions import SmeIntegracaoException
+from apps.usuarios.api.permissions import PerfilSignaPermission
 
 logger = logging.getLogger(__name__)
 
 
 class DesignacaoServidorView(APIView):
-    permission_classes = [permissions.IsAuthenticated]
+    permission_classes = [permissions.IsAuthenticated, PerfilSignaPermission]
+    orcamento_consultas = 1
 
     def post(self, request):
         serializer = DesignacaoServidorRequestSerializer(
@@ -0,0 +1,31 @@
+"""
+Exigência de cache compartilhado fora do desenvolvimento.
+
+Limites de tentativas (apps.helpers.throttles), perfis guardados no login
+(PerfisService), revogação de tokens (RevogacaoService) e Idempotency-Key
+(apps.helpers.idempotencia) guardam estado no cache padrão. Com o cache em
+memória local, cada worker do gunicorn teria o seu: os limites se
+multiplicam pelo número de workers, uma revogação só vale no worker que a
+recebeu e uma repetição com a mesma chave executa de novo em outro worker.
+"""
+from django.conf import settings
+from django.core import checks
+
+BACKENDS_POR_PROCESSO = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+def verificar_cache_compartilhado(app_configs=None, **kwargs):
+    """ System check: com DEBUG=False o cache padrão precisa ser compartilhado (CACHE_URL). """
+    backend = settings.CACHES["default"]["BACKEND"]
+    if settings.DEBUG or backend not in BACKENDS_POR_PROCESSO:
+        return []
+    return [
+        checks.Error(
+            f"Cache padrão por processo ({backend}) com DEBUG=False.",
+            hint="Defina CACHE_URL com um cache compartilhado entre os workers, ex.: redis://redis:6379/1.",
+            id="usuarios.E003",
+        )
+    ]
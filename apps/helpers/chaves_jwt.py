@@ -0,0 +1,206 @@
+"""
+Assinatura assimétrica dos JWT (RS256, ES256, EdDSA...) com ``kid`` e JWKS.
+
+Com JWT_ALGORITMO simétrico (padrão HS256) nada muda: os tokens são
+assinados com o SECRET_KEY pelo backend do Simple JWT. Com um algoritmo
+assimétrico, a chave privada vem de JWT_CHAVE_PRIVADA ou de um arquivo
+(JWT_CHAVE_PRIVADA_ARQUIVO, ex.: secret montado no container); o cabeçalho
+de cada token leva o ``kid`` (thumbprint RFC 7638 da chave pública) e as
+chaves públicas ficam em /.well-known/jwks.json, para que outros serviços
+validem os tokens sem chamar esta API.
+
+As chaves são lidas e convertidas uma única vez por processo; o JWKS já fica
+serializado. Chaves públicas anteriores (JWT_CHAVES_PUBLICAS_ANTERIORES_ARQUIVOS)
+continuam aceitas e publicadas durante uma rotação.
+"""
+import base64
+import hashlib
+import json
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+import environ
+import jwt
+from django.core import checks
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt import state
+from rest_framework_simplejwt.backends import TokenBackend
+from rest_framework_simplejwt.exceptions import TokenBackendError
+from rest_framework_simplejwt.settings import api_settings
+
+env = environ.Env()
+
+# Membros obrigatórios de cada tipo de chave no thumbprint (RFC 7638).
+MEMBROS_THUMBPRINT = {"RSA": ("e", "kty", "n"), "EC": ("crv", "kty", "x", "y"), "OKP": ("crv", "kty", "x")}
+
+
+def _ler_pem(valor: str, arquivo: str, variavel: str) -> bytes:
+    if arquivo:
+        try:
+            return Path(arquivo).read_bytes()
+        except OSError as e:
+            raise ImproperlyConfigured(f"{variavel}_ARQUIVO ilegível: {e}")
+    # Em variáveis de ambiente as quebras de linha do PEM costumam vir como "\n" literal.
+    return valor.replace("\\n", "\n").encode()
+
+
+def _thumbprint(jwk: dict) -> str:
+    membros = {membro: jwk[membro] for membro in MEMBROS_THUMBPRINT[jwk["kty"]]}
+    canonico = json.dumps(membros, separators=(",", ":"), sort_keys=True).encode()
+    return base64.urlsafe_b64encode(hashlib.sha256(canonico).digest()).rstrip(b"=").decode()
+
+
+@dataclass(frozen=True)
+class ChavesJwt:
+    algoritmo: str
+    kid: str
+    chave_privada: object
+    publicas: dict
+    jwks: bytes
+    etag: str
+
+    @classmethod
+    def do_ambiente(cls) -> "ChavesJwt | None":
+        """ Chaves do ambiente, ou None com algoritmo simétrico (HS*). """
+        algoritmo = env("JWT_ALGORITMO", default="HS256").strip()
+        if algoritmo.startswith("HS"):
+            return None
+
+        try:
+            implementacao = jwt.PyJWS().get_algorithm_by_name(algoritmo)
+        except NotImplementedError:
+            raise ImproperlyConfigured(
+                f"JWT_ALGORITMO não suportado: {algoritmo!r} (algoritmos assimétricos exigem o pacote cryptography)"
+            )
+
+        pem = _ler_pem(env("JWT_CHAVE_PRIVADA", default=""), env("JWT_CHAVE_PRIVADA_ARQUIVO", default=""),
+                       "JWT_CHAVE_PRIVADA")
+        if not pem.strip():
+            raise ImproperlyConfigured(f"JWT_ALGORITMO={algoritmo} exige JWT_CHAVE_PRIVADA ou JWT_CHAVE_PRIVADA_ARQUIVO.")
+        try:
+            chave_privada = implementacao.prepare_key(pem)
+            if not hasattr(chave_privada, "sign"):
+                raise ImproperlyConfigured(f"JWT_CHAVE_PRIVADA deve ser uma chave privada para {algoritmo}.")
+            publicas = [chave_privada.public_key()]
+            for arquivo in env.list("JWT_CHAVES_PUBLICAS_ANTERIORES_ARQUIVOS", default=[]):
+                publicas.append(implementacao.prepare_key(_ler_pem("", arquivo, "JWT_CHAVES_PUBLICAS_ANTERIORES")))
+            jwks_publicas = [implementacao.to_jwk(publica, as_dict=True) for publica in publicas]
+        except (ValueError, TypeError, jwt.InvalidKeyError) as e:
+            raise ImproperlyConfigured(f"Chave inválida para JWT_ALGORITMO={algoritmo}: {e}")
+
+        por_kid = {}
+        for publica, jwk in zip(publicas, jwks_publicas):
+            jwk.update(kid=_thumbprint(jwk), alg=algoritmo, use="sig")
+            por_kid[jwk["kid"]] = (publica, jwk)
+
+        jwks = json.dumps({"keys": [jwk for _, jwk in por_kid.values()]}, separators=(",", ":")).encode()
+        return cls(
+            algoritmo=algoritmo,
+            kid=jwks_publicas[0]["kid"],
+            chave_privada=chave_privada,
+            publicas={kid: publica for kid, (publica, _) in por_kid.items()},
+            jwks=jwks,
+            etag=f'"{hashlib.sha256(jwks).hexdigest()[:32]}"',
+        )
+
+
+class TokenBackendAssimetrico(TokenBackend):
+    """ TokenBackend do Simple JWT que assina com ``kid`` e escolhe a chave pública pelo ``kid``. """
+
+    def __init__(self, chaves: ChavesJwt):
+        super().__init__(
+            chaves.algoritmo,
+            chaves.chave_privada,
+            chaves.publicas[chaves.kid],
+            api_settings.AUDIENCE,
+            api_settings.ISSUER,
+            None,
+            api_settings.LEEWAY,
+            api_settings.JSON_ENCODER,
+        )
+        self.chaves = chaves
+
+    def encode(self, payload):
+        jwt_payload = payload.copy()
+        if self.audience is not None:
+            jwt_payload["aud"] = self.audience
+        if self.issuer is not None:
+            jwt_payload["iss"] = self.issuer
+
+        return jwt.encode(
+            jwt_payload,
+            self.prepared_signing_key,
+            algorithm=self.algorithm,
+            headers={"kid": self.chaves.kid},
+            json_encoder=self.json_encoder,
+        )
+
+    def get_verifying_key(self, token):
+        try:
+            kid = jwt.get_unverified_header(token).get("kid")
+        except jwt.InvalidTokenError as e:
+            raise TokenBackendError(_("Token is invalid")) from e
+        chave = self.chaves.publicas.get(kid)
+        if chave is None:
+            raise TokenBackendError(_("Token is invalid"))
+        return chave
+
+
+_chaves = None
+_backend = None
+_carregadas = False
+_backend_simetrico = state.token_backend
+_lock = threading.Lock()
+
+
+def chaves_jwt() -> ChavesJwt | None:
+    if not _carregadas:
+        recarregar_chaves_jwt()
+    return _chaves
+
+
+def backend_jwt() -> TokenBackend:
+    """ Backend da configuração atual: assimétrico com chaves, senão o do Simple JWT. """
+    if not _carregadas:
+        recarregar_chaves_jwt()
+    return _backend or _backend_simetrico
+
+
+def recarregar_chaves_jwt() -> ChavesJwt | None:
+    """ Relê o ambiente e os arquivos de chave; tokens em validação mantêm o backend antigo. """
+    global _chaves, _backend, _carregadas
+    with _lock:
+        _chaves = ChavesJwt.do_ambiente()
+        _backend = TokenBackendAssimetrico(_chaves) if _chaves else None
+        _carregadas = True
+        return _chaves
+
+
+def descartar_chaves_jwt():
+    """ Esquece as chaves carregadas; o próximo acesso relê o ambiente (usado nos testes). """
+    global _chaves, _backend, _carregadas
+    with _lock:
+        _chaves = _backend = None
+        _carregadas = False
+
+
+class _BackendAtual:
+    """ Encaminha ao backend de ``backend_jwt()``; instalado no lugar do token_backend do Simple JWT. """
+
+    def __getattr__(self, nome):
+        return getattr(backend_jwt(), nome)
+
+
+def instalar_backend_jwt():
+    state.token_backend = _BackendAtual()
+
+
+def verificar_chaves_jwt(app_configs=None, **kwargs):
+    """ System check: chave ausente ou inválida impede o boot (migrate/runserver/check). """
+    try:
+        ChavesJwt.do_ambiente()
+    except ImproperlyConfigured as e:
+        return [checks.Error(str(e), id="usuarios.E002")]
+    return []
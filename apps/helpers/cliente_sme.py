@@ -0,0 +1,47 @@
+"""
+Sessão HTTP compartilhada com o SME (EOL/CoreSSO).
+
+``requests.get``/``requests.post`` criam uma sessão, e portanto uma conexão
+TCP/TLS, a cada chamada. Os serviços de integração usam ``sessao_sme()``,
+que mantém um pool de conexões keep-alive por processo. A sessão é criada
+no primeiro uso (depois do fork do worker) e fechada por
+``fechar_sessao_sme()`` no shutdown (lifespan ASGI).
+"""
+import threading
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+_sessao = None
+_lock = threading.Lock()
+
+
+def _criar_sessao() -> requests.Session:
+    sessao = requests.Session()
+    # A sessão é compartilhada entre usuários: nenhum cookie do SME pode vazar de uma chamada para outra.
+    sessao.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    adaptador = HTTPAdapter(pool_maxsize=settings.SME_INTEGRACAO_POOL_CONEXOES)
+    sessao.mount("http://", adaptador)
+    sessao.mount("https://", adaptador)
+    return sessao
+
+
+def sessao_sme() -> requests.Session:
+    global _sessao
+    sessao = _sessao
+    if sessao is None:
+        with _lock:
+            if _sessao is None:
+                _sessao = _criar_sessao()
+            sessao = _sessao
+    return sessao
+
+
+def fechar_sessao_sme():
+    global _sessao
+    with _lock:
+        if _sessao is not None:
+            _sessao.close()
+        _sessao = None
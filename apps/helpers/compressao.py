@@ -0,0 +1,210 @@
+"""
+Compressão gzip/brotli das respostas da API.
+
+O CompressaoMiddleware comprime, conforme o Accept-Encoding, as respostas
+JSON/texto acima de COMPRESSAO_TAMANHO_MINIMO bytes. ``CorpoPreComprimido``
+guarda as variantes já comprimidas de um corpo (ex.: listagens em cache) e
+``RespostaPreComprimida`` as serve, para que acertos de cache não sejam
+serializados nem comprimidos de novo. ``CompressaoIncremental`` monta um
+``CorpoPreComprimido`` a partir de um corpo recebido em blocos.
+
+O brotli é opcional: sem o pacote instalado só gzip é oferecido.
+"""
+import gzip
+import json
+import zlib
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+TIPOS_COMPRESSIVEIS = ("application/json", "text/")
+
+# Níveis para compressão por requisição (rápidos) e para corpos pré-comprimidos,
+# que são comprimidos uma vez por preenchimento do cache.
+NIVEIS = {"gzip": 6, "br": 4}
+NIVEIS_PRE_COMPRIMIDOS = {"gzip": 9, "br": 9}
+
+
+def codificacoes_disponiveis():
+    """ Em ordem de preferência. """
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def escolher_codificacao(accept_encoding):
+    """ Melhor codificação aceita pelo cliente (respeitando q=0) ou None. """
+    aceitas = {}
+    for item in accept_encoding.lower().split(","):
+        nome, _, parametros = item.strip().partition(";")
+        q = 1.0
+        if parametros.strip().startswith("q="):
+            try:
+                q = float(parametros.strip()[2:])
+            except ValueError:
+                q = 0.0
+        if nome:
+            aceitas[nome] = q
+
+    for codificacao in codificacoes_disponiveis():
+        if aceitas.get(codificacao, aceitas.get("*", 0.0)) > 0:
+            return codificacao
+    return None
+
+
+def comprimir(corpo, codificacao, nivel=None):
+    nivel = nivel or NIVEIS[codificacao]
+    if codificacao == "br":
+        return brotli.compress(corpo, quality=nivel)
+    return gzip.compress(corpo, compresslevel=nivel, mtime=0)
+
+
+def _compressivel(content_type):
+    return content_type.startswith(TIPOS_COMPRESSIVEIS)
+
+
+@dataclass(frozen=True)
+class CorpoPreComprimido:
+    """ Um corpo e suas variantes comprimidas, pronto para ser guardado em cache. """
+
+    content_type: str
+    variantes: dict
+
+    @classmethod
+    def de_dados(cls, dados):
+        """ Serializa com o renderer JSON padrão da API e comprime. """
+        renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+        return cls.de_bytes(renderer.render(dados), renderer.media_type)
+
+    @classmethod
+    def de_bytes(cls, corpo, content_type):
+        variantes = {"identity": corpo}
+        if len(corpo) >= settings.COMPRESSAO_TAMANHO_MINIMO:
+            for codificacao in codificacoes_disponiveis():
+                variantes[codificacao] = comprimir(corpo, codificacao, NIVEIS_PRE_COMPRIMIDOS[codificacao])
+        return cls(content_type, variantes)
+
+    @property
+    def corpo(self):
+        return self.variantes["identity"]
+
+
+class CompressaoIncremental:
+    """
+    Monta um CorpoPreComprimido a partir de blocos, comprimindo cada bloco ao
+    chegar (níveis por requisição): quem repassa um corpo em streaming não
+    precisa juntá-lo e comprimi-lo inteiro no fim.
+    """
+
+    def __init__(self, content_type):
+        self.content_type = content_type
+        self.blocos = []
+        self.tamanho = 0
+        self.compressores = {}
+        for codificacao in codificacoes_disponiveis():
+            if codificacao == "br":
+                self.compressores["br"] = brotli.Compressor(quality=NIVEIS["br"])
+            else:
+                # wbits=31: formato gzip (cabeçalho e CRC), como gzip.compress.
+                self.compressores["gzip"] = zlib.compressobj(NIVEIS["gzip"], zlib.DEFLATED, 31)
+        self.comprimidos = {codificacao: [] for codificacao in self.compressores}
+
+    def adicionar(self, bloco):
+        self.blocos.append(bloco)
+        self.tamanho += len(bloco)
+        for codificacao, compressor in self.compressores.items():
+            parte = compressor.process(bloco) if codificacao == "br" else compressor.compress(bloco)
+            if parte:
+                self.comprimidos[codificacao].append(parte)
+
+    def finalizar(self) -> CorpoPreComprimido:
+        variantes = {"identity": b"".join(self.blocos)}
+        self.blocos = []
+        if self.tamanho >= settings.COMPRESSAO_TAMANHO_MINIMO:
+            for codificacao, compressor in self.compressores.items():
+                final = compressor.finish() if codificacao == "br" else compressor.flush()
+                variantes[codificacao] = b"".join(self.comprimidos[codificacao]) + final
+        return CorpoPreComprimido(self.content_type, variantes)
+
+
+class RespostaPreComprimida(Response):
+    """
+    Response do DRF que serve um CorpoPreComprimido.
+
+    Com o renderer JSON o corpo sai como está, na variante escolhida pelo
+    Accept-Encoding; outros renderers (browsable API) e quem ler ``.data``
+    recebem o JSON decodificado.
+    """
+
+    def __init__(self, pre_comprimido, status=None):
+        self.pre_comprimido = pre_comprimido
+        super().__init__(status=status)
+
+    @property
+    def data(self):
+        return json.loads(self.pre_comprimido.corpo)
+
+    @data.setter
+    def data(self, valor):
+        # Response.__init__ atribui data=None; o conteúdo vem sempre do pre_comprimido.
+        pass
+
+    @property
+    def rendered_content(self):
+        if getattr(self.accepted_renderer, "format", None) != "json":
+            return super().rendered_content
+
+        request = self.renderer_context["request"]
+        codificacao = escolher_codificacao(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if codificacao not in self.pre_comprimido.variantes:
+            codificacao = "identity"
+
+        self["Content-Type"] = self.pre_comprimido.content_type
+        if len(self.pre_comprimido.variantes) > 1:
+            patch_vary_headers(self, ("Accept-Encoding",))
+        if codificacao != "identity":
+            self["Content-Encoding"] = codificacao
+        return self.pre_comprimido.variantes[codificacao]
+
+
+class CompressaoMiddleware:
+    """
+    Comprime respostas grandes conforme o Accept-Encoding (br > gzip).
+
+    Ignora respostas em streaming, já codificadas (ex.: CorpoPreComprimido)
+    ou de tipos que não comprimem bem.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        if (
+            response.streaming
+            or response.has_header("Content-Encoding")
+            or not _compressivel(response.get("Content-Type", ""))
+            or len(response.content) < settings.COMPRESSAO_TAMANHO_MINIMO
+        ):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        codificacao = escolher_codificacao(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if codificacao is None:
+            return response
+
+        comprimido = comprimir(response.content, codificacao)
+        if len(comprimido) >= len(response.content):
+            return response
+
+        response.content = comprimido
+        response["Content-Length"] = str(len(comprimido))
+        response["Content-Encoding"] = codificacao
+        return response
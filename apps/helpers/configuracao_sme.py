@@ -0,0 +1,156 @@
+"""
+Configuração da integração com o SME (EOL/CoreSSO).
+
+Os valores são lidos do ambiente uma única vez, validados e mantidos em um
+objeto imutável; os serviços usam ``configuracao_sme()`` em vez de consultar
+o os.environ a cada chamada.
+
+A x-api-eol-key pode vir de SME_INTEGRACAO_TOKEN ou de um arquivo
+(SME_INTEGRACAO_TOKEN_ARQUIVO, ex.: secret montado no container). Com o
+arquivo, ``configuracao_sme()`` confere o seu mtime a cada
+SME_INTEGRACAO_TOKEN_VERIFICACAO segundos e, se ele mudou, relê tudo e troca
+o objeto de uma vez: a chave é rotacionada sem HUP nem reinício dos workers.
+"""
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import urlparse
+
+import environ
+from django.core import checks
+from django.core.exceptions import ImproperlyConfigured
+
+env = environ.Env()
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ConfiguracaoSme:
+    url: str
+    token: str
+    codigo_sistema: str
+    perfil_signa: str
+
+    @classmethod
+    def do_ambiente(cls) -> "ConfiguracaoSme":
+        token = env("SME_INTEGRACAO_TOKEN", default="")
+        arquivo = env("SME_INTEGRACAO_TOKEN_ARQUIVO", default="")
+        if arquivo:
+            try:
+                token = Path(arquivo).read_text().strip()
+            except OSError as e:
+                raise ImproperlyConfigured(f"SME_INTEGRACAO_TOKEN_ARQUIVO ilegível: {e}")
+
+        configuracao = cls(
+            url=env("SME_INTEGRACAO_URL", default="").strip().rstrip("/"),
+            token=token.strip(),
+            codigo_sistema=env("CODIGO_SISTEMA_SIGNA", default="").strip(),
+            perfil_signa=env("GUIDE_PERFIL_SIGNA", default="").strip(),
+        )
+        configuracao.validar()
+        return configuracao
+
+    def validar(self):
+        if not self.url:
+            return
+        partes = urlparse(self.url)
+        if partes.scheme not in ("http", "https") or not partes.netloc:
+            raise ImproperlyConfigured(f"SME_INTEGRACAO_URL inválida: {self.url!r}")
+
+    def cabecalhos(self, base: dict) -> dict:
+        """ Cabeçalhos do serviço acrescidos da x-api-eol-key atual. """
+        return {**base, "x-api-eol-key": self.token}
+
+
+_configuracao = None
+_arquivo = None
+_verificado_em = 0.0
+_lock = threading.Lock()
+
+
+def configuracao_sme() -> ConfiguracaoSme:
+    configuracao = _configuracao
+    if configuracao is None:
+        configuracao = recarregar_configuracao_sme()
+    elif _arquivo is not None and time.monotonic() - _verificado_em >= _arquivo[2]:
+        configuracao = _recarregar_se_o_arquivo_mudou()
+    return configuracao
+
+
+def recarregar_configuracao_sme() -> ConfiguracaoSme:
+    """ Relê o ambiente (e o arquivo do token); requisições em andamento mantêm o objeto antigo. """
+    global _configuracao, _arquivo, _verificado_em
+    with _lock:
+        caminho = env("SME_INTEGRACAO_TOKEN_ARQUIVO", default="")
+        versao = _versao_do_arquivo(caminho) if caminho else None
+        _configuracao = ConfiguracaoSme.do_ambiente()
+        intervalo = env.float("SME_INTEGRACAO_TOKEN_VERIFICACAO", default=10.0)
+        _arquivo = (caminho, versao, intervalo) if caminho else None
+        _verificado_em = time.monotonic()
+        return _configuracao
+
+
+def _versao_do_arquivo(caminho):
+    """ mtime, tamanho e inode: um secret do Kubernetes é trocado por outro arquivo (symlink). """
+    try:
+        estado = os.stat(caminho)
+    except OSError:
+        return None
+    return estado.st_mtime_ns, estado.st_size, estado.st_ino
+
+
+def _recarregar_se_o_arquivo_mudou() -> ConfiguracaoSme:
+    global _verificado_em
+    caminho, versao, _ = _arquivo
+    atual = _versao_do_arquivo(caminho)
+    if atual is None or atual == versao:
+        # Arquivo inalterado ou ausente no meio de uma troca: fica a chave atual.
+        _verificado_em = time.monotonic()
+        return _configuracao
+    try:
+        configuracao = recarregar_configuracao_sme()
+    except ImproperlyConfigured as e:
+        logger.warning("Chave do SME não recarregada; mantida a anterior: %s", e)
+        _verificado_em = time.monotonic()
+        return _configuracao
+    logger.info("Chave do SME recarregada de %s.", caminho)
+    return configuracao
+
+
+def descartar_configuracao_sme():
+    """ Esquece o objeto carregado; o próximo acesso relê o ambiente (usado nos testes). """
+    global _configuracao, _arquivo
+    with _lock:
+        _configuracao = None
+        _arquivo = None
+
+
+def verificar_configuracao_sme(app_configs=None, **kwargs):
+    """ System check: configuração inválida impede o boot (migrate/runserver/check). """
+    try:
+        ConfiguracaoSme.do_ambiente()
+    except ImproperlyConfigured as e:
+        return [checks.Error(str(e), id="usuarios.E001")]
+    return []
+
+
+def verificar_configuracao_sme_deploy(app_configs=None, **kwargs):
+    """ System check (--deploy): avisa sobre variáveis da integração não preenchidas. """
+    try:
+        configuracao = ConfiguracaoSme.do_ambiente()
+    except ImproperlyConfigured:
+        return []
+    variaveis = {
+        "url": "SME_INTEGRACAO_URL",
+        "token": "SME_INTEGRACAO_TOKEN",
+        "codigo_sistema": "CODIGO_SISTEMA_SIGNA",
+        "perfil_signa": "GUIDE_PERFIL_SIGNA",
+    }
+    return [
+        checks.Warning(f"{variavel} não configurado.", id="usuarios.W001")
+        for campo, variavel in variaveis.items()
+        if not getattr(configuracao, campo)
+    ]
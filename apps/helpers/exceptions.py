@@ -40,3 +40,7 @@ class PerfilNaoAutorizadoError(Exception):
     """Não possui perfil signa"""
     pass
 
+class OrcamentoConsultasExcedido(Exception):
+    """Endpoint executou mais consultas SQL que o orçamento declarado"""
+    pass
+
@@ -0,0 +1,130 @@
+"""
+Suporte ao cabeçalho ``Idempotency-Key`` nas mutações que chamam o SME.
+
+Um cliente que repete a requisição após um timeout (com a mesma chave) não
+executa de novo a alteração no CoreSSO: recebe a resposta registrada da
+primeira execução, com ``Idempotent-Replayed: true``.
+
+O registro fica no cache padrão (compartilhado entre workers com CACHE_URL
+apontando para um Redis), por chave + view + usuário:
+- ``cache.add`` marca a chave como em andamento por IDEMPOTENCIA_TRAVA
+  segundos; uma repetição concorrente recebe 409 com Retry-After;
+- uma resposta 2xx fica guardada por IDEMPOTENCIA_RETENCAO segundos;
+- respostas de erro não são guardadas (a falha pode ser transitória e nada
+  foi alterado no SME): a chave é liberada e a repetição executa de novo.
+
+A assinatura da requisição (método, caminho e corpo, em HMAC com o
+SECRET_KEY, sem guardar senhas em claro) acompanha o registro; reutilizar a
+chave com outra requisição é recusado com 422.
+"""
+import functools
+import hashlib
+import hmac
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import QueryDict
+from rest_framework import status
+from rest_framework.response import Response
+
+from apps.monitoramento.metricas import IDEMPOTENCIA_REPETICOES
+
+CABECALHO = "Idempotency-Key"
+TAMANHO_MAXIMO_CHAVE = 255
+
+EM_ANDAMENTO = "em_andamento"
+CONCLUIDA = "concluida"
+
+
+def _assinatura(request) -> str:
+    dados = request.data
+    if isinstance(dados, QueryDict):
+        dados = dict(dados.lists())
+    corpo = json.dumps(dados, sort_keys=True, default=str)
+    mensagem = f"{request.method}\n{request.path}\n{corpo}".encode()
+    return hmac.new(settings.SECRET_KEY.encode(), mensagem, hashlib.sha256).hexdigest()
+
+
+def _chave_do_registro(view, request, chave) -> str:
+    usuario = request.user.pk if request.user and request.user.is_authenticated else "-"
+    resumo = hashlib.sha256(chave.encode()).hexdigest()
+    return f"idempotencia:{type(view).__name__}:{usuario}:{resumo}"
+
+
+def _erro(detalhe, codigo, **cabecalhos):
+    response = Response({"detail": detalhe}, status=codigo)
+    for nome, valor in cabecalhos.items():
+        response[nome] = valor
+    return response
+
+
+def idempotente(handler):
+    """
+    Decorator do handler (post/put/update) de uma APIView/ViewSet.
+
+    Sem o cabeçalho Idempotency-Key a requisição segue normalmente.
+    """
+
+    @functools.wraps(handler)
+    def wrapper(view, request, *args, **kwargs):
+        chave = request.headers.get(CABECALHO)
+        if chave is None:
+            return handler(view, request, *args, **kwargs)
+
+        chave = chave.strip()
+        if not chave or len(chave) > TAMANHO_MAXIMO_CHAVE or not chave.isprintable():
+            return _erro(f"{CABECALHO} inválida.", status.HTTP_400_BAD_REQUEST)
+
+        registro_chave = _chave_do_registro(view, request, chave)
+        assinatura = _assinatura(request)
+        nome_view = type(view).__name__
+
+        em_andamento = {"estado": EM_ANDAMENTO, "assinatura": assinatura}
+        if not cache.add(registro_chave, em_andamento, settings.IDEMPOTENCIA_TRAVA):
+            registro = cache.get(registro_chave)
+            if registro is not None:
+                if registro["assinatura"] != assinatura:
+                    IDEMPOTENCIA_REPETICOES.labels(nome_view, "conflito").inc()
+                    return _erro(
+                        f"{CABECALHO} já utilizada com outra requisição.",
+                        status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    )
+                if registro["estado"] == EM_ANDAMENTO:
+                    IDEMPOTENCIA_REPETICOES.labels(nome_view, "em_andamento").inc()
+                    return _erro(
+                        "Requisição em andamento. Tente novamente em instantes.",
+                        status.HTTP_409_CONFLICT,
+                        **{"Retry-After": "1"},
+                    )
+                IDEMPOTENCIA_REPETICOES.labels(nome_view, "repetida").inc()
+                response = Response(registro["dados"], status=registro["status"])
+                response["Idempotent-Replayed"] = "true"
+                return response
+
+            # O registro expirou entre o add e o get: executa como primeira vez.
+            if not cache.add(registro_chave, em_andamento, settings.IDEMPOTENCIA_TRAVA):
+                return _erro(
+                    "Requisição em andamento. Tente novamente em instantes.",
+                    status.HTTP_409_CONFLICT,
+                    **{"Retry-After": "1"},
+                )
+
+        try:
+            response = handler(view, request, *args, **kwargs)
+        except BaseException:
+            cache.delete(registro_chave)
+            raise
+
+        if status.is_success(response.status_code) and isinstance(response, Response):
+            cache.set(
+                registro_chave,
+                {"estado": CONCLUIDA, "assinatura": assinatura, "status": response.status_code,
+                 "dados": response.data},
+                settings.IDEMPOTENCIA_RETENCAO,
+            )
+        else:
+            cache.delete(registro_chave)
+        return response
+
+    return wrapper
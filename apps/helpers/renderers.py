@@ -0,0 +1,77 @@
+"""
+Renderer e parser JSON baseados no orjson.
+
+Produzem a mesma saída do JSONRenderer/JSONParser do DRF (UNICODE_JSON e
+COMPACT_JSON ligados, que é o padrão): datas, Decimal, lazy strings e
+demais tipos não nativos passam pelo encoder do DRF. Sem o orjson
+instalado, ou quando a requisição pede algo que ele não faz (indent,
+ensure_ascii, charset diferente de utf-8), caem para a implementação da
+stdlib do DRF.
+"""
+from rest_framework import renderers
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.settings import api_settings
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    # Datas vão para o encoder do DRF (milissegundos e "Z" em UTC, como na stdlib).
+    OPCOES_ORJSON = orjson.OPT_PASSTHROUGH_DATETIME
+    # Chaves não-str (int, UUID...) custam ~30% a mais; só são usadas quando o dump simples falha.
+    OPCOES_ORJSON_CHAVES = OPCOES_ORJSON | orjson.OPT_NON_STR_KEYS
+
+_encoder_drf = encoders.JSONEncoder()
+
+
+def _dumps(data):
+    try:
+        return orjson.dumps(data, default=_encoder_drf.default, option=OPCOES_ORJSON)
+    except TypeError:
+        return orjson.dumps(data, default=_encoder_drf.default, option=OPCOES_ORJSON_CHAVES)
+
+
+class JSONRapidoRenderer(renderers.JSONRenderer):
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        if (
+            orjson is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            corpo = _dumps(data)
+        except TypeError:
+            # Inteiros acima de 64 bits, chaves não serializáveis etc.
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Como o DRF: U+2028/U+2029 escapados para o JSON ser JavaScript válido. A busca
+        # por um único byte (memchr) descarta quase todos os corpos sem a busca completa.
+        if (b"\xa8" in corpo or b"\xa9" in corpo) and (b"\xe2\x80\xa8" in corpo or b"\xe2\x80\xa9" in corpo):
+            corpo = corpo.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return corpo
+
+
+class JSONRapidoParser(JSONParser):
+    renderer_class = JSONRapidoRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", "utf-8").lower().replace("_", "-")
+        if orjson is None or encoding not in ("utf-8", "utf8") or not api_settings.STRICT_JSON:
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
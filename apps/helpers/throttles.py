@@ -0,0 +1,101 @@
+"""
+Limites de requisições (throttling) por IP e por RF.
+
+Usados nos endpoints públicos que custam caro (login e esqueci minha
+senha): cada tentativa chama o CoreSSO e/ou gera hash de senha. A view
+define ``throttle_scope`` e as taxas ficam em
+REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"] como ``<escopo>_ip`` e
+``<escopo>_rf`` (ex.: "login_ip": "20/m", "login_rf": "10/15m").
+
+A janela é deslizante (histórico de instantes por chave, como no
+SimpleRateThrottle do DRF) e fica no cache padrão, compartilhado entre os
+workers quando CACHE_URL aponta para um Redis. Como o DRF verifica os
+throttles antes de chamar o handler, uma requisição recusada não chega ao
+serializer, ao CoreSSO nem ao hash de senha.
+"""
+import re
+
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+from apps.monitoramento.metricas import THROTTLE_RECUSAS
+
+# Unidades aceitas nas taxas (as do DRF, mais abreviações)
+DURACOES = {
+    **dict.fromkeys(("s", "sec", "second"), 1),
+    **dict.fromkeys(("m", "min", "minute"), 60),
+    **dict.fromkeys(("h", "hour"), 3600),
+    **dict.fromkeys(("d", "day"), 86400),
+}
+
+
+class JanelaDeslizanteThrottle(SimpleRateThrottle):
+    """
+    Base dos throttles por escopo da view. Sem ``throttle_scope`` na view, ou
+    sem taxa configurada para o escopo, a requisição passa.
+    """
+
+    sufixo = None
+
+    def __init__(self):
+        # A taxa depende da view; é resolvida em allow_request.
+        pass
+
+    def allow_request(self, request, view):
+        escopo = getattr(view, "throttle_scope", None)
+        if not escopo:
+            return True
+
+        self.scope = f"{escopo}_{self.sufixo}"
+        # Lido a cada requisição (e não na importação, como no DRF) para valer override_settings.
+        self.rate = api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+        if not self.rate:
+            return True
+
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
+
+    def parse_rate(self, rate):
+        """ Aceita "N/período" com multiplicador opcional: "5/m", "10/15m", "100/2h". """
+        numero, periodo = rate.split("/")
+        encontrado = re.fullmatch(r"(\d*)([a-z]+?)s?", periodo.strip().lower())
+        if not encontrado or encontrado.group(2) not in DURACOES:
+            raise ValueError(f"Taxa de throttle inválida: {rate!r}")
+        multiplicador = int(encontrado.group(1) or 1)
+        return int(numero), multiplicador * DURACOES[encontrado.group(2)]
+
+    def throttle_failure(self):
+        THROTTLE_RECUSAS.labels(self.scope).inc()
+        return False
+
+
+class PorIPThrottle(JanelaDeslizanteThrottle):
+    """ Limite por IP do cliente: REMOTE_ADDR, ou o X-Forwarded-For com REST_FRAMEWORK["NUM_PROXIES"] > 0. """
+
+    sufixo = "ip"
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {"scope": self.scope, "ident": self.get_ident(request)}
+
+
+class PorRFThrottle(JanelaDeslizanteThrottle):
+    """
+    Limite por RF informado no corpo (campo ``username``), normalizado como
+    no LoginSerializer: "123.456-7" e "1234567" contam juntos.
+    """
+
+    sufixo = "rf"
+
+    def get_cache_key(self, request, view):
+        rf = rf_da_requisicao(request)
+        if not rf:
+            return None
+        return self.cache_format % {"scope": self.scope, "ident": rf}
+
+
+def rf_da_requisicao(request):
+    dados = request.data
+    username = dados.get("username") if hasattr(dados, "get") else None
+    if not isinstance(username, (str, int)):
+        return None
+    return re.sub(r"\D", "", str(username)) or None
@@ -0,0 +1,82 @@
+import pytest
+
+from apps.monitoramento.instrumentacao import (
+    Medicao,
+    medicao_atual,
+    iniciar_medicao,
+    encerrar_medicao,
+    medir_upstream,
+    medir_fase,
+)
+
+
+def test_medir_upstream_sem_medicao_ativa_nao_falha():
+    assert medicao_atual() is None
+
+    with medir_upstream("/DREs"):
+        pass
+
+
+def test_medir_upstream_agrupa_por_endpoint():
+    medicao, token = iniciar_medicao()
+    try:
+        with medir_upstream("/DREs"):
+            pass
+        with medir_upstream("/DREs"):
+            pass
+        with medir_upstream("/DREs/{}/unidades"):
+            pass
+    finally:
+        encerrar_medicao(token)
+
+    assert medicao.upstream["/DREs"][0] == 2
+    assert medicao.upstream["/DREs/{}/unidades"][0] == 1
+    assert medicao_atual() is None
+
+
+def test_medir_upstream_registra_mesmo_com_excecao():
+    medicao, token = iniciar_medicao()
+    try:
+        with pytest.raises(RuntimeError):
+            with medir_upstream("/v1/autenticacao/externa"):
+                raise RuntimeError("falha")
+    finally:
+        encerrar_medicao(token)
+
+    assert medicao.upstream["/v1/autenticacao/externa"][0] == 1
+
+
+def test_medir_fase_acumula():
+    medicao, token = iniciar_medicao()
+    try:
+        with medir_fase("senha"):
+            pass
+        with medir_fase("senha"):
+            pass
+    finally:
+        encerrar_medicao(token)
+
+    assert "senha" in medicao.fases
+
+
+def test_server_timing_formato():
+    medicao = Medicao()
+    medicao.registrar_upstream("/DREs", 0.120)
+    medicao.registrar_fase("senha", 0.050)
+    medicao.db_consultas = 3
+    medicao.db_segundos = 0.010
+
+    cabecalho = medicao.server_timing(0.200)
+
+    assert 'db;dur=10.0;desc="3 consultas"' in cabecalho
+    assert 'upstream;dur=120.0;desc="/DREs"' in cabecalho
+    assert "senha;dur=50.0" in cabecalho
+    assert "app;dur=20.0" in cabecalho
+    assert "total;dur=200.0" in cabecalho
+
+
+def test_resumo_app_nunca_negativo():
+    medicao = Medicao()
+    medicao.registrar_upstream("/DREs", 0.5)
+
+    assert medicao.resumo(0.1)["app_ms"] == 0.0
@@ -0,0 +1,104 @@
+import pytest
+from unittest.mock import patch
+from django.core import checks
+from prometheus_client import REGISTRY
+
+from apps.monitoramento.api.views.metricas_view import verificar_token_metricas
+from apps.monitoramento.instrumentacao import medir_upstream
+from apps.unidades.services.unidades_service import DREIntegracaoService
+from apps.usuarios.services.envia_email_service import EnviaEmailService
+
+
+def _valor(nome, **labels):
+    return REGISTRY.get_sample_value(nome, labels) or 0.0
+
+
+@pytest.mark.django_db
+def test_endpoint_metricas(client):
+    client.get("/api/unidades/")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/plain")
+    conteudo = response.content.decode()
+    assert "signa_http_requisicoes_total" in conteudo
+
+
+@pytest.mark.django_db
+def test_endpoint_metricas_com_token(client, settings):
+    settings.METRICAS_TOKEN = "segredo"
+
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", HTTP_AUTHORIZATION="Bearer errado").status_code == 401
+    assert client.get("/metrics", HTTP_AUTHORIZATION="Bearer segredo").status_code == 200
+
+
+@pytest.mark.parametrize("debug, token, erros", [
+    (False, "", ["monitoramento.E001"]),
+    (False, "segredo", []),
+    (True, "", []),
+])
+def test_token_obrigatorio_sem_debug(settings, debug, token, erros):
+    settings.DEBUG = debug
+    settings.METRICAS_TOKEN = token
+
+    assert [e.id for e in verificar_token_metricas()] == erros
+    assert verificar_token_metricas in checks.registry.registry.get_checks()
+
+
+@pytest.mark.django_db
+def test_requisicoes_http_por_view(client):
+    antes = _valor(
+        "signa_http_requisicoes_total", view="unidades:unidade-list", metodo="GET", status="400"
+    )
+
+    client.get("/api/unidades/")
+
+    depois = _valor(
+        "signa_http_requisicoes_total", view="unidades:unidade-list", metodo="GET", status="400"
+    )
+    assert depois == antes + 1
+    assert _valor("signa_http_em_andamento") == 0
+
+
+def test_integracao_por_endpoint_e_status():
+    antes = _valor("signa_integracao_requisicoes_total", endpoint="/DREs", status="200")
+
+    with patch("requests.Session.get") as mock_get:
+        mock_get.return_value.status_code = 200
+        mock_get.return_value.json.return_value = []
+        DREIntegracaoService.get_dres()
+
+    assert _valor("signa_integracao_requisicoes_total", endpoint="/DREs", status="200") == antes + 1
+    assert _valor("signa_integracao_em_andamento", endpoint="/DREs") == 0
+
+
+def test_integracao_excecao_contabilizada_como_erro():
+    antes = _valor("signa_integracao_requisicoes_total", endpoint="/teste", status="erro")
+
+    with pytest.raises(TimeoutError):
+        with medir_upstream("/teste"):
+            raise TimeoutError()
+
+    assert _valor("signa_integracao_requisicoes_total", endpoint="/teste", status="erro") == antes + 1
+
+
+def test_emails_enviados():
+    template = "emails/exemplo.html"
+    antes = _valor("signa_emails_enviados_total", template=template, resultado="sucesso")
+
+    with patch("apps.usuarios.services.envia_email_service.EmailMessage"):
+        EnviaEmailService.enviar("a@a.com", "Assunto", template, {})
+
+    assert _valor("signa_emails_enviados_total", template=template, resultado="sucesso") == antes + 1
+
+
+def test_emails_com_erro():
+    template = "emails/exemplo.html"
+    antes = _valor("signa_emails_enviados_total", template=template, resultado="erro")
+
+    with pytest.raises(Exception):
+        EnviaEmailService.enviar("", "Assunto", template, {})
+
+    assert _valor("signa_emails_enviados_total", template=template, resultado="erro") == antes + 1
@@ -0,0 +1,93 @@
+import logging
+import pytest
+from unittest.mock import patch
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.monitoramento.instrumentacao import medir_upstream
+
+
+@pytest.fixture
+def instrumentacao_total(settings):
+    settings.INSTRUMENTACAO_HABILITADA = True
+    settings.INSTRUMENTACAO_TAXA_AMOSTRAGEM = 1.0
+    settings.INSTRUMENTACAO_SERVER_TIMING = True
+
+
+@pytest.mark.django_db
+def test_server_timing_com_upstream(client, instrumentacao_total):
+    def fake_get_dres():
+        with medir_upstream("/DREs"):
+            return [{"codigoDRE": "108200"}]
+
+    with patch(
+        "apps.unidades.api.views.unidades_viewset.DREIntegracaoService.get_dres",
+        side_effect=fake_get_dres,
+    ):
+        response = client.get("/api/unidades/", {"tipo": "DRE"})
+
+    assert response.status_code == 200
+    cabecalho = response["Server-Timing"]
+    assert 'upstream;dur=' in cabecalho
+    assert 'desc="/DREs"' in cabecalho
+    assert "total;dur=" in cabecalho
+
+
+@pytest.mark.django_db
+def test_contabiliza_consultas_db(client, instrumentacao_total, django_user_model):
+    user = django_user_model.objects.create_user(username="1234567", email="a@a.com")
+    access = RefreshToken.for_user(user).access_token
+
+    response = client.get(reverse("me"), HTTP_AUTHORIZATION=f"Bearer {access}")
+
+    assert response.status_code == 200
+    assert 'desc="1 consultas"' in response["Server-Timing"]
+
+
+@pytest.mark.django_db
+def test_log_estruturado(client, instrumentacao_total, caplog):
+    with caplog.at_level(logging.INFO, logger="apps.monitoramento.middleware"):
+        client.get("/api/unidades/")
+
+    registro = next(r for r in caplog.records if r.name == "apps.monitoramento.middleware")
+    assert registro.status == 400
+    assert registro.view == "unidades:unidade-list"
+    assert "total_ms" in registro.__dict__
+
+
+@pytest.mark.django_db
+def test_sem_amostragem_nao_instrumenta(client, settings):
+    settings.INSTRUMENTACAO_TAXA_AMOSTRAGEM = 0.0
+
+    response = client.get("/api/unidades/")
+
+    assert "Server-Timing" not in response
+
+
+@pytest.mark.django_db
+def test_desabilitada_nao_instrumenta(client, settings):
+    settings.INSTRUMENTACAO_HABILITADA = False
+    settings.INSTRUMENTACAO_TAXA_AMOSTRAGEM = 1.0
+
+    response = client.get("/api/unidades/")
+
+    assert "Server-Timing" not in response
+
+
+@pytest.mark.django_db
+def test_server_timing_pode_ser_omitido(client, instrumentacao_total, settings):
+    settings.INSTRUMENTACAO_SERVER_TIMING = False
+
+    response = client.get("/api/unidades/")
+
+    assert "Server-Timing" not in response
+
+
+@pytest.mark.django_db
+def test_server_timing_desligado_por_padrao(client, settings):
+    settings.INSTRUMENTACAO_HABILITADA = True
+    settings.INSTRUMENTACAO_TAXA_AMOSTRAGEM = 1.0
+
+    response = client.get("/api/unidades/")
+
+    assert "Server-Timing" not in response
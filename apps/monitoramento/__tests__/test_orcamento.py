@@ -0,0 +1,103 @@
+import logging
+import pytest
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.helpers.exceptions import OrcamentoConsultasExcedido
+from apps.monitoramento.orcamento import (
+    ContadorConsultas,
+    conta_no_orcamento,
+    fora_do_orcamento,
+    orcamento_consultas,
+    orcamento_da_view,
+    verificar_orcamento,
+)
+from apps.usuarios.api.views.me_view import MeView
+
+
+@pytest.fixture
+def autenticado(django_user_model):
+    user = django_user_model.objects.create_user(username="1234567", email="a@a.com")
+    access = RefreshToken.for_user(user).access_token
+    return {"HTTP_AUTHORIZATION": f"Bearer {access}"}
+
+
+def test_decorator_e_views_de_classe():
+    @orcamento_consultas(2)
+    def view(request):
+        pass
+
+    assert orcamento_da_view(view) == 2
+    assert orcamento_da_view(MeView.as_view()) == MeView.orcamento_consultas
+    assert orcamento_da_view(lambda request: None) is None
+
+
+@pytest.mark.parametrize("sql, conta", [
+    ("SELECT 1", True),
+    ('UPDATE "usuarios_user" SET ...', True),
+    ("BEGIN", False),
+    ('SAVEPOINT "s1"', False),
+    ('RELEASE SAVEPOINT "s1"', False),
+    ('ROLLBACK TO SAVEPOINT "s1"', False),
+])
+def test_controle_de_transacao_nao_conta(sql, conta):
+    assert conta_no_orcamento(sql) is conta
+
+
+def test_fora_do_orcamento_nao_conta():
+    contador = ContadorConsultas()
+    executar = lambda sql, params, many, context: None
+
+    contador(executar, "SELECT 1", None, False, {})
+    with fora_do_orcamento():
+        contador(executar, "SELECT 2", None, False, {})
+    contador(executar, "SELECT 3", None, False, {})
+
+    assert contador.consultas == ["SELECT 1", "SELECT 3"]
+
+
+@pytest.mark.django_db
+def test_verificar_orcamento(client, autenticado, settings, monkeypatch):
+    settings.ORCAMENTO_CONSULTAS_MODO = "desligado"
+
+    with verificar_orcamento(MeView):
+        client.get(reverse("me"), **autenticado)
+
+    monkeypatch.setattr(MeView, "orcamento_consultas", 0)
+    with pytest.raises(OrcamentoConsultasExcedido, match="usuarios_user"):
+        with verificar_orcamento(MeView):
+            client.get(reverse("me"), **autenticado)
+
+
+@pytest.mark.django_db
+def test_modo_erro_levanta(client, autenticado, settings, monkeypatch):
+    settings.ORCAMENTO_CONSULTAS_MODO = "erro"
+    monkeypatch.setattr(MeView, "orcamento_consultas", 0)
+
+    with pytest.raises(OrcamentoConsultasExcedido, match="GET /api/usuario/me"):
+        client.get(reverse("me"), **autenticado)
+
+
+@pytest.mark.django_db
+def test_modo_log_registra_sql(client, autenticado, settings, monkeypatch, caplog):
+    settings.ORCAMENTO_CONSULTAS_MODO = "log"
+    monkeypatch.setattr(MeView, "orcamento_consultas", 0)
+
+    with caplog.at_level(logging.WARNING, logger="apps.monitoramento.middleware"):
+        response = client.get(reverse("me"), **autenticado)
+
+    assert response.status_code == 200
+    registro = next(r for r in caplog.records if hasattr(r, "orcamento_consultas"))
+    assert registro.orcamento_consultas == 0
+    assert registro.consultas_executadas == 1
+    assert "usuarios_user" in registro.sql[0]
+
+
+@pytest.mark.django_db
+def test_dentro_do_orcamento_nao_registra(client, autenticado, settings, caplog):
+    settings.ORCAMENTO_CONSULTAS_MODO = "log"
+
+    with caplog.at_level(logging.WARNING, logger="apps.monitoramento.middleware"):
+        client.get(reverse("me"), **autenticado)
+
+    assert not any(hasattr(r, "orcamento_consultas") for r in caplog.records)
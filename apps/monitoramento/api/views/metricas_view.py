@@ -0,0 +1,52 @@
+import os
+import hmac
+
+from django.conf import settings
+from django.core import checks
+from django.http import HttpResponse
+from django.views.decorators.http import require_GET
+from prometheus_client import CollectorRegistry, CONTENT_TYPE_LATEST, REGISTRY, generate_latest
+from prometheus_client import multiprocess
+
+
+def _registry():
+    """
+    Com PROMETHEUS_MULTIPROC_DIR definido (gunicorn com vários workers),
+    agrega os arquivos de todos os processos; caso contrário usa o registro local.
+    """
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+@require_GET
+def metricas_view(request):
+    """
+    Expõe as métricas no formato texto do Prometheus.
+
+    View Django simples (sem DRF/JWT) para manter o custo da coleta baixo.
+    Se METRICAS_TOKEN estiver definido, exige "Authorization: Bearer <token>";
+    com DEBUG=False ele é obrigatório (verificar_token_metricas).
+    """
+    token = settings.METRICAS_TOKEN
+    if token:
+        autorizacao = request.headers.get("Authorization", "")
+        if not hmac.compare_digest(autorizacao, f"Bearer {token}"):
+            return HttpResponse(status=401)
+
+    return HttpResponse(generate_latest(_registry()), content_type=CONTENT_TYPE_LATEST)
+
+
+def verificar_token_metricas(app_configs=None, **kwargs):
+    """ System check: com DEBUG=False o /metrics precisa de METRICAS_TOKEN. """
+    if settings.DEBUG or settings.METRICAS_TOKEN:
+        return []
+    return [
+        checks.Error(
+            "METRICAS_TOKEN vazio com DEBUG=False: /metrics ficaria aberto a qualquer cliente.",
+            hint='Defina METRICAS_TOKEN e configure o Prometheus com "Authorization: Bearer <token>".',
+            id="monitoramento.E001",
+        )
+    ]
@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class MonitoramentoConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.monitoramento'
+
+    def ready(self):
+        from django.core import checks
+        from apps.monitoramento.api.views.metricas_view import verificar_token_metricas
+
+        checks.register(verificar_token_metricas)
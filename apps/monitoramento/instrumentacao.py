@@ -0,0 +1,148 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from apps.monitoramento.metricas import (
+    INTEGRACAO_DURACAO,
+    INTEGRACAO_EM_ANDAMENTO,
+    INTEGRACAO_REQUISICOES,
+)
+
+_medicao_atual = ContextVar("medicao_atual", default=None)
+
+
+class Medicao:
+    """
+    Acumula o tempo gasto por fase durante uma requisição.
+
+    - upstream: chamadas à integração SME, agrupadas pelo nome do endpoint
+    - fases: trechos locais relevantes (ex.: hash de senha)
+    - db: quantidade e tempo das consultas SQL
+    """
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.upstream = {}
+        self.fases = {}
+        self.db_consultas = 0
+        self.db_segundos = 0.0
+
+    def registrar_upstream(self, endpoint, duracao):
+        chamadas, segundos = self.upstream.get(endpoint, (0, 0.0))
+        self.upstream[endpoint] = (chamadas + 1, segundos + duracao)
+
+    def registrar_fase(self, nome, duracao):
+        self.fases[nome] = self.fases.get(nome, 0.0) + duracao
+
+    def wrapper_db(self, execute, sql, params, many, context):
+        """ Wrapper para connection.execute_wrapper que contabiliza as consultas. """
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_consultas += 1
+            self.db_segundos += time.perf_counter() - inicio
+
+    @property
+    def upstream_segundos(self):
+        return sum(segundos for _, segundos in self.upstream.values())
+
+    def resumo(self, total):
+        """ Retorna os tempos em milissegundos, prontos para log estruturado. """
+        fases_ms = {nome: round(seg * 1000, 2) for nome, seg in self.fases.items()}
+        app = total - self.db_segundos - self.upstream_segundos - sum(self.fases.values())
+
+        return {
+            "total_ms": round(total * 1000, 2),
+            "app_ms": round(max(app, 0.0) * 1000, 2),
+            "db_consultas": self.db_consultas,
+            "db_ms": round(self.db_segundos * 1000, 2),
+            "upstream_ms": round(self.upstream_segundos * 1000, 2),
+            "upstream": {
+                endpoint: {"chamadas": chamadas, "ms": round(seg * 1000, 2)}
+                for endpoint, (chamadas, seg) in self.upstream.items()
+            },
+            "fases": fases_ms,
+        }
+
+    def server_timing(self, total):
+        """ Monta o valor do cabeçalho Server-Timing (W3C). """
+        resumo = self.resumo(total)
+
+        entradas = [
+            f'db;dur={resumo["db_ms"]};desc="{self.db_consultas} consultas"',
+        ]
+        for endpoint, dados in resumo["upstream"].items():
+            entradas.append(f'upstream;dur={dados["ms"]};desc="{endpoint}"')
+        for nome, ms in resumo["fases"].items():
+            entradas.append(f"{nome};dur={ms}")
+        entradas.append(f'app;dur={resumo["app_ms"]}')
+        entradas.append(f'total;dur={resumo["total_ms"]}')
+
+        return ", ".join(entradas)
+
+
+def medicao_atual():
+    """ Medição da requisição corrente ou None quando não amostrada. """
+    return _medicao_atual.get()
+
+
+def iniciar_medicao():
+    """ Ativa uma nova medição no contexto atual e devolve (medicao, token). """
+    medicao = Medicao()
+    return medicao, _medicao_atual.set(medicao)
+
+
+def encerrar_medicao(token):
+    _medicao_atual.reset(token)
+
+
+class ChamadaUpstream:
+    """ Resultado de uma chamada medida; o status é preenchido pelo chamador. """
+
+    __slots__ = ("status",)
+
+    def __init__(self):
+        self.status = None
+
+
+@contextmanager
+def medir_upstream(endpoint):
+    """
+    Mede uma chamada à integração SME.
+
+    O endpoint deve ser o nome do recurso sem parâmetros variáveis
+    (ex.: "/DREs/{}/unidades") para manter baixa a cardinalidade.
+    O chamador pode informar o status HTTP em ``chamada.status``;
+    exceções são contabilizadas como "erro".
+    """
+    chamada = ChamadaUpstream()
+    em_andamento = INTEGRACAO_EM_ANDAMENTO.labels(endpoint)
+    em_andamento.inc()
+    inicio = time.perf_counter()
+    try:
+        yield chamada
+    except BaseException:
+        chamada.status = "erro"
+        raise
+    finally:
+        duracao = time.perf_counter() - inicio
+        em_andamento.dec()
+        INTEGRACAO_DURACAO.labels(endpoint).observe(duracao)
+        INTEGRACAO_REQUISICOES.labels(endpoint, str(chamada.status or "desconhecido")).inc()
+
+        medicao = _medicao_atual.get()
+        if medicao is not None:
+            medicao.registrar_upstream(endpoint, duracao)
+
+
+@contextmanager
+def medir_fase(nome):
+    """ Mede um trecho local da requisição (ex.: "senha" para o PBKDF2). """
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        medicao = _medicao_atual.get()
+        if medicao is not None:
+            medicao.registrar_fase(nome, time.perf_counter() - inicio)
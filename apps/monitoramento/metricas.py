@@ -0,0 +1,97 @@
+"""
+Métricas no formato Prometheus.
+
+Em produção (gunicorn com vários workers) defina PROMETHEUS_MULTIPROC_DIR
+antes de iniciar o processo: cada worker grava seus valores em arquivos
+mmap nesse diretório e o endpoint /metrics agrega todos eles.
+"""
+from prometheus_client import Counter, Gauge, Histogram
+
+# Buckets pensados para a latência da integração SME (chamadas de 50ms a 30s)
+BUCKETS_LATENCIA = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+HTTP_REQUISICOES = Counter(
+    "signa_http_requisicoes_total",
+    "Requisições HTTP atendidas.",
+    ["view", "metodo", "status"],
+)
+HTTP_DURACAO = Histogram(
+    "signa_http_duracao_segundos",
+    "Tempo de resposta das requisições HTTP.",
+    ["view", "metodo"],
+    buckets=BUCKETS_LATENCIA,
+)
+HTTP_EM_ANDAMENTO = Gauge(
+    "signa_http_em_andamento",
+    "Requisições HTTP em processamento.",
+    multiprocess_mode="livesum",
+)
+
+INTEGRACAO_REQUISICOES = Counter(
+    "signa_integracao_requisicoes_total",
+    "Chamadas à integração SME (EOL/CoreSSO).",
+    ["endpoint", "status"],
+)
+INTEGRACAO_DURACAO = Histogram(
+    "signa_integracao_duracao_segundos",
+    "Latência das chamadas à integração SME.",
+    ["endpoint"],
+    buckets=BUCKETS_LATENCIA,
+)
+INTEGRACAO_EM_ANDAMENTO = Gauge(
+    "signa_integracao_em_andamento",
+    "Chamadas à integração SME em andamento.",
+    ["endpoint"],
+    multiprocess_mode="livesum",
+)
+
+CACHE_CONSULTAS = Counter(
+    "signa_cache_consultas_total",
+    "Consultas ao cache por resultado (acerto/falha).",
+    ["cache", "resultado"],
+)
+
+THROTTLE_RECUSAS = Counter(
+    "signa_throttle_recusas_total",
+    "Requisições recusadas por limite de taxa (apps.helpers.throttles).",
+    ["escopo"],
+)
+
+IDEMPOTENCIA_REPETICOES = Counter(
+    "signa_idempotencia_repeticoes_total",
+    "Requisições repetidas com a mesma Idempotency-Key (repetida/em_andamento/conflito).",
+    ["view", "resultado"],
+)
+
+USUARIOS_CONFLITOS = Counter(
+    "signa_usuarios_conflitos_total",
+    "E-mails/CPFs liberados de outro usuário por conflito de unicidade (login/auditoria).",
+    ["campo", "origem"],
+)
+
+RECUPERACOES_SENHA = Counter(
+    "signa_recuperacoes_senha_total",
+    "Pedidos de recuperação de senha processados pelo worker, por resultado.",
+    ["resultado"],
+)
+RECUPERACOES_SENHA_PENDENTES = Gauge(
+    "signa_recuperacoes_senha_pendentes",
+    "Pedidos de recuperação de senha na fila, medidos pelo worker a cada lote.",
+    multiprocess_mode="max",
+)
+
+EMAILS_ENVIADOS = Counter(
+    "signa_emails_enviados_total",
+    "E-mails processados por template e resultado.",
+    ["template", "resultado"],
+)
+EMAILS_DURACAO = Histogram(
+    "signa_emails_duracao_segundos",
+    "Tempo de envio de e-mails.",
+    buckets=BUCKETS_LATENCIA,
+)
+
+
+def registrar_cache(cache, acerto):
+    """ Contabiliza um acerto ou falha de cache. """
+    CACHE_CONSULTAS.labels(cache, "acerto" if acerto else "falha").inc()
@@ -0,0 +1,151 @@
+import time
+import random
+import logging
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from apps.helpers.exceptions import OrcamentoConsultasExcedido
+from apps.monitoramento.instrumentacao import iniciar_medicao, encerrar_medicao
+from apps.monitoramento.metricas import HTTP_DURACAO, HTTP_EM_ANDAMENTO, HTTP_REQUISICOES
+from apps.monitoramento.orcamento import ContadorConsultas, orcamento_da_view
+
+logger = logging.getLogger(__name__)
+
+
+class InstrumentacaoMiddleware:
+    """
+    Mede o tempo de cada requisição amostrada, separando as fases de
+    integração SME, banco de dados e processamento local.
+
+    O resultado vai para um log estruturado e, com INSTRUMENTACAO_SERVER_TIMING
+    (ligado só em desenvolvimento), também para o cabeçalho Server-Timing.
+    A amostragem é controlada por INSTRUMENTACAO_TAXA_AMOSTRAGEM (0.0 a 1.0).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not self._amostrar():
+            return self.get_response(request)
+
+        medicao, token = iniciar_medicao()
+        try:
+            with ExitStack() as stack:
+                for conexao in connections.all():
+                    stack.enter_context(conexao.execute_wrapper(medicao.wrapper_db))
+                response = self.get_response(request)
+        finally:
+            encerrar_medicao(token)
+
+        total = time.perf_counter() - medicao.inicio
+
+        if settings.INSTRUMENTACAO_SERVER_TIMING:
+            response["Server-Timing"] = medicao.server_timing(total)
+
+        resumo = medicao.resumo(total)
+        resolver_match = getattr(request, "resolver_match", None)
+        logger.info(
+            "%s %s %s %.2fms (db=%s/%.2fms upstream=%.2fms)",
+            request.method,
+            request.path,
+            response.status_code,
+            resumo["total_ms"],
+            resumo["db_consultas"],
+            resumo["db_ms"],
+            resumo["upstream_ms"],
+            extra={
+                "metodo": request.method,
+                "rota": request.path,
+                "view": resolver_match.view_name if resolver_match else None,
+                "status": response.status_code,
+                **resumo,
+            },
+        )
+
+        return response
+
+    @staticmethod
+    def _amostrar():
+        if not settings.INSTRUMENTACAO_HABILITADA:
+            return False
+
+        taxa = settings.INSTRUMENTACAO_TAXA_AMOSTRAGEM
+        return taxa >= 1 or random.random() < taxa
+
+
+class MetricasMiddleware:
+    """
+    Registra contagem, latência e requisições em andamento por view
+    nas métricas Prometheus expostas em /metrics.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        HTTP_EM_ANDAMENTO.inc()
+        inicio = time.perf_counter()
+        status = 500
+        try:
+            response = self.get_response(request)
+            status = response.status_code
+            return response
+        finally:
+            duracao = time.perf_counter() - inicio
+            HTTP_EM_ANDAMENTO.dec()
+
+            resolver_match = getattr(request, "resolver_match", None)
+            view = resolver_match.view_name if resolver_match else "nao_resolvida"
+
+            HTTP_DURACAO.labels(view, request.method).observe(duracao)
+            HTTP_REQUISICOES.labels(view, request.method, str(status)).inc()
+
+
+class OrcamentoConsultasMiddleware:
+    """
+    Confere o número de consultas SQL de cada requisição contra o
+    ``orcamento_consultas`` declarado na view (ver apps.monitoramento.orcamento).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        modo = settings.ORCAMENTO_CONSULTAS_MODO
+        if modo == "desligado":
+            return self.get_response(request)
+
+        contador = ContadorConsultas()
+        with ExitStack() as stack:
+            for conexao in connections.all():
+                stack.enter_context(conexao.execute_wrapper(contador))
+            response = self.get_response(request)
+
+        maximo = getattr(request, "_orcamento_consultas", None)
+        executadas = len(contador.consultas)
+        if maximo is None or executadas <= maximo:
+            return response
+
+        mensagem = (
+            f"{request.method} {request.path} executou {executadas} consultas "
+            f"(orçamento: {maximo})"
+        )
+        if modo == "erro":
+            raise OrcamentoConsultasExcedido(mensagem + ":\n" + "\n".join(contador.consultas))
+
+        logger.warning(
+            mensagem,
+            extra={
+                "rota": request.path,
+                "orcamento_consultas": maximo,
+                "consultas_executadas": executadas,
+                "sql": contador.consultas,
+            },
+        )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._orcamento_consultas = orcamento_da_view(view_func)
@@ -0,0 +1,103 @@
+"""
+Orçamento de consultas SQL por endpoint.
+
+As views declaram o máximo de consultas permitido por requisição com o
+atributo ``orcamento_consultas`` (classes) ou o decorator de mesmo nome
+(funções). O OrcamentoConsultasMiddleware confere o total ao final de
+cada requisição, conforme ORCAMENTO_CONSULTAS_MODO:
+
+- "desligado": nada é medido
+- "log": registra um warning com o SQL capturado (produção)
+- "erro": levanta OrcamentoConsultasExcedido (testes)
+
+Caminhos de exceção raros (ex.: resolução de conflito no login) podem
+rodar em ``fora_do_orcamento()``: o orçamento continua valendo para o
+caminho comum sem precisar acomodar o pior caso.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import connections
+
+from apps.helpers.exceptions import OrcamentoConsultasExcedido
+
+ATRIBUTO = "orcamento_consultas"
+
+# Controle de transação não conta: nos testes cada atomic() vira SAVEPOINT
+# dentro da transação do teste, e o SQLite emite BEGIN explícito. Assim a
+# contagem é a mesma nos testes e em produção.
+_PREFIXOS_IGNORADOS = ("BEGIN", "COMMIT", "ROLLBACK", "SAVEPOINT", "RELEASE SAVEPOINT")
+
+_fora_do_orcamento = ContextVar("fora_do_orcamento", default=False)
+
+
+def conta_no_orcamento(sql):
+    return not sql.lstrip().upper().startswith(_PREFIXOS_IGNORADOS)
+
+
+@contextmanager
+def fora_do_orcamento():
+    """ As consultas do bloco não entram na contagem do OrcamentoConsultasMiddleware. """
+    token = _fora_do_orcamento.set(True)
+    try:
+        yield
+    finally:
+        _fora_do_orcamento.reset(token)
+
+
+def orcamento_consultas(maximo):
+    """ Decorator para views baseadas em função. """
+    def decorator(view):
+        setattr(view, ATRIBUTO, maximo)
+        return view
+    return decorator
+
+
+def orcamento_da_view(view):
+    """
+    Orçamento declarado pela view (função, APIView ou ViewSet) ou None.
+
+    ``as_view()`` do DRF expõe a classe em ``view.cls``.
+    """
+    maximo = getattr(view, ATRIBUTO, None)
+    if maximo is None and hasattr(view, "cls"):
+        maximo = getattr(view.cls, ATRIBUTO, None)
+    return maximo
+
+
+class ContadorConsultas:
+    """ execute_wrapper que conta as consultas e guarda o SQL executado. """
+
+    def __init__(self):
+        self.consultas = []
+
+    def __call__(self, execute, sql, params, many, context):
+        if conta_no_orcamento(sql) and not _fora_do_orcamento.get():
+            self.consultas.append(sql)
+        return execute(sql, params, many, context)
+
+
+@contextmanager
+def verificar_orcamento(view, using="default"):
+    """
+    Helper de teste: falha se o bloco executar mais consultas que o orçamento da view.
+
+        with verificar_orcamento(LoginView):
+            client.post(reverse("login"), payload)
+    """
+    # django.test é pesado e só é usado aqui; não entra no boot dos workers.
+    from django.test.utils import CaptureQueriesContext
+
+    maximo = orcamento_da_view(view)
+    assert maximo is not None, f"{view} não declara {ATRIBUTO}"
+
+    with CaptureQueriesContext(connections[using]) as contexto:
+        yield contexto
+
+    consultas = [q["sql"] for q in contexto.captured_queries if conta_no_orcamento(q["sql"])]
+    executadas = len(consultas)
+    if executadas > maximo:
+        sql = "\n".join(consultas)
+        raise OrcamentoConsultasExcedido(
+            f"{view} executou {executadas} consultas (orçamento: {maximo}):\n{sql}"
+        )
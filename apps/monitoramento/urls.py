@@ -0,0 +1,8 @@
+from django.urls import path
+from apps.monitoramento.api.views.metricas_view import metricas_view
+
+app_name = "monitoramento"
+
+urlpatterns = [
+    path("", metricas_view, name="metricas"),
+]
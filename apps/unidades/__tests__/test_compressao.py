@@ -0,0 +1,176 @@
+import gzip
+import json
+import brotli
+import pytest
+from unittest.mock import Mock, patch
+from django.http import JsonResponse
+from django.test import RequestFactory
+
+from apps.desempenho.sme_fake import ConfiguracaoSmeFake, DadosSmeFake
+from apps.helpers.compressao import CompressaoIncremental, CompressaoMiddleware, escolher_codificacao
+from apps.unidades.services.unidades_service import EOLCommunicationError, EOLUnexpectedResponseError
+
+UES = [{"codigoEol": f"{i:06d}", "nomeEscola": f"EMEF ESCOLA {i}", "siglaTipoEscola": "EMEF"} for i in range(200)]
+
+
+@pytest.mark.parametrize("accept_encoding, esperado", [
+    ("gzip, deflate, br", "br"),
+    ("gzip", "gzip"),
+    ("br;q=0, gzip;q=0.5", "gzip"),
+    ("*", "br"),
+    ("identity", None),
+    ("", None),
+])
+def test_escolher_codificacao(accept_encoding, esperado):
+    assert escolher_codificacao(accept_encoding) == esperado
+
+
+@patch("apps.unidades.api.views.unidades_viewset.UnidadeIntegracaoService.stream_unidades_by_dre")
+def test_listagem_repassada_e_servida_pre_comprimida_do_cache(mock_stream, client):
+    corpo = json.dumps(UES).encode()
+    mock_stream.return_value = [corpo[:100], corpo[100:]]
+
+    repasse = client.get("/api/unidades/", {"tipo": "UE", "dre": "108200"}, HTTP_ACCEPT_ENCODING="gzip, br")
+    assert repasse.streaming
+    assert b"".join(repasse.streaming_content) == corpo
+
+    br = client.get("/api/unidades/", {"tipo": "UE", "dre": "108200"}, HTTP_ACCEPT_ENCODING="gzip, br")
+    gz = client.get("/api/unidades/", {"tipo": "UE", "dre": "108200"}, HTTP_ACCEPT_ENCODING="gzip")
+    puro = client.get("/api/unidades/", {"tipo": "UE", "dre": " 108200 "})
+
+    mock_stream.assert_called_once()
+    assert br["Content-Encoding"] == "br"
+    assert brotli.decompress(br.content) == corpo
+    assert gz["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(gz.content)) == UES
+    assert not puro.has_header("Content-Encoding")
+    assert puro.json() == UES
+    assert "Accept-Encoding" in br["Vary"]
+    assert br["Content-Type"] == "application/json"
+
+
+@patch("apps.unidades.api.views.unidades_viewset.UnidadeIntegracaoService.stream_unidades_by_dre")
+def test_repasse_interrompido_nao_vai_para_o_cache(mock_stream, client):
+    def blocos():
+        yield b'[{"codigoEol": "000191"}'
+        raise EOLCommunicationError("conexão perdida")
+
+    mock_stream.side_effect = [blocos(), [b"[]"]]
+
+    repasse = client.get("/api/unidades/", {"tipo": "UE", "dre": "108200"})
+    with pytest.raises(EOLCommunicationError):
+        b"".join(repasse.streaming_content)
+
+    seguinte = client.get("/api/unidades/", {"tipo": "UE", "dre": "108200"})
+    assert seguinte.streaming
+    assert mock_stream.call_count == 2
+
+
+@patch("requests.Session.get")
+def test_corpo_do_eol_incompleto_nao_vai_para_o_cache(mock_get, client, monkeypatch):
+    monkeypatch.setenv("SME_INTEGRACAO_URL", "https://sme.test/api")
+    # Cortado logo após o fechamento de uma lista interna: termina em "]".
+    cortado = Mock(status_code=200)
+    cortado.iter_content.return_value = iter([b'[{"codigoEol": "000191", "turnos": [1, 2]'])
+    inteiro = Mock(status_code=200)
+    inteiro.iter_content.return_value = iter([b"[]"])
+    mock_get.side_effect = [cortado, inteiro]
+
+    repasse = client.get("/api/unidades/", {"tipo": "UE", "dre": "108200"})
+    assert repasse.status_code == 200
+    with pytest.raises(EOLUnexpectedResponseError):
+        b"".join(repasse.streaming_content)
+
+    seguinte = client.get("/api/unidades/", {"tipo": "UE", "dre": "108200"})
+    assert seguinte.streaming
+    assert b"".join(seguinte.streaming_content) == b"[]"
+    assert mock_get.call_count == 2
+
+
+@pytest.mark.parametrize("tamanho_bloco", [7, 4096])
+def test_compressao_incremental_equivale_ao_corpo_inteiro(tamanho_bloco):
+    corpo = json.dumps(UES).encode()
+    compressao = CompressaoIncremental("application/json")
+    for inicio in range(0, len(corpo), tamanho_bloco):
+        compressao.adicionar(corpo[inicio:inicio + tamanho_bloco])
+
+    pre_comprimido = compressao.finalizar()
+
+    assert pre_comprimido.corpo == corpo
+    assert gzip.decompress(pre_comprimido.variantes["gzip"]) == corpo
+    assert brotli.decompress(pre_comprimido.variantes["br"]) == corpo
+    assert len(pre_comprimido.variantes["br"]) < len(corpo) // 4
+
+
+def test_compressao_incremental_de_corpo_pequeno():
+    compressao = CompressaoIncremental("application/json")
+    compressao.adicionar(b"[]")
+
+    assert compressao.finalizar().variantes == {"identity": b"[]"}
+
+
+@patch("apps.unidades.api.views.unidades_viewset.UnidadeIntegracaoService.get_unidades_by_dre")
+def test_formato_padronizado_decodifica_e_reaproveita_o_cache(mock_get, client):
+    dados = DadosSmeFake(ConfiguracaoSmeFake(dres=1, ues_por_dre=3))
+    ues = dados.unidades(dados.dres[0]["codigoDRE"])
+    mock_get.return_value = ues
+
+    padronizado = client.get("/api/unidades/", {"tipo": "UE", "dre": "108200", "formato": "padronizado", "campos": "codigo_eol,tipo_nome_ue"})
+    repasse = client.get("/api/unidades/", {"tipo": "UE", "dre": "108200"})
+
+    mock_get.assert_called_once()
+    assert padronizado.json()[0] == {
+        "codigo_eol": ues[0]["codigoEol"],
+        "tipo_nome_ue": f"{ues[0]['tipoUE']} {ues[0]['nomeOficial']}",
+    }
+    assert not repasse.streaming
+    assert repasse.json() == ues
+
+
+@patch("apps.unidades.api.views.unidades_viewset.UnidadeIntegracaoService.get_unidades_by_dre", return_value=UES)
+def test_formato_padronizado_com_ue_incompleta(mock_get, client):
+    response = client.get("/api/unidades/", {"tipo": "UE", "dre": "108200", "formato": "padronizado"})
+
+    assert response.status_code == 500
+
+
+@patch("apps.unidades.api.views.unidades_viewset.DREIntegracaoService.get_dres")
+def test_erro_do_eol_nao_vai_para_o_cache(mock_get, client):
+    mock_get.side_effect = [PermissionError("Não autorizado"), [{"codigoDRE": "108200"}]]
+
+    assert client.get("/api/unidades/", {"tipo": "DRE"}).status_code == 401
+    response = client.get("/api/unidades/", {"tipo": "DRE"})
+
+    assert response.status_code == 200
+    assert response.json() == [{"codigoDRE": "108200"}]
+
+
+@patch("apps.unidades.api.views.unidades_viewset.DREIntegracaoService.get_dres", return_value=UES)
+def test_browsable_api_recebe_html(mock_get, client):
+    response = client.get("/api/unidades/", {"tipo": "DRE"}, HTTP_ACCEPT="text/html")
+
+    assert response["Content-Type"].startswith("text/html")
+    assert b"EMEF ESCOLA 199" in response.content
+
+
+def _middleware(response):
+    return CompressaoMiddleware(lambda request: response)
+
+
+def test_middleware_comprime_respostas_grandes():
+    request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING="gzip")
+
+    response = _middleware(JsonResponse(UES, safe=False))(request)
+
+    assert response["Content-Encoding"] == "gzip"
+    assert int(response["Content-Length"]) == len(response.content)
+    assert json.loads(gzip.decompress(response.content)) == UES
+
+
+def test_middleware_ignora_respostas_pequenas_e_sem_accept_encoding():
+    pequena = _middleware(JsonResponse({"ok": True}))(RequestFactory().get("/", HTTP_ACCEPT_ENCODING="br"))
+    sem_accept = _middleware(JsonResponse(UES, safe=False))(RequestFactory().get("/"))
+
+    assert not pequena.has_header("Content-Encoding")
+    assert not sem_accept.has_header("Content-Encoding")
+    assert sem_accept["Vary"] == "Accept-Encoding"
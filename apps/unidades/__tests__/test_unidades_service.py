@@ -7,7 +7,8 @@ from apps.unidades.services.unidades_service import (
     EOLIntegrationError,
     EOLTimeoutError,
     EOLCommunicationError,
-    EOLUnexpectedResponseError
+    EOLUnexpectedResponseError,
+    FechamentoDaLista,
 )
 
 
@@ -16,8 +17,8 @@ class TestDREIntegracaoService:
     
     # ==================== TESTES DE get_dres ====================
     
-    @patch('apps.unidades.services.unidades_service.requests.get')
-    @patch('apps.unidades.services.unidades_service.env')
+    @patch('requests.Session.get')
+    @patch('apps.helpers.configuracao_sme.env')
     def test_get_dres_sucesso(
         self, mock_env, mock_get, 
         mock_env_config, mock_http_response_success, mock_dres_response
@@ -33,8 +34,8 @@ class TestDREIntegracaoService:
         mock_get.assert_called_once()
         assert 'x-api-eol-key' in mock_get.call_args[1]['headers']
     
-    @patch('apps.unidades.services.unidades_service.requests.get')
-    @patch('apps.unidades.services.unidades_service.env')
+    @patch('requests.Session.get')
+    @patch('apps.helpers.configuracao_sme.env')
     @pytest.mark.parametrize('status_code,exception_type,error_message', [
         (401, PermissionError, 'Não autorizado'),
         (500, EOLIntegrationError, 'Erro na consulta de DREs'),
@@ -54,8 +55,8 @@ class TestDREIntegracaoService:
         
         assert error_message in str(exc_info.value)
     
-    @patch('apps.unidades.services.unidades_service.requests.get')
-    @patch('apps.unidades.services.unidades_service.env')
+    @patch('requests.Session.get')
+    @patch('apps.helpers.configuracao_sme.env')
     @pytest.mark.parametrize('exception_class,expected_exception,error_message', [
         (requests.exceptions.Timeout, EOLTimeoutError, 'Tempo limite excedido'),
         (requests.exceptions.ConnectionError, EOLCommunicationError, 'Erro de comunicação'),
@@ -74,8 +75,8 @@ class TestDREIntegracaoService:
         
         assert error_message in str(exc_info.value)
     
-    @patch('apps.unidades.services.unidades_service.requests.get')
-    @patch('apps.unidades.services.unidades_service.env')
+    @patch('requests.Session.get')
+    @patch('apps.helpers.configuracao_sme.env')
     def test_get_dres_lista_vazia(
         self, mock_env, mock_get, 
         mock_env_config, mock_http_response_success
@@ -89,8 +90,8 @@ class TestDREIntegracaoService:
         assert result == []
         assert len(result) == 0
     
-    @patch('apps.unidades.services.unidades_service.requests.get')
-    @patch('apps.unidades.services.unidades_service.env')
+    @patch('requests.Session.get')
+    @patch('apps.helpers.configuracao_sme.env')
     def test_get_dres_headers_corretos(
         self, mock_env, mock_get, 
         mock_env_config, mock_http_response_success, 
@@ -107,8 +108,8 @@ class TestDREIntegracaoService:
         assert 'x-api-eol-key' in call_kwargs['headers']
         assert call_kwargs['timeout'] == 30
     
-    @patch('apps.unidades.services.unidades_service.requests.get')
-    @patch('apps.unidades.services.unidades_service.env')
+    @patch('requests.Session.get')
+    @patch('apps.helpers.configuracao_sme.env')
     def test_get_dres_excecao_generica(
         self, mock_env, mock_get, 
         mock_env_config
@@ -182,8 +183,8 @@ class TestDREIntegracaoService:
     # ==================== TESTES DE LOGGING ====================
     
     @patch('apps.unidades.services.unidades_service.logger')
-    @patch('apps.unidades.services.unidades_service.requests.get')
-    @patch('apps.unidades.services.unidades_service.env')
+    @patch('requests.Session.get')
+    @patch('apps.helpers.configuracao_sme.env')
     def test_get_dres_logging_sucesso(
         self, mock_env, mock_get, mock_logger,
         mock_env_config, mock_http_response_success, mock_dres_response
@@ -198,8 +199,8 @@ class TestDREIntegracaoService:
         mock_logger.info.assert_any_call("Buscando DREs no EOL")
     
     @patch('apps.unidades.services.unidades_service.logger')
-    @patch('apps.unidades.services.unidades_service.requests.get')
-    @patch('apps.unidades.services.unidades_service.env')
+    @patch('requests.Session.get')
+    @patch('apps.helpers.configuracao_sme.env')
     def test_get_dres_logging_erro_401(
         self, mock_env, mock_get, mock_logger,
         mock_env_config, mock_http_response_error
@@ -219,8 +220,8 @@ class TestUnidadeIntegracaoService:
     
     # ==================== TESTES DE get_unidades_by_dre ====================
     
-    @patch('apps.unidades.services.unidades_service.requests.get')
-    @patch('apps.unidades.services.unidades_service.env')
+    @patch('requests.Session.get')
+    @patch('apps.helpers.configuracao_sme.env')
     def test_get_unidades_by_dre_sucesso(
         self, mock_env, mock_get,
         mock_env_config, mock_http_response_success, 
@@ -237,7 +238,7 @@ class TestUnidadeIntegracaoService:
         mock_get.assert_called_once()
         assert codigo_dre_valido in mock_get.call_args[0][0]
     
-    @patch('apps.unidades.services.unidades_service.requests.get')
+    @patch('requests.Session.get')
     @pytest.mark.parametrize('codigo_invalido', ['', None, '   '])
     def test_get_unidades_by_dre_codigo_invalido(self, mock_get, codigo_invalido):
         """Testa erro quando código da DRE é inválido"""
@@ -247,8 +248,8 @@ class TestUnidadeIntegracaoService:
         assert "É necessário informar o código da DRE" in str(exc_info.value)
         mock_get.assert_not_called()
     
-    @patch('apps.unidades.services.unidades_service.requests.get')
-    @patch('apps.unidades.services.unidades_service.env')
+    @patch('requests.Session.get')
+    @patch('apps.helpers.configuracao_sme.env')
     @pytest.mark.parametrize('status_code,exception_type,error_message', [
         (401, PermissionError, 'Não autorizado'),
         (404, LookupError, 'DRE não encontrada'),
@@ -268,8 +269,8 @@ class TestUnidadeIntegracaoService:
         
         assert error_message in str(exc_info.value)
     
-    @patch('apps.unidades.services.unidades_service.requests.get')
-    @patch('apps.unidades.services.unidades_service.env')
+    @patch('requests.Session.get')
+    @patch('apps.helpers.configuracao_sme.env')
     @pytest.mark.parametrize('exception_class,expected_exception,error_message', [
         (requests.exceptions.Timeout, EOLTimeoutError, 'Tempo limite excedido'),
         (requests.exceptions.ConnectionError, EOLCommunicationError, 'Erro de comunicação'),
@@ -288,8 +289,8 @@ class TestUnidadeIntegracaoService:
         
         assert error_message in str(exc_info.value)
     
-    @patch('apps.unidades.services.unidades_service.requests.get')
-    @patch('apps.unidades.services.unidades_service.env')
+    @patch('requests.Session.get')
+    @patch('apps.helpers.configuracao_sme.env')
     def test_get_unidades_by_dre_resposta_nao_lista(
         self, mock_env, mock_get,
         mock_env_config, codigo_dre_valido
@@ -307,8 +308,8 @@ class TestUnidadeIntegracaoService:
         assert "Resposta inesperada" in str(exc_info.value)
         assert "esperado uma lista" in str(exc_info.value)
     
-    @patch('apps.unidades.services.unidades_service.requests.get')
-    @patch('apps.unidades.services.unidades_service.env')
+    @patch('requests.Session.get')
+    @patch('apps.helpers.configuracao_sme.env')
     def test_get_unidades_by_dre_url_correta(
         self, mock_env, mock_get,
         mock_env_config, mock_http_response_success,
@@ -323,8 +324,8 @@ class TestUnidadeIntegracaoService:
         called_url = mock_get.call_args[0][0]
         assert called_url == f'{api_base_url}/DREs/{codigo_dre_valido}/unidades'
     
-    @patch('apps.unidades.services.unidades_service.requests.get')
-    @patch('apps.unidades.services.unidades_service.env')
+    @patch('requests.Session.get')
+    @patch('apps.helpers.configuracao_sme.env')
     def test_get_unidades_by_dre_excecao_generica(
         self, mock_env, mock_get,
         mock_env_config, codigo_dre_valido
@@ -341,8 +342,8 @@ class TestUnidadeIntegracaoService:
     # ==================== TESTES DE LOGGING ====================
     
     @patch('apps.unidades.services.unidades_service.logger')
-    @patch('apps.unidades.services.unidades_service.requests.get')
-    @patch('apps.unidades.services.unidades_service.env')
+    @patch('requests.Session.get')
+    @patch('apps.helpers.configuracao_sme.env')
     def test_get_unidades_by_dre_logging_sucesso(
         self, mock_env, mock_get, mock_logger,
         mock_env_config, mock_http_response_success,
@@ -357,8 +358,8 @@ class TestUnidadeIntegracaoService:
         assert mock_logger.info.call_count >= 2
         mock_logger.info.assert_any_call("Buscando UEs da DRE '%s' no EOL", codigo_dre_valido)
 
-    @patch('apps.unidades.services.unidades_service.requests.get')
-    @patch('apps.unidades.services.unidades_service.env')
+    @patch('requests.Session.get')
+    @patch('apps.helpers.configuracao_sme.env')
     def test_get_unidades_by_dre_reraise_value_error(
         self, mock_env, mock_get,
         mock_env_config, codigo_dre_valido
@@ -378,4 +379,146 @@ class TestUnidadeIntegracaoService:
         with pytest.raises(ValueError) as exc_info:
             UnidadeIntegracaoService.get_unidades_by_dre(codigo_dre_valido)
 
-        assert "JSON inválido" in str(exc_info.value)
\ No newline at end of file
+        assert "JSON inválido" in str(exc_info.value)
+    # ==================== TESTES DE stream_unidades_by_dre ====================
+
+    @staticmethod
+    def _resposta_em_blocos(*blocos, status_code=200):
+        mock_response = Mock()
+        mock_response.status_code = status_code
+        mock_response.text = 'Error'
+        mock_response.iter_content.return_value = iter(blocos)
+        return mock_response
+
+    @patch('requests.Session.get')
+    @patch('apps.helpers.configuracao_sme.env')
+    def test_stream_unidades_by_dre_repassa_os_bytes(
+        self, mock_env, mock_get, mock_env_config, codigo_dre_valido
+    ):
+        """Testa que os blocos do EOL são repassados sem decodificar"""
+        mock_env.side_effect = mock_env_config()
+        resposta = self._resposta_em_blocos(b'\n  ', b'[{"codigoEol": "019456"},', b' {"codigoEol": "019457"}]\n', b'')
+        mock_get.return_value = resposta
+
+        blocos = UnidadeIntegracaoService.stream_unidades_by_dre(codigo_dre_valido)
+
+        assert b"".join(blocos) == b'\n  [{"codigoEol": "019456"}, {"codigoEol": "019457"}]\n'
+        assert mock_get.call_args.kwargs["stream"] is True
+        resposta.json.assert_not_called()
+        resposta.close.assert_called_once()
+
+    @patch('requests.Session.get')
+    @patch('apps.helpers.configuracao_sme.env')
+    @pytest.mark.parametrize('blocos', [(b'{"erro": "x"}',), (b'<html>',), (b'  ',), ()])
+    def test_stream_unidades_by_dre_corpo_nao_lista(
+        self, mock_env, mock_get, mock_env_config, codigo_dre_valido, blocos
+    ):
+        """Testa que o início do corpo é verificado antes do retorno"""
+        mock_env.side_effect = mock_env_config()
+        resposta = self._resposta_em_blocos(*blocos)
+        mock_get.return_value = resposta
+
+        with pytest.raises(EOLUnexpectedResponseError):
+            UnidadeIntegracaoService.stream_unidades_by_dre(codigo_dre_valido)
+
+        resposta.close.assert_called_once()
+
+    @patch('requests.Session.get')
+    @patch('apps.helpers.configuracao_sme.env')
+    def test_stream_unidades_by_dre_corpo_truncado(
+        self, mock_env, mock_get, mock_env_config, codigo_dre_valido
+    ):
+        """Testa que uma lista sem fechamento interrompe a iteração no final"""
+        mock_env.side_effect = mock_env_config()
+        mock_get.return_value = self._resposta_em_blocos(b'[{"codigoEol": "019456"}', b', {"codigo')
+
+        blocos = UnidadeIntegracaoService.stream_unidades_by_dre(codigo_dre_valido)
+
+        with pytest.raises(EOLUnexpectedResponseError, match="incompleta"):
+            b"".join(blocos)
+
+    @patch('requests.Session.get')
+    @patch('apps.helpers.configuracao_sme.env')
+    @pytest.mark.parametrize('blocos', [
+        (b'[{"codigoEol": "019456", "turnos": [1, 2]',),
+        (b'[{"nome": "ESCOLA ]', b'"}',),
+        (b'[{"codigoEol": "019456"}]', b', {"codigoEol": "019457"}]'),
+    ])
+    def test_stream_unidades_by_dre_lista_incompleta_terminada_em_colchete(
+        self, mock_env, mock_get, mock_env_config, codigo_dre_valido, blocos
+    ):
+        """Testa que um corpo cortado que termina em ']' também é recusado"""
+        mock_env.side_effect = mock_env_config()
+        mock_get.return_value = self._resposta_em_blocos(*blocos)
+
+        with pytest.raises(EOLUnexpectedResponseError, match="incompleta"):
+            b"".join(UnidadeIntegracaoService.stream_unidades_by_dre(codigo_dre_valido))
+
+    @pytest.mark.parametrize('corpo, completa', [
+        (b'[{"a": [1, 2], "b": {"c": "]}"}}]', True),
+        (b'[{"a": "aspas \\" e barra \\\\"}]', True),
+        (b'[]', True),
+        (b'[{"a": [1, 2]', False),
+        (b'[{"a": "]"', False),
+        (b'[{]}', False),
+        (b'[1][2]', False),
+    ])
+    @pytest.mark.parametrize('tamanho_bloco', [1, 3, 1024])
+    def test_fechamento_da_lista(self, corpo, completa, tamanho_bloco):
+        """Testa a verificação incremental com o corpo dividido em qualquer ponto"""
+        fechamento = FechamentoDaLista()
+        for inicio in range(0, len(corpo), tamanho_bloco):
+            fechamento.consumir(corpo[inicio:inicio + tamanho_bloco])
+
+        assert fechamento.completa is completa
+
+    @patch('requests.Session.get')
+    @patch('apps.helpers.configuracao_sme.env')
+    def test_stream_unidades_by_dre_conexao_interrompida(
+        self, mock_env, mock_get, mock_env_config, codigo_dre_valido
+    ):
+        """Testa erro de rede no meio do repasse"""
+        mock_env.side_effect = mock_env_config()
+
+        def blocos():
+            yield b'[{"codigoEol": "019456"}'
+            raise requests.exceptions.ChunkedEncodingError("conexão perdida")
+
+        resposta = self._resposta_em_blocos()
+        resposta.iter_content.return_value = blocos()
+        mock_get.return_value = resposta
+
+        with pytest.raises(EOLCommunicationError):
+            b"".join(UnidadeIntegracaoService.stream_unidades_by_dre(codigo_dre_valido))
+
+        resposta.close.assert_called_once()
+
+    @patch('requests.Session.get')
+    @patch('apps.helpers.configuracao_sme.env')
+    @pytest.mark.parametrize('status_code,exception_type', [
+        (401, PermissionError),
+        (404, LookupError),
+        (500, EOLIntegrationError),
+    ])
+    def test_stream_unidades_by_dre_erros_http(
+        self, mock_env, mock_get, mock_env_config, codigo_dre_valido, status_code, exception_type
+    ):
+        """Testa que erros HTTP são levantados antes do repasse"""
+        mock_env.side_effect = mock_env_config()
+        resposta = self._resposta_em_blocos(status_code=status_code)
+        mock_get.return_value = resposta
+
+        with pytest.raises(exception_type):
+            UnidadeIntegracaoService.stream_unidades_by_dre(codigo_dre_valido)
+
+        resposta.close.assert_called_once()
+
+    @patch('requests.Session.get')
+    @patch('apps.helpers.configuracao_sme.env')
+    def test_stream_unidades_by_dre_timeout(self, mock_env, mock_get, mock_env_config, codigo_dre_valido):
+        """Testa timeout ao abrir o repasse"""
+        mock_env.side_effect = mock_env_config()
+        mock_get.side_effect = requests.exceptions.Timeout("Erro de teste")
+
+        with pytest.raises(EOLTimeoutError):
+            UnidadeIntegracaoService.stream_unidades_by_dre(codigo_dre_valido)
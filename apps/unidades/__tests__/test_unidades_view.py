@@ -1,3 +1,4 @@
+import json
 import pytest
 from unittest.mock import patch
 from rest_framework.test import APIRequestFactory, force_authenticate
@@ -114,20 +115,20 @@ class TestUnidadeViewSet:
     
     # ==================== TESTES DE LISTAGEM DE UEs ====================
     
-    @patch('apps.unidades.api.views.unidades_viewset.UnidadeIntegracaoService.get_unidades_by_dre')
+    @patch('apps.unidades.api.views.unidades_viewset.UnidadeIntegracaoService.stream_unidades_by_dre')
     def test_listar_ues_sucesso(self, mock_get_ues, factory, viewset, mock_ues):
         """Testa listagem de UEs com sucesso"""
-        mock_get_ues.return_value = mock_ues
+        mock_get_ues.return_value = [json.dumps(mock_ues).encode()]
         
         request = self._create_request(factory, data={'tipo': 'UE', 'dre': '108200'})
         response = viewset.list(request)
         
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) == 2
-        assert response.data == mock_ues
+        assert response.streaming
+        assert json.loads(b"".join(response.streaming_content)) == mock_ues
         mock_get_ues.assert_called_once_with('108200')
     
-    @patch('apps.unidades.api.views.unidades_viewset.UnidadeIntegracaoService.get_unidades_by_dre')
+    @patch('apps.unidades.api.views.unidades_viewset.UnidadeIntegracaoService.stream_unidades_by_dre')
     def test_listar_ues_sem_codigo_dre(self, mock_get_ues, factory, viewset):
         """Testa listagem de UEs sem informar código da DRE"""
         request = self._create_request(factory, data={'tipo': 'UE'})
@@ -138,7 +139,7 @@ class TestUnidadeViewSet:
         assert 'necessário informar o código da DRE' in response.data['detail']
         mock_get_ues.assert_not_called()
     
-    @patch('apps.unidades.api.views.unidades_viewset.UnidadeIntegracaoService.get_unidades_by_dre')
+    @patch('apps.unidades.api.views.unidades_viewset.UnidadeIntegracaoService.stream_unidades_by_dre')
     def test_listar_ues_codigo_dre_vazio(self, mock_get_ues, factory, viewset):
         """Testa listagem de UEs com código da DRE vazio"""
         request = self._create_request(factory, data={'tipo': 'UE', 'dre': ''})
@@ -148,7 +149,7 @@ class TestUnidadeViewSet:
         assert 'detail' in response.data
         mock_get_ues.assert_not_called()
     
-    @patch('apps.unidades.api.views.unidades_viewset.UnidadeIntegracaoService.get_unidades_by_dre')
+    @patch('apps.unidades.api.views.unidades_viewset.UnidadeIntegracaoService.stream_unidades_by_dre')
     def test_listar_ues_valor_invalido(self, mock_get_ues, factory, viewset):
         """Testa listagem de UEs com código da DRE inválido"""
         mock_get_ues.side_effect = ValueError("Código da DRE deve ser numérico")
@@ -160,7 +161,7 @@ class TestUnidadeViewSet:
         assert 'detail' in response.data
         assert 'numérico' in response.data['detail']
     
-    @patch('apps.unidades.api.views.unidades_viewset.UnidadeIntegracaoService.get_unidades_by_dre')
+    @patch('apps.unidades.api.views.unidades_viewset.UnidadeIntegracaoService.stream_unidades_by_dre')
     def test_listar_ues_dre_nao_encontrada(self, mock_get_ues, factory, viewset):
         """Testa listagem de UEs quando DRE não existe"""
         mock_get_ues.side_effect = LookupError("DRE não encontrada")
@@ -172,7 +173,7 @@ class TestUnidadeViewSet:
         assert 'detail' in response.data
         assert 'não encontrada' in response.data['detail']
     
-    @patch('apps.unidades.api.views.unidades_viewset.UnidadeIntegracaoService.get_unidades_by_dre')
+    @patch('apps.unidades.api.views.unidades_viewset.UnidadeIntegracaoService.stream_unidades_by_dre')
     def test_listar_ues_erro_permissao(self, mock_get_ues, factory, viewset):
         """Testa erro de permissão ao listar UEs"""
         mock_get_ues.side_effect = PermissionError("Token inválido")
@@ -183,7 +184,7 @@ class TestUnidadeViewSet:
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
         assert 'detail' in response.data
     
-    @patch('apps.unidades.api.views.unidades_viewset.UnidadeIntegracaoService.get_unidades_by_dre')
+    @patch('apps.unidades.api.views.unidades_viewset.UnidadeIntegracaoService.stream_unidades_by_dre')
     def test_listar_ues_erro_generico(self, mock_get_ues, factory, viewset):
         """Testa erro genérico ao listar UEs"""
         mock_get_ues.side_effect = Exception("Erro de conexão")
@@ -195,16 +196,40 @@ class TestUnidadeViewSet:
         assert 'detail' in response.data
         assert 'Erro ao consultar unidades' in response.data['detail']
     
-    @patch('apps.unidades.api.views.unidades_viewset.UnidadeIntegracaoService.get_unidades_by_dre')
+    @patch('apps.unidades.api.views.unidades_viewset.UnidadeIntegracaoService.stream_unidades_by_dre')
     def test_listar_ues_vazio(self, mock_get_ues, factory, viewset):
         """Testa listagem de UEs quando não há resultados"""
-        mock_get_ues.return_value = []
+        mock_get_ues.return_value = [b"[]"]
         
         request = self._create_request(factory, data={'tipo': 'UE', 'dre': '108200'})
         response = viewset.list(request)
         
         assert response.status_code == status.HTTP_200_OK
-        assert response.data == []
+        assert b"".join(response.streaming_content) == b"[]"
+    
+    @patch('apps.unidades.api.views.unidades_viewset.UnidadeIntegracaoService.stream_unidades_by_dre')
+    @patch('apps.unidades.api.views.unidades_viewset.UnidadeIntegracaoService.get_unidades_by_dre')
+    def test_listar_ues_com_campos_decodifica(self, mock_get_ues, mock_stream, factory, viewset, mock_ues):
+        """Testa que a projeção usa a lista decodificada e não o repasse"""
+        mock_get_ues.return_value = mock_ues
+        
+        request = self._create_request(factory, data={'tipo': 'UE', 'dre': '108200', 'campos': 'codigo_eol, tipo_ue'})
+        response = viewset.list(request)
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == [
+            {'codigo_eol': '019456', 'tipo_ue': 'EMEF'},
+            {'codigo_eol': '019457', 'tipo_ue': 'EMEI'},
+        ]
+        mock_stream.assert_not_called()
+    
+    def test_listar_ues_formato_invalido(self, factory, viewset):
+        """Testa listagem de UEs com formato desconhecido"""
+        request = self._create_request(factory, data={'tipo': 'UE', 'dre': '108200', 'formato': 'xml'})
+        response = viewset.list(request)
+        
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'formato' in response.data['detail']
     
     # ==================== TESTES DE VALIDAÇÃO DE PARÂMETROS ====================
     
@@ -1,12 +1,23 @@
+import json
 import logging
  
+from django.conf import settings
+from django.core.cache import cache
+from django.http import StreamingHttpResponse
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.decorators import action
 from rest_framework.viewsets import ViewSet
 from rest_framework.permissions import AllowAny
 
-from apps.unidades.services.unidades_service import UnidadeIntegracaoService, DREIntegracaoService
+from apps.helpers.compressao import CompressaoIncremental, CorpoPreComprimido, RespostaPreComprimida
+from apps.monitoramento.metricas import registrar_cache
+from apps.unidades.api.serializers.unidades_serializer import UnidadeSerializer
+from apps.unidades.services.unidades_service import (
+    DREIntegracaoService,
+    EOLUnexpectedResponseError,
+    UnidadeIntegracaoService,
+)
  
 logger = logging.getLogger(__name__)
  
@@ -17,12 +28,14 @@ class UnidadeViewSet(ViewSet):
     Não utiliza banco de dados local, consome API externa.
     """
     permission_classes = [AllowAny]
+    orcamento_consultas = 0
  
     def list(self, request, *args, **kwargs):
         """
         Lista unidades conforme parâmetros:
         - tipo=DRE: lista todas as DREs
         - tipo=UE&dre={codigo}: lista UEs de uma DRE específica
+          (opcionais: campos=codigoEol,nomeOficial e formato=padronizado)
         """
         tipo = request.query_params.get("tipo")
         codigo_dre = request.query_params.get("dre")
@@ -36,7 +49,11 @@ class UnidadeViewSet(ViewSet):
             return self._listar_dres()
  
         if tipo == "UE":
-            return self._listar_ues(codigo_dre)
+            return self._listar_ues(
+                codigo_dre,
+                campos=request.query_params.get("campos"),
+                formato=request.query_params.get("formato"),
+            )
  
         if tipo is None:
             logger.warning("Nenhum parâmetro 'tipo' informado.")
@@ -54,9 +71,7 @@ class UnidadeViewSet(ViewSet):
     def _listar_dres(self):
         """Lista todas as DREs da API SME Integração"""
         try:
-            dres = DREIntegracaoService.get_dres()
-            logger.info("DREs encontradas: %d", len(dres))
-            return Response(dres)
+            return self._listagem_em_cache("unidades:dres", DREIntegracaoService.get_dres)
             
         except PermissionError as e:
             logger.error("Erro de permissão ao buscar DREs: %s", str(e))
@@ -69,12 +84,18 @@ class UnidadeViewSet(ViewSet):
                 status.HTTP_500_INTERNAL_SERVER_ERROR
             )
  
-    def _listar_ues(self, codigo_dre):
+    def _listar_ues(self, codigo_dre, campos=None, formato=None):
         """
         Lista Unidades Escolares vinculadas a uma DRE.
-        
+
+        Por padrão o JSON do EOL é repassado sem ser decodificado (do cache
+        ou em streaming). ``campos`` (projeção) e ``formato=padronizado``
+        (UnidadeSerializer) exigem decodificar a lista.
+
         Args:
             codigo_dre: Código EOL da DRE (ex: "108200")
+            campos: Campos a manter em cada UE, separados por vírgula
+            formato: "padronizado" para os nomes do UnidadeSerializer
         """
         if not codigo_dre:
             logger.warning("Parâmetro 'dre' não informado para tipo UE")
@@ -82,11 +103,30 @@ class UnidadeViewSet(ViewSet):
                 "É necessário informar o código da DRE no parâmetro 'dre'.",
                 status.HTTP_400_BAD_REQUEST
             )
- 
+
+        if formato not in (None, "padronizado"):
+            return self._resposta_erro(
+                "Parâmetro 'formato' inválido. Use 'padronizado'.",
+                status.HTTP_400_BAD_REQUEST
+            )
+
+        chave = f"unidades:ues:{str(codigo_dre).strip()}"
         try:
-            unidades = UnidadeIntegracaoService.get_unidades_by_dre(codigo_dre)
-            logger.info("UEs encontradas para DRE '%s': %d", codigo_dre, len(unidades))
-            return Response(unidades)
+            if campos or formato:
+                unidades = self._ues_decodificadas(chave, codigo_dre)
+                if formato == "padronizado":
+                    unidades = self._padronizar(unidades)
+                if campos:
+                    unidades = self._projetar(unidades, campos)
+                return Response(unidades)
+
+            pre_comprimido = cache.get(chave)
+            registrar_cache("unidades", pre_comprimido is not None)
+            if pre_comprimido is not None:
+                return RespostaPreComprimida(pre_comprimido)
+
+            blocos = UnidadeIntegracaoService.stream_unidades_by_dre(codigo_dre)
+            return StreamingHttpResponse(self._repassar_e_guardar(chave, blocos), content_type="application/json")
             
         except ValueError as e:
             logger.warning("Parâmetro inválido: %s", str(e))
@@ -106,6 +146,59 @@ class UnidadeViewSet(ViewSet):
                 "Erro ao consultar unidades no sistema externo.",
                 status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+
+    def _ues_decodificadas(self, chave, codigo_dre):
+        """ Lista de UEs decodificada, do cache se houver (que é preenchido na falta). """
+        pre_comprimido = cache.get(chave)
+        registrar_cache("unidades", pre_comprimido is not None)
+        if pre_comprimido is not None:
+            return json.loads(pre_comprimido.corpo)
+
+        unidades = UnidadeIntegracaoService.get_unidades_by_dre(codigo_dre)
+        cache.set(chave, CorpoPreComprimido.de_dados(unidades), settings.UNIDADES_CACHE_TIMEOUT)
+        return unidades
+
+    @staticmethod
+    def _padronizar(unidades):
+        try:
+            return UnidadeSerializer(unidades, many=True).data
+        except (KeyError, AttributeError) as e:
+            # KeyError é um LookupError: não pode virar o 404 de DRE não encontrada.
+            raise EOLUnexpectedResponseError(f"UE sem campo obrigatório: {e}")
+
+    @staticmethod
+    def _projetar(unidades, campos):
+        campos = [campo.strip() for campo in campos.split(",") if campo.strip()]
+        return [{campo: unidade[campo] for campo in campos if campo in unidade} for unidade in unidades]
+
+    @staticmethod
+    def _repassar_e_guardar(chave, blocos):
+        """
+        Repassa os blocos do EOL, comprimindo cada um ao passar, e guarda no
+        cache só se o iterador terminar sem erro: o serviço confere que a
+        lista chegou inteira e interrompe a iteração se não chegou (o cliente
+        recebe o corpo truncado, já com status 200, e nada é guardado).
+        """
+        compressao = CompressaoIncremental("application/json")
+        for bloco in blocos:
+            compressao.adicionar(bloco)
+            yield bloco
+        cache.set(chave, compressao.finalizar(), settings.UNIDADES_CACHE_TIMEOUT)
+ 
+    def _listagem_em_cache(self, chave, buscar):
+        """
+        Serve a listagem do cache, já serializada e comprimida (gzip/br).
+        Na falta busca no EOL e guarda por UNIDADES_CACHE_TIMEOUT segundos;
+        erros do EOL não são guardados.
+        """
+        pre_comprimido = cache.get(chave)
+        registrar_cache("unidades", pre_comprimido is not None)
+
+        if pre_comprimido is None:
+            pre_comprimido = CorpoPreComprimido.de_dados(buscar())
+            cache.set(chave, pre_comprimido, settings.UNIDADES_CACHE_TIMEOUT)
+
+        return RespostaPreComprimida(pre_comprimido)
  
     def _resposta_erro(self, mensagem, status_code):
         """Retorna resposta de erro padronizada"""
@@ -1,10 +1,13 @@
 import logging
+import re
 import requests
-import environ
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 from django.conf import settings
 
-env = environ.Env()
+from apps.helpers.cliente_sme import sessao_sme
+from apps.helpers.configuracao_sme import configuracao_sme
+from apps.monitoramento.instrumentacao import medir_upstream
+
 logger = logging.getLogger(__name__)
 
 
@@ -29,12 +32,51 @@ class EOLUnexpectedResponseError(EOLIntegrationError):
     pass
 
 
+class FechamentoDaLista:
+    """
+    Acompanha, bloco a bloco e sem decodificar, a estrutura de um JSON
+    repassado: colchetes e chaves fora de strings. ``completa`` só é
+    verdadeiro quando a lista aberta no início foi fechada e nada estrutural
+    veio depois; um corpo cortado que por acaso termine em ``]`` (ex.: o
+    fechamento de uma lista interna) não passa.
+    """
+
+    # Uma string completa é um token só; uma aspa solta abre uma string que continua no próximo bloco.
+    TOKENS = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[\[\]{}"]', re.DOTALL)
+    PARES = {b"]": b"[", b"}": b"{"}
+
+    def __init__(self):
+        self.abertos = []
+        self.resto = b""
+        self.fechada = False
+        self.invalida = False
+
+    def consumir(self, bloco):
+        dados, self.resto = self.resto + bloco, b""
+        for marca in self.TOKENS.finditer(dados):
+            token = marca.group()
+            if token == b'"':
+                self.resto = dados[marca.start():]
+                return
+            if self.fechada:
+                self.invalida = True
+            elif token in self.PARES:
+                if not self.abertos or self.abertos.pop() != self.PARES[token]:
+                    self.invalida = True
+                self.fechada = not self.abertos
+            elif token in (b"[", b"{"):
+                self.abertos.append(token)
+
+    @property
+    def completa(self) -> bool:
+        return self.fechada and not self.invalida and not self.resto
+
+
 class DREIntegracaoService:
     """Serviço para busca de unidades no sistema EOL"""
     
     DEFAULT_HEADERS = {
         'Content-Type': 'application/json',
-        'x-api-eol-key': env('SME_INTEGRACAO_TOKEN', default='')
     }
     DEFAULT_TIMEOUT = 30
     
@@ -42,16 +84,19 @@ class DREIntegracaoService:
     def get_dres(cls) -> list[dict]:
         """Busca todas as DREs do sistema EOL"""
         
-        url = f"{env('SME_INTEGRACAO_URL', default='')}/DREs"
+        config = configuracao_sme()
+        url = f"{config.url}/DREs"
         
         try:
             logger.info("Buscando DREs no EOL")
             
-            response = requests.get(
-                url,
-                headers=cls.DEFAULT_HEADERS,
-                timeout=cls.DEFAULT_TIMEOUT
-            )
+            with medir_upstream("/DREs") as chamada:
+                response = sessao_sme().get(
+                    url,
+                    headers=config.cabecalhos(cls.DEFAULT_HEADERS),
+                    timeout=cls.DEFAULT_TIMEOUT
+                )
+                chamada.status = response.status_code
             
             if response.status_code == 401:
                 logger.error("Não autorizado ao buscar DREs no EOL")
@@ -113,9 +158,10 @@ class UnidadeIntegracaoService:
     
     DEFAULT_HEADERS = {
         'Content-Type': 'application/json',
-        'x-api-eol-key': env('SME_INTEGRACAO_TOKEN', default='')
     }
     DEFAULT_TIMEOUT = 50
+    # Blocos do repasse em streaming (stream_unidades_by_dre)
+    TAMANHO_BLOCO = 64 * 1024
 
     @classmethod
     def get_unidades_by_dre(cls, dre_codigo: str | int) -> list[dict]:
@@ -129,33 +175,22 @@ class UnidadeIntegracaoService:
             logger.warning("dre_codigo não informado ou inválido para consulta de unidades")
             raise ValueError("É necessário informar o código da DRE (dre_codigo).")
 
-        base_url = env("SME_INTEGRACAO_URL", default="")
+        config = configuracao_sme()
         # Usa a versão limpa (string) na URL
-        url = f"{base_url}/DREs/{dre_codigo_str}/unidades"
+        url = f"{config.url}/DREs/{dre_codigo_str}/unidades"
 
         try:
             logger.info("Buscando UEs da DRE '%s' no EOL", dre_codigo_str)
 
-            response = requests.get(
-                url,
-                headers=cls.DEFAULT_HEADERS,
-                timeout=cls.DEFAULT_TIMEOUT,
-            )
-
-            if response.status_code == 401:
-                logger.error("Não autorizado ao buscar UEs da DRE '%s' no EOL", dre_codigo)
-                raise PermissionError("Não autorizado a acessar o sistema EOL (verifique x-api-eol-key).")
-
-            if response.status_code == 404:
-                logger.warning("DRE não encontrada ao buscar UEs. dre_codigo='%s'", dre_codigo)
-                raise LookupError(f"DRE não encontrada: {dre_codigo}")
-
-            if response.status_code != 200:
-                logger.error(
-                    "Erro ao buscar UEs da DRE '%s'. Status=%s Body=%s",
-                    dre_codigo, response.status_code, response.text
+            with medir_upstream("/DREs/{}/unidades") as chamada:
+                response = sessao_sme().get(
+                    url,
+                    headers=config.cabecalhos(cls.DEFAULT_HEADERS),
+                    timeout=cls.DEFAULT_TIMEOUT,
                 )
-                raise EOLIntegrationError(f"Erro na consulta de UEs por DRE: {response.status_code}")
+                chamada.status = response.status_code
+
+            cls._verificar_status(response, dre_codigo)
 
             unidades_data = response.json()
 
@@ -191,4 +226,104 @@ class UnidadeIntegracaoService:
 
         except Exception as e:
             logger.error("Erro inesperado ao buscar UEs da DRE '%s': %s", dre_codigo, str(e))
-            raise EOLIntegrationError(f"Erro inesperado ao buscar UEs: {str(e)}")
\ No newline at end of file
+            raise EOLIntegrationError(f"Erro inesperado ao buscar UEs: {str(e)}")
+
+    @classmethod
+    def stream_unidades_by_dre(cls, dre_codigo: str | int) -> Iterator[bytes]:
+        """
+        Busca as UEs de uma DRE sem decodificar o JSON: devolve os bytes da
+        resposta do EOL em blocos, para serem repassados como estão.
+
+        Status e início do corpo (uma lista JSON) são verificados antes do
+        retorno, com os mesmos erros de ``get_unidades_by_dre``. Uma lista que
+        não chega inteira (FechamentoDaLista) só é percebida no último bloco e
+        interrompe a iteração com EOLUnexpectedResponseError.
+        """
+        dre_codigo_str = str(dre_codigo or "").strip()
+
+        if not dre_codigo_str:
+            logger.warning("dre_codigo não informado ou inválido para consulta de unidades")
+            raise ValueError("É necessário informar o código da DRE (dre_codigo).")
+
+        config = configuracao_sme()
+        url = f"{config.url}/DREs/{dre_codigo_str}/unidades"
+
+        try:
+            logger.info("Repassando UEs da DRE '%s' do EOL", dre_codigo_str)
+
+            with medir_upstream("/DREs/{}/unidades") as chamada:
+                response = sessao_sme().get(
+                    url,
+                    headers=config.cabecalhos(cls.DEFAULT_HEADERS),
+                    timeout=cls.DEFAULT_TIMEOUT,
+                    stream=True,
+                )
+                chamada.status = response.status_code
+
+            try:
+                cls._verificar_status(response, dre_codigo)
+                blocos = response.iter_content(chunk_size=cls.TAMANHO_BLOCO)
+                inicio = cls._inicio_da_lista(blocos, dre_codigo)
+            except BaseException:
+                response.close()
+                raise
+
+        except requests.exceptions.Timeout:
+            logger.error("Timeout ao buscar UEs da DRE '%s' no EOL", dre_codigo)
+            raise EOLTimeoutError("Tempo limite excedido ao consultar UEs por DRE.")
+
+        except requests.exceptions.RequestException as e:
+            logger.error("Erro de comunicação com EOL ao buscar UEs da DRE '%s': %s", dre_codigo, str(e))
+            raise EOLCommunicationError(f"Erro de comunicação com sistema de unidades: {str(e)}")
+
+        return cls._repassar(response, inicio, blocos, dre_codigo)
+
+    @classmethod
+    def _verificar_status(cls, response, dre_codigo):
+        if response.status_code == 401:
+            logger.error("Não autorizado ao buscar UEs da DRE '%s' no EOL", dre_codigo)
+            raise PermissionError("Não autorizado a acessar o sistema EOL (verifique x-api-eol-key).")
+
+        if response.status_code == 404:
+            logger.warning("DRE não encontrada ao buscar UEs. dre_codigo='%s'", dre_codigo)
+            raise LookupError(f"DRE não encontrada: {dre_codigo}")
+
+        if response.status_code != 200:
+            logger.error(
+                "Erro ao buscar UEs da DRE '%s'. Status=%s Body=%s",
+                dre_codigo, response.status_code, response.text
+            )
+            raise EOLIntegrationError(f"Erro na consulta de UEs por DRE: {response.status_code}")
+
+    @staticmethod
+    def _inicio_da_lista(blocos, dre_codigo) -> bytes:
+        """ Lê até o primeiro byte significativo, que precisa abrir uma lista. """
+        inicio = b""
+        for bloco in blocos:
+            inicio += bloco
+            if inicio.lstrip():
+                break
+
+        if not inicio.lstrip().startswith(b"["):
+            logger.error("Resposta inesperada ao repassar UEs da DRE '%s': %r", dre_codigo, inicio[:50])
+            raise EOLUnexpectedResponseError("Resposta inesperada da API ao consultar UEs por DRE (esperado uma lista).")
+        return inicio
+
+    @staticmethod
+    def _repassar(response, inicio, blocos, dre_codigo) -> Iterator[bytes]:
+        fechamento = FechamentoDaLista()
+        fechamento.consumir(inicio)
+        try:
+            yield inicio
+            for bloco in blocos:
+                fechamento.consumir(bloco)
+                yield bloco
+        except requests.exceptions.RequestException as e:
+            logger.error("Conexão com o EOL interrompida ao repassar UEs da DRE '%s': %s", dre_codigo, str(e))
+            raise EOLCommunicationError(f"Erro de comunicação com sistema de unidades: {str(e)}")
+        finally:
+            response.close()
+
+        if not fechamento.completa:
+            logger.error("Resposta truncada ao repassar UEs da DRE '%s'", dre_codigo)
+            raise EOLUnexpectedResponseError("Resposta inesperada da API ao consultar UEs por DRE (lista incompleta).")
@@ -6,7 +6,7 @@ from apps.helpers.exceptions import AuthenticationError
 
 User = get_user_model()
 
-SME_POST_PATH = "apps.usuarios.services.sme_integracao_service.requests.post"
+SME_POST_PATH = "requests.Session.post"
 
 
 @pytest.fixture
@@ -0,0 +1,21 @@
+import pytest
+from django.core import checks
+
+from apps.helpers.cache_compartilhado import verificar_cache_compartilhado
+
+
+@pytest.mark.parametrize("backend, debug, erros", [
+    ("django.core.cache.backends.locmem.LocMemCache", False, ["usuarios.E003"]),
+    ("django.core.cache.backends.dummy.DummyCache", False, ["usuarios.E003"]),
+    ("django.core.cache.backends.locmem.LocMemCache", True, []),
+    ("django.core.cache.backends.redis.RedisCache", False, []),
+])
+def test_cache_por_processo_so_com_debug(settings, backend, debug, erros):
+    settings.DEBUG = debug
+    settings.CACHES = {"default": {"BACKEND": backend, "LOCATION": "redis://redis:6379/1"}}
+
+    assert [e.id for e in verificar_cache_compartilhado()] == erros
+
+
+def test_check_registrado():
+    assert verificar_cache_compartilhado in checks.registry.registry.get_checks()
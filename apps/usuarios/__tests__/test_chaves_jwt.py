@@ -0,0 +1,149 @@
+import hashlib
+import json
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+from django.core.exceptions import ImproperlyConfigured
+from django.test import override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.helpers.chaves_jwt import ChavesJwt, chaves_jwt, descartar_chaves_jwt, verificar_chaves_jwt
+from apps.usuarios.models import User
+
+URL_JWKS = "/.well-known/jwks.json"
+
+
+def _pem_privada(chave):
+    return chave.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ).decode()
+
+
+def _pem_publica(chave):
+    return chave.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+
+
+@pytest.fixture
+def ed25519_env(monkeypatch):
+    chave = ed25519.Ed25519PrivateKey.generate()
+    monkeypatch.setenv("JWT_ALGORITMO", "EdDSA")
+    # Como costuma chegar numa variável de ambiente: quebras de linha escapadas.
+    monkeypatch.setenv("JWT_CHAVE_PRIVADA", _pem_privada(chave).replace("\n", "\\n"))
+    descartar_chaves_jwt()
+    return chave
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create_user(username="1234567", password="Senha@123")
+
+
+def test_hs256_padrao_sem_chaves_nem_kid(user):
+    token = str(AccessToken.for_user(user))
+
+    assert chaves_jwt() is None
+    assert jwt.get_unverified_header(token) == {"alg": "HS256", "typ": "JWT"}
+
+
+def test_eddsa_assina_com_kid_e_valida_pelo_jwks(client, ed25519_env, user):
+    token = str(AccessToken.for_user(user))
+
+    cabecalho = jwt.get_unverified_header(token)
+    jwks = client.get(URL_JWKS).json()
+    chave = jwt.PyJWKSet.from_dict(jwks)[cabecalho["kid"]]
+
+    assert cabecalho["alg"] == "EdDSA"
+    # Validação por outro serviço, só com o JWKS público.
+    assert jwt.decode(token, chave.key, algorithms=["EdDSA"])["user_id"] == str(user.id)
+    assert AccessToken(token)["user_id"] == str(user.id)
+
+
+@pytest.mark.django_db
+def test_access_token_assimetrico_autentica_na_api(ed25519_env, user):
+    api = APIClient()
+    api.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+
+    assert api.get("/api/usuario/me").status_code == 200
+
+
+def test_kid_e_o_thumbprint_rfc7638(ed25519_env):
+    x = jwt.algorithms.OKPAlgorithm.to_jwk(ed25519_env.public_key(), as_dict=True)["x"]
+    canonico = json.dumps({"crv": "Ed25519", "kty": "OKP", "x": x}, separators=(",", ":")).encode()
+
+    assert chaves_jwt().kid == jwt.utils.base64url_encode(hashlib.sha256(canonico).digest()).decode()
+
+
+def test_rotacao_aceita_a_chave_anterior(monkeypatch, tmp_path, user):
+    anterior, atual = rsa.generate_private_key(65537, 2048), rsa.generate_private_key(65537, 2048)
+    monkeypatch.setenv("JWT_ALGORITMO", "RS256")
+    monkeypatch.setenv("JWT_CHAVE_PRIVADA", _pem_privada(anterior))
+    descartar_chaves_jwt()
+    token_anterior = str(AccessToken.for_user(user))
+
+    arquivo_privada, arquivo_anterior = tmp_path / "privada.pem", tmp_path / "anterior.pem"
+    arquivo_privada.write_text(_pem_privada(atual))
+    arquivo_anterior.write_bytes(_pem_publica(anterior))
+    monkeypatch.delenv("JWT_CHAVE_PRIVADA")
+    monkeypatch.setenv("JWT_CHAVE_PRIVADA_ARQUIVO", str(arquivo_privada))
+    monkeypatch.setenv("JWT_CHAVES_PUBLICAS_ANTERIORES_ARQUIVOS", str(arquivo_anterior))
+    descartar_chaves_jwt()
+
+    assert len(json.loads(chaves_jwt().jwks)["keys"]) == 2
+    assert AccessToken(token_anterior)["user_id"] == str(user.id)
+    assert jwt.get_unverified_header(str(AccessToken.for_user(user)))["kid"] == chaves_jwt().kid
+
+
+def test_kid_desconhecido_ou_hs256_recusado(ed25519_env, user, settings):
+    outra = ed25519.Ed25519PrivateKey.generate()
+    forjado = jwt.encode({"user_id": str(user.id)}, outra, algorithm="EdDSA", headers={"kid": "outro"})
+    hs256 = jwt.encode({"user_id": str(user.id)}, settings.SECRET_KEY, algorithm="HS256")
+
+    for token in (forjado, hs256, "nao-e-jwt"):
+        with pytest.raises(TokenError):
+            AccessToken(token)
+
+
+def test_jwks_com_cache_http(client, ed25519_env):
+    with override_settings(JWKS_CACHE_MAX_AGE=600):
+        response = client.get(URL_JWKS)
+        revalidacao = client.get(URL_JWKS, HTTP_IF_NONE_MATCH=response["ETag"])
+
+    assert response.status_code == 200
+    assert response["Cache-Control"] == "public, max-age=600"
+    [chave] = response.json()["keys"]
+    assert {chave["kty"], chave["use"], chave["alg"]} == {"OKP", "sig", "EdDSA"}
+    assert "d" not in chave
+    assert revalidacao.status_code == 304
+
+
+def test_jwks_inexistente_com_hs256(client):
+    assert client.get(URL_JWKS).status_code == 404
+
+
+@pytest.mark.parametrize("ambiente, mensagem", [
+    ({"JWT_ALGORITMO": "RS256"}, "exige JWT_CHAVE_PRIVADA"),
+    ({"JWT_ALGORITMO": "RS256", "JWT_CHAVE_PRIVADA": "invalida"}, "Chave inválida"),
+    ({"JWT_ALGORITMO": "XYZ"}, "não suportado"),
+    ({"JWT_ALGORITMO": "RS256", "JWT_CHAVE_PRIVADA_ARQUIVO": "/nao/existe.pem"}, "ilegível"),
+])
+def test_configuracao_invalida(monkeypatch, ambiente, mensagem):
+    for variavel, valor in ambiente.items():
+        monkeypatch.setenv(variavel, valor)
+
+    with pytest.raises(ImproperlyConfigured, match=mensagem):
+        ChavesJwt.do_ambiente()
+    assert verificar_chaves_jwt()[0].id == "usuarios.E002"
+
+
+def test_chave_publica_no_lugar_da_privada(monkeypatch):
+    monkeypatch.setenv("JWT_ALGORITMO", "EdDSA")
+    monkeypatch.setenv("JWT_CHAVE_PRIVADA", _pem_publica(ed25519.Ed25519PrivateKey.generate()).decode())
+
+    with pytest.raises(ImproperlyConfigured, match="chave privada"):
+        ChavesJwt.do_ambiente()
@@ -0,0 +1,113 @@
+import io
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.monitoramento.metricas import USUARIOS_CONFLITOS
+from apps.monitoramento.orcamento import conta_no_orcamento
+from apps.usuarios.models import User
+from apps.usuarios.services.conciliacao_service import ConciliacaoService
+
+
+@pytest.fixture(autouse=True)
+def set_signa_env(monkeypatch):
+    monkeypatch.setenv("GUIDE_PERFIL_SIGNA", "0000")
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("email, cpf", [
+    ("JOAO@email.com", None),
+    (None, "12345678900"),
+    ("joao@email.com", "12345678900"),
+])
+def test_login_libera_email_e_cpf_de_outro_usuario(client, mock_sme_success, email, cpf):
+    antigo = User.objects.create(username="7654321", email=email, cpf=cpf, name="Antigo")
+    liberados = USUARIOS_CONFLITOS.labels("email", "login")._value.get()
+
+    response = client.post(reverse("login"), {"username": "1234567", "password": "Senha@123"})
+
+    assert response.status_code == 200
+    user = User.objects.get(username="1234567")
+    assert (user.email, user.cpf) == ("joao@email.com", "12345678900")
+    antigo.refresh_from_db()
+    assert antigo.email is None and antigo.cpf is None
+    assert antigo.name == "Antigo"
+    assert USUARIOS_CONFLITOS.labels("email", "login")._value.get() == liberados + (1 if email else 0)
+
+
+@pytest.mark.django_db
+def test_login_conflitante_em_transacao_externa(client, mock_sme_success):
+    User.objects.create_user(username="1234567", password="Senha@123")
+    User.objects.create(username="7654321", email="joao@email.com")
+
+    with CaptureQueriesContext(connection) as contexto:
+        response = client.post(reverse("login"), {"username": "1234567", "password": "Senha@123"})
+
+    assert response.status_code == 200
+    # O INSERT que falha fica num savepoint: a transação em volta segue utilizável.
+    sql = [q["sql"] for q in contexto.captured_queries]
+    assert sql[0].startswith("SAVEPOINT") and sql[2].startswith("ROLLBACK TO SAVEPOINT")
+    # INSERT que falha; busca do conflito, UPDATE e novo INSERT.
+    assert len([s for s in sql if conta_no_orcamento(s)]) == 4
+    assert User.objects.get(username="1234567").email == "joao@email.com"
+
+
+@pytest.mark.django_db
+def test_liberar_sem_conflito():
+    User.objects.create(username="7654321", email="outro@email.com", cpf="11111111111")
+
+    assert ConciliacaoService.liberar("1234567", "joao@email.com", "12345678900") == 0
+    assert ConciliacaoService.liberar("1234567", None, None) == 0
+
+
+def _auditar(*args):
+    saida = io.StringIO()
+    call_command("auditar_usuarios", *args, stdout=saida)
+    return saida.getvalue()
+
+
+@pytest.fixture
+def duplicados(db):
+    agora = timezone.now()
+    # create() e não create_user(): normalize_email já tiraria os espaços.
+    recente = User.objects.create(username="1111111", email="ana@email.com", cpf="", last_login=agora)
+    antigo = User.objects.create(username="2222222", email=" Ana@email.com ", last_login=agora - timedelta(days=30))
+    nunca = User.objects.create(username="3333333", email="ana@email.com  ")
+    return recente, antigo, nunca
+
+
+def test_auditoria_sem_corrigir_so_relata(duplicados):
+    saida = _auditar()
+
+    assert "email ana@email.com: mantido em 1111111, liberado em 2222222, 3333333" in saida
+    assert "cpf em branco: 1111111" in saida
+    assert "3 campos a liberar" in saida
+    assert User.objects.filter(email__isnull=False).count() == 3
+
+
+def test_auditoria_corrige(duplicados):
+    recente, antigo, nunca = duplicados
+
+    saida = _auditar("--corrigir", "--lote", "1")
+
+    assert "3 campos liberados" in saida
+    for user in duplicados:
+        user.refresh_from_db()
+    assert recente.email == "ana@email.com" and recente.cpf is None
+    assert antigo.email is None and nunca.email is None
+    assert "Nenhuma duplicidade" in _auditar()
+
+
+@pytest.mark.django_db
+def test_auditoria_cpf_com_pontuacao():
+    User.objects.create(username="1111111", cpf="1234567890")
+    User.objects.create(username="2222222", cpf="123456789-0")
+
+    resultado = ConciliacaoService.auditar()
+
+    assert [(d.campo, d.valor, d.mantido) for d in resultado.duplicidades] == [("cpf", "1234567890", "2222222")]
@@ -0,0 +1,138 @@
+import os
+
+import pytest
+from unittest.mock import Mock, patch
+from django.core.exceptions import ImproperlyConfigured
+
+from apps.helpers.configuracao_sme import (
+    ConfiguracaoSme,
+    configuracao_sme,
+    recarregar_configuracao_sme,
+    verificar_configuracao_sme,
+    verificar_configuracao_sme_deploy,
+)
+from apps.usuarios.services.sme_integracao_service import SmeIntegracaoService
+
+
+@pytest.fixture
+def ambiente_sme(monkeypatch):
+    monkeypatch.setenv("SME_INTEGRACAO_URL", "https://sme.test/api/")
+    monkeypatch.setenv("SME_INTEGRACAO_TOKEN", "chave-1")
+    monkeypatch.setenv("CODIGO_SISTEMA_SIGNA", " 42 ")
+    monkeypatch.setenv("GUIDE_PERFIL_SIGNA", "PERFIL")
+    monkeypatch.delenv("SME_INTEGRACAO_TOKEN_ARQUIVO", raising=False)
+    return monkeypatch
+
+
+def test_le_e_normaliza_o_ambiente(ambiente_sme):
+    config = configuracao_sme()
+
+    assert config == ConfiguracaoSme(
+        url="https://sme.test/api", token="chave-1", codigo_sistema="42", perfil_signa="PERFIL"
+    )
+    assert config.cabecalhos({"accept": "application/json"}) == {
+        "accept": "application/json",
+        "x-api-eol-key": "chave-1",
+    }
+
+
+def test_carregada_uma_vez_ate_recarregar(ambiente_sme):
+    primeira = configuracao_sme()
+    ambiente_sme.setenv("SME_INTEGRACAO_TOKEN", "chave-2")
+
+    assert configuracao_sme() is primeira
+
+    assert recarregar_configuracao_sme().token == "chave-2"
+    assert configuracao_sme().token == "chave-2"
+
+
+def test_rotacao_da_chave_pelo_arquivo(ambiente_sme, tmp_path):
+    arquivo = tmp_path / "token"
+    arquivo.write_text("chave-arquivo\n")
+    ambiente_sme.setenv("SME_INTEGRACAO_TOKEN_ARQUIVO", str(arquivo))
+    assert configuracao_sme().token == "chave-arquivo"
+
+    arquivo.write_text("chave-rotacionada\n")
+    recarregar_configuracao_sme()
+
+    with patch("requests.Session.get") as mock_get:
+        mock_get.return_value = Mock(status_code=200, json=Mock(return_value={}))
+        SmeIntegracaoService.informacao_usuario_sgp("123")
+
+    assert mock_get.call_args.args[0] == "https://sme.test/api/AutenticacaoSgp/123/dados"
+    assert mock_get.call_args.kwargs["headers"]["x-api-eol-key"] == "chave-rotacionada"
+
+
+def _reescrever(arquivo, conteudo):
+    """ Troca o conteúdo garantindo um mtime diferente (sistemas com resolução de 1s). """
+    mtime = arquivo.stat().st_mtime_ns
+    arquivo.write_text(conteudo)
+    os.utime(arquivo, ns=(mtime + 10**9, mtime + 10**9))
+
+
+def test_arquivo_do_token_alterado_e_relido_sem_recarregar(ambiente_sme, tmp_path):
+    arquivo = tmp_path / "token"
+    arquivo.write_text("chave-arquivo\n")
+    ambiente_sme.setenv("SME_INTEGRACAO_TOKEN_ARQUIVO", str(arquivo))
+    ambiente_sme.setenv("SME_INTEGRACAO_TOKEN_VERIFICACAO", "0")
+    primeira = configuracao_sme()
+
+    assert configuracao_sme() is primeira
+
+    _reescrever(arquivo, "chave-rotacionada\n")
+    with patch("requests.Session.get") as mock_get:
+        mock_get.return_value = Mock(status_code=200, json=Mock(return_value={}))
+        SmeIntegracaoService.informacao_usuario_sgp("123")
+
+    assert mock_get.call_args.kwargs["headers"]["x-api-eol-key"] == "chave-rotacionada"
+
+
+def test_arquivo_do_token_conferido_a_cada_intervalo(ambiente_sme, tmp_path):
+    arquivo = tmp_path / "token"
+    arquivo.write_text("chave-1")
+    ambiente_sme.setenv("SME_INTEGRACAO_TOKEN_ARQUIVO", str(arquivo))
+    ambiente_sme.setenv("SME_INTEGRACAO_TOKEN_VERIFICACAO", "10")
+    with patch("apps.helpers.configuracao_sme.time.monotonic", return_value=100.0):
+        configuracao_sme()
+    _reescrever(arquivo, "chave-2")
+
+    with patch("apps.helpers.configuracao_sme.os.stat", wraps=os.stat) as mock_stat:
+        with patch("apps.helpers.configuracao_sme.time.monotonic", return_value=109.0):
+            assert configuracao_sme().token == "chave-1"
+        mock_stat.assert_not_called()
+        with patch("apps.helpers.configuracao_sme.time.monotonic", return_value=110.0):
+            assert configuracao_sme().token == "chave-2"
+
+
+def test_arquivo_ausente_ou_configuracao_invalida_mantem_a_chave_anterior(ambiente_sme, tmp_path):
+    arquivo = tmp_path / "token"
+    arquivo.write_text("chave-1")
+    ambiente_sme.setenv("SME_INTEGRACAO_TOKEN_ARQUIVO", str(arquivo))
+    ambiente_sme.setenv("SME_INTEGRACAO_TOKEN_VERIFICACAO", "0")
+    configuracao_sme()
+
+    arquivo.unlink()
+    assert configuracao_sme().token == "chave-1"
+
+    ambiente_sme.setenv("SME_INTEGRACAO_URL", "ftp://invalida")
+    arquivo.write_text("chave-2")
+    assert configuracao_sme().token == "chave-1"
+
+
+@pytest.mark.parametrize("url", ["sme.test", "ftp://sme.test", "https://"])
+def test_url_invalida(ambiente_sme, url):
+    ambiente_sme.setenv("SME_INTEGRACAO_URL", url)
+
+    with pytest.raises(ImproperlyConfigured):
+        configuracao_sme()
+    assert verificar_configuracao_sme()[0].id == "usuarios.E001"
+
+
+def test_checks_de_deploy(ambiente_sme):
+    assert verificar_configuracao_sme() == []
+    assert verificar_configuracao_sme_deploy() == []
+
+    ambiente_sme.setenv("SME_INTEGRACAO_TOKEN", "")
+    avisos = verificar_configuracao_sme_deploy()
+
+    assert [a.msg for a in avisos] == ["SME_INTEGRACAO_TOKEN não configurado."]
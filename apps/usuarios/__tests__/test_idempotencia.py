@@ -0,0 +1,149 @@
+import pytest
+from unittest.mock import patch
+from django.contrib.auth import get_user_model
+from django.contrib.auth.tokens import default_token_generator
+from django.core.cache import cache
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+from rest_framework.test import APIClient
+
+from apps.helpers.exceptions import SmeIntegracaoException
+from apps.monitoramento.metricas import IDEMPOTENCIA_REPETICOES
+
+User = get_user_model()
+
+URL_ATUALIZAR = "/api/usuario/atualizar-senha"
+URL_REDEFINIR = "/api/usuario/redefinir-senha"
+REDEFINE_SENHA = "apps.usuarios.api.views.senha_view.SmeIntegracaoService.redefine_senha"
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create_user(username="1234567", password="Senha@123")
+
+
+@pytest.fixture
+def api(user):
+    api = APIClient()
+    api.force_authenticate(user=user)
+    return api
+
+
+@pytest.fixture
+def dados_atualizar():
+    return {"senha_atual": "Senha@123", "nova_senha": "Nova@1234", "confirmacao_nova_senha": "Nova@1234"}
+
+
+@pytest.fixture
+def dados_redefinir(user):
+    return {
+        "uid": urlsafe_base64_encode(force_bytes(user.pk)),
+        "token": default_token_generator.make_token(user),
+        "new_pass": "Nova@1234",
+        "new_pass_confirm": "Nova@1234",
+    }
+
+
+@patch(REDEFINE_SENHA)
+def test_repeticao_devolve_a_primeira_resposta_sem_chamar_o_sme(mock_redefine, api, dados_atualizar, django_assert_num_queries):
+    repetidas = IDEMPOTENCIA_REPETICOES.labels("AtualizarSenhaViewSet", "repetida")._value.get()
+    primeira = api.post(URL_ATUALIZAR, dados_atualizar, format="json", HTTP_IDEMPOTENCY_KEY="abc")
+
+    # A senha atual já mudou: sem a chave, a repetição seria recusada pelo serializer.
+    with django_assert_num_queries(0):
+        repetida = api.post(URL_ATUALIZAR, dados_atualizar, format="json", HTTP_IDEMPOTENCY_KEY="abc")
+
+    assert primeira.status_code == repetida.status_code == 200
+    assert repetida.json() == primeira.json()
+    assert repetida["Idempotent-Replayed"] == "true"
+    assert "Idempotent-Replayed" not in primeira
+    mock_redefine.assert_called_once()
+    assert IDEMPOTENCIA_REPETICOES.labels("AtualizarSenhaViewSet", "repetida")._value.get() == repetidas + 1
+
+
+@patch(REDEFINE_SENHA)
+def test_redefinir_senha_repetida(mock_redefine, client, dados_redefinir):
+    respostas = [
+        client.post(URL_REDEFINIR, dados_redefinir, content_type="application/json", HTTP_IDEMPOTENCY_KEY="k1")
+        for _ in range(2)
+    ]
+
+    assert [r.status_code for r in respostas] == [200, 200]
+    mock_redefine.assert_called_once()
+
+
+@patch(REDEFINE_SENHA)
+def test_sem_cabecalho_a_repeticao_executa_de_novo(mock_redefine, client, dados_redefinir):
+    respostas = [client.post(URL_REDEFINIR, dados_redefinir, content_type="application/json") for _ in range(2)]
+
+    # O token do link já foi consumido pela troca de senha: a repetição falha.
+    assert [r.status_code for r in respostas] == [200, 400]
+
+
+@patch(REDEFINE_SENHA)
+def test_mesma_chave_com_outra_requisicao(mock_redefine, api, dados_atualizar):
+    api.post(URL_ATUALIZAR, dados_atualizar, format="json", HTTP_IDEMPOTENCY_KEY="abc")
+
+    outra = {**dados_atualizar, "nova_senha": "Outra@1234", "confirmacao_nova_senha": "Outra@1234"}
+    response = api.post(URL_ATUALIZAR, outra, format="json", HTTP_IDEMPOTENCY_KEY="abc")
+
+    assert response.status_code == 422
+    mock_redefine.assert_called_once()
+
+
+@patch(REDEFINE_SENHA)
+def test_chave_por_usuario(mock_redefine, api, dados_atualizar):
+    outro = User.objects.create_user(username="7654321", password="Senha@123", email="outro@sme.prefeitura.sp.gov.br")
+    outro_api = APIClient()
+    outro_api.force_authenticate(user=outro)
+
+    api.post(URL_ATUALIZAR, dados_atualizar, format="json", HTTP_IDEMPOTENCY_KEY="abc")
+    response = outro_api.post(URL_ATUALIZAR, dados_atualizar, format="json", HTTP_IDEMPOTENCY_KEY="abc")
+
+    assert response.status_code == 200
+    assert "Idempotent-Replayed" not in response
+    assert mock_redefine.call_count == 2
+
+
+@patch(REDEFINE_SENHA)
+def test_requisicao_em_andamento(mock_redefine, api, dados_atualizar):
+    def repetir_durante_a_execucao(*args):
+        repetida = api.post(URL_ATUALIZAR, dados_atualizar, format="json", HTTP_IDEMPOTENCY_KEY="abc")
+        respostas.append(repetida)
+
+    respostas = []
+    mock_redefine.side_effect = repetir_durante_a_execucao
+
+    primeira = api.post(URL_ATUALIZAR, dados_atualizar, format="json", HTTP_IDEMPOTENCY_KEY="abc")
+
+    assert primeira.status_code == 200
+    assert respostas[0].status_code == 409
+    assert respostas[0]["Retry-After"] == "1"
+    assert mock_redefine.call_count == 1
+
+
+@patch(REDEFINE_SENHA, side_effect=[SmeIntegracaoException("Timeout"), None])
+def test_erro_nao_e_guardado(mock_redefine, api, dados_atualizar):
+    falha = api.post(URL_ATUALIZAR, dados_atualizar, format="json", HTTP_IDEMPOTENCY_KEY="abc")
+    nova_tentativa = api.post(URL_ATUALIZAR, dados_atualizar, format="json", HTTP_IDEMPOTENCY_KEY="abc")
+
+    assert falha.status_code == 400
+    assert nova_tentativa.status_code == 200
+    assert mock_redefine.call_count == 2
+
+
+@patch(REDEFINE_SENHA)
+def test_registro_nao_guarda_a_senha(mock_redefine, api, dados_atualizar):
+    api.post(URL_ATUALIZAR, dados_atualizar, format="json", HTTP_IDEMPOTENCY_KEY="abc")
+
+    registros = [cache.get(chave) for chave in cache._cache if "idempotencia" in chave]
+
+    assert len(registros) == 1
+    assert "Nova@1234" not in repr(registros[0])
+
+
+@pytest.mark.parametrize("chave", ["", "x" * 256, "com\nquebra"])
+def test_chave_invalida(api, chave):
+    response = api.post(URL_ATUALIZAR, {}, format="json", HTTP_IDEMPOTENCY_KEY=chave)
+
+    assert response.status_code == 400
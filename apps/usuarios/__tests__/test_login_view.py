@@ -247,3 +247,71 @@ def test_login_perfil_nao_autorizado_codigo_signa_nao_presente(client, monkeypat
     assert response.json()["detail"] == (
         "Desculpe, mas o acesso ao SIGNA é restrito a perfis específicos."
     )
+
+
+# transaction=True: sem a transação do teste em volta, como na requisição real
+# (autocommit), o upsert não precisa de savepoint.
+@pytest.mark.django_db(transaction=True)
+def test_login_usuario_recorrente_em_uma_consulta(client, mock_sme_success, django_assert_num_queries):
+    User.objects.create_user(username="1234567", password="Senha@123", name="Antigo", cpf="12345678900")
+
+    with django_assert_num_queries(1) as consultas:
+        response = client.post(reverse("login"), {"username": "1234567", "password": "Senha@123"})
+
+    assert response.status_code == 200
+    assert "ON CONFLICT" in consultas.captured_queries[0]["sql"]
+    user = User.objects.get(username="1234567")
+    assert user.name == "João da Silva"
+    assert user.last_login is not None
+    assert user.check_password("Senha@123")
+
+
+@pytest.mark.django_db(transaction=True)
+def test_login_primeiro_acesso_grava_a_senha_a_parte(client, mock_sme_success, django_assert_num_queries):
+    with django_assert_num_queries(2):
+        response = client.post(reverse("login"), {"username": "1234567", "password": "Senha@123"})
+
+    assert response.status_code == 200
+    assert response.json()["cpf"] == "12345678900"
+    user = User.objects.get(username="1234567")
+    assert user.check_password("Senha@123")
+    assert user.email == "joao@email.com"
+
+
+@pytest.mark.django_db
+def test_login_preserva_colunas_fora_do_login(client, mock_sme_success):
+    user = User.objects.create_user(username="1234567", password="Senha@123", is_staff=True, first_name="Jo")
+
+    client.post(reverse("login"), {"username": "1234567", "password": "Senha@123"})
+
+    atualizado = User.objects.get(pk=user.pk)
+    assert atualizado.is_staff
+    assert atualizado.first_name == "Jo"
+    assert atualizado.uuid == user.uuid
+    assert atualizado.date_joined == user.date_joined
+
+
+@pytest.mark.django_db(transaction=True)
+def test_login_sem_email_nem_cpf_no_coresso_mantem_os_gravados(client, mock_sme_success, django_assert_num_queries):
+    User.objects.create_user(
+        username="1234567", password="Senha@123", name="Antigo", email="antigo@email.com", cpf="11122233344"
+    )
+    mock_sme_success.return_value.json.return_value = {"nome": "", "email": None, "perfis": ["0000"]}
+
+    with django_assert_num_queries(1):
+        response = client.post(reverse("login"), {"username": "1234567", "password": "Senha@123"})
+
+    assert response.status_code == 200
+    assert response.json()["email"] == "antigo@email.com"
+    assert response.json()["cpf"] == "11122233344"
+    user = User.objects.get(username="1234567")
+    assert (user.name, user.email, user.cpf) == ("Antigo", "antigo@email.com", "11122233344")
+
+
+@pytest.mark.django_db
+def test_login_normaliza_o_email(client, mock_sme_success):
+    mock_sme_success.return_value.json.return_value["email"] = "  Joao@Email.COM "
+
+    client.post(reverse("login"), {"username": "1234567", "password": "Senha@123"})
+
+    assert User.objects.get(username="1234567").email == "joao@email.com"
@@ -0,0 +1,121 @@
+import pytest
+from unittest.mock import patch
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.usuarios.services.perfis_service import PerfisService
+
+User = get_user_model()
+
+URL_DESIGNACAO = "/api/designacao/servidor"
+
+
+@pytest.fixture(autouse=True)
+def set_signa_env(monkeypatch):
+    monkeypatch.setenv("GUIDE_PERFIL_SIGNA", "0000")
+
+
+@pytest.fixture
+def designacao():
+    with patch(
+        "apps.designacao.api.views.designacao_servidor_view.DesignacaoServidorService.obter_designacao",
+        return_value={"rf": "7654321"},
+    ) as mock:
+        yield mock
+
+
+@pytest.mark.parametrize("perfis, esperado", [
+    (["0000", " abc-def ", "0000", None], ["0000", "ABC-DEF"]),
+    ("0000", []),
+    (None, []),
+])
+def test_normalizar(perfis, esperado):
+    assert PerfisService.normalizar(perfis) == esperado
+
+
+@pytest.mark.django_db
+def test_login_guarda_perfis_no_cache_e_no_token(client, mock_sme_success):
+    response = client.post(reverse("login"), {"username": "1234567", "password": "Senha@123"})
+
+    assert response.status_code == 200
+    assert PerfisService.obter("1234567") == ["0000"]
+    assert AccessToken(response.json()["token"])["perfis"] == ["0000"]
+
+
+@pytest.mark.django_db
+def test_login_recusado_por_perfil_revoga_os_perfis_guardados(client):
+    PerfisService.registrar("1234567", ["0000"])
+
+    with patch(
+        "apps.usuarios.api.views.login_view.SmeIntegracaoService.autentica",
+        return_value={"nome": "João", "perfis": ["OUTRO"]},
+    ):
+        response = client.post(reverse("login"), {"username": "1234567", "password": "Senha@123"})
+
+    assert response.status_code == 401
+    assert PerfisService.obter("1234567") == ["OUTRO"]
+
+
+@pytest.mark.django_db
+def test_permissao_pela_claim_sem_cache_nem_coresso(client, mock_sme_success, designacao):
+    token = client.post(reverse("login"), {"username": "1234567", "password": "Senha@123"}).json()["token"]
+    mock_sme_success.reset_mock()
+    cache.clear()
+
+    api = APIClient()
+    api.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    response = api.post(URL_DESIGNACAO, {"rf": "7654321"}, format="json")
+
+    assert response.status_code == 200
+    mock_sme_success.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_claim_antiga_sem_cache_nega_acesso(designacao, settings):
+    user = User.objects.create_user(username="1234567", password="Senha@123")
+    token = AccessToken.for_user(user)
+    token["perfis"] = ["0000"]
+    token["iat"] -= settings.PERFIS_SIGNA_TTL
+
+    api = APIClient()
+    api.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    response = api.post(URL_DESIGNACAO, {"rf": "7654321"}, format="json")
+
+    assert response.status_code == 403
+    designacao.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_perfis_guardados_prevalecem_sobre_a_claim(designacao):
+    user = User.objects.create_user(username="1234567", password="Senha@123")
+    token = AccessToken.for_user(user)
+    token["perfis"] = ["0000"]
+    api = APIClient()
+    api.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    # Login posterior recusado por perfil: o token ainda válido perde o acesso.
+    PerfisService.registrar(user.username, ["OUTRO"])
+    revogado = api.post(URL_DESIGNACAO, {"rf": "7654321"}, format="json")
+    PerfisService.registrar(user.username, ["0000"])
+    autorizado = api.post(URL_DESIGNACAO, {"rf": "7654321"}, format="json")
+
+    assert revogado.status_code == 403
+    assert autorizado.status_code == 200
+    designacao.assert_called_once()
+
+
+@pytest.mark.django_db
+def test_token_sem_claim_usa_os_perfis_guardados(designacao):
+    user = User.objects.create_user(username="1234567", password="Senha@123")
+    api = APIClient()
+    api.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+
+    sem_perfis = api.post(URL_DESIGNACAO, {"rf": "7654321"}, format="json")
+    PerfisService.registrar(user.username, ["0000"])
+    com_perfis = api.post(URL_DESIGNACAO, {"rf": "7654321"}, format="json")
+
+    assert sem_perfis.status_code == 403
+    assert com_perfis.status_code == 200
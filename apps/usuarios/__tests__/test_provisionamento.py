@@ -0,0 +1,123 @@
+import io
+
+import pytest
+import requests
+from unittest.mock import patch
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.urls import reverse
+
+from apps.helpers.exceptions import SmeIntegracaoException
+from apps.usuarios.models import User
+from apps.usuarios.services.provisionamento_service import ProvisionamentoService
+
+INFORMACAO_SGP = "apps.usuarios.services.provisionamento_service.SmeIntegracaoService.informacao_usuario_sgp"
+
+
+def _dados_sgp(rf):
+    if rf == "9999999":
+        raise SmeIntegracaoException("Dados não encontrados.")
+    if rf == "8888888":
+        raise requests.RequestException("Erro ao conectar-se à API externa.")
+    return {"nome": f"Servidor {rf}", "email": f"{rf}@sme.prefeitura.sp.gov.br", "numeroDocumento": f"{rf}0000"}
+
+
+def _provisionar(rfs, *args):
+    saida, erros = io.StringIO(), io.StringIO()
+    with patch("sys.stdin", io.StringIO("\n".join(rfs))), patch(INFORMACAO_SGP, side_effect=_dados_sgp) as mock:
+        call_command("provisionar_usuarios", *args, stdout=saida, stderr=erros)
+    return mock, saida.getvalue(), erros.getvalue()
+
+
+def test_ler_rfs():
+    linhas = ["123.456-7\n", "  \n", "# comentário\n", "1234567\n", "7654321 # outro\n"]
+
+    assert ProvisionamentoService.ler_rfs(linhas) == ["1234567", "7654321"]
+
+
+@pytest.mark.django_db
+def test_cria_e_atualiza_em_lote(django_assert_max_num_queries):
+    existente = User.objects.create_user(username="1111111", password="Senha@123", name="Antigo")
+    senha = existente.password
+
+    with django_assert_max_num_queries(8):
+        mock, saida, erros = _provisionar(["1111111", "2222222", "3333333", "9999999", "8888888"], "--lote", "2")
+
+    assert mock.call_count == 5
+    assert "2 criados, 1 atualizados, 1 não encontrados, 1 falhas" in saida
+    assert "9999999" in erros and "8888888" in erros
+
+    existente.refresh_from_db()
+    assert existente.name == "Servidor 1111111"
+    assert existente.cpf == "11111110000"
+    assert existente.password == senha
+
+    novo = User.objects.get(username="2222222")
+    assert novo.email == "2222222@sme.prefeitura.sp.gov.br"
+    assert not novo.has_usable_password()
+
+
+@pytest.mark.django_db
+def test_normaliza_e_nao_apaga_o_que_o_coresso_omitir():
+    User.objects.create_user(
+        username="1111111", name="Antigo", email="antigo@sme.prefeitura.sp.gov.br", cpf="11111111111"
+    )
+    dados = {
+        "1111111": {"nome": "", "email": None},
+        "2222222": {"nome": "Novo", "email": "  Novo.Servidor@SME.prefeitura.sp.gov.br ", "cpf": "222.222.222-22"},
+    }
+
+    with patch(INFORMACAO_SGP, side_effect=dados.__getitem__):
+        ProvisionamentoService.provisionar(["1111111", "2222222"])
+
+    existente = User.objects.get(username="1111111")
+    assert (existente.name, existente.email, existente.cpf) == (
+        "Antigo", "antigo@sme.prefeitura.sp.gov.br", "11111111111"
+    )
+    novo = User.objects.get(username="2222222")
+    assert (novo.email, novo.cpf) == ("novo.servidor@sme.prefeitura.sp.gov.br", "22222222222")
+
+
+@pytest.mark.django_db
+def test_conflito_de_email_isola_o_usuario():
+    User.objects.create_user(username="5555555", email="3333333@sme.prefeitura.sp.gov.br")
+
+    _, saida, erros = _provisionar(["2222222", "3333333"])
+
+    assert "1 criados" in saida
+    assert "3333333: e-mail ou CPF já usado por outro usuário" in erros
+    assert User.objects.filter(username="2222222").exists()
+    assert not User.objects.filter(username="3333333").exists()
+
+
+@pytest.mark.django_db
+def test_arquivo(tmp_path):
+    arquivo = tmp_path / "rfs.txt"
+    arquivo.write_text("2222222\n")
+
+    with patch(INFORMACAO_SGP, side_effect=_dados_sgp):
+        call_command("provisionar_usuarios", str(arquivo), stdout=io.StringIO())
+
+    assert User.objects.filter(username="2222222").exists()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("args, rfs", [
+    (["/nao/existe.txt"], []),
+    ([], []),
+    (["--concorrencia", "0"], ["1234567"]),
+])
+def test_argumentos_invalidos(args, rfs):
+    with pytest.raises(CommandError):
+        _provisionar(rfs, *args)
+
+
+@pytest.mark.django_db
+def test_primeiro_login_de_usuario_provisionado(client, mock_sme_success, monkeypatch):
+    monkeypatch.setenv("GUIDE_PERFIL_SIGNA", "0000")
+    _provisionar(["1234567"])
+
+    response = client.post(reverse("login"), {"username": "1234567", "password": "Senha@123"})
+
+    assert response.status_code == 200
+    assert User.objects.get(username="1234567").check_password("Senha@123")
@@ -0,0 +1,172 @@
+import io
+import signal
+from datetime import timedelta
+
+import pytest
+import requests
+from unittest.mock import patch
+from django.core import mail
+from django.core.management import call_command
+from django.utils import timezone
+
+from apps.helpers.exceptions import SmeIntegracaoException
+from apps.monitoramento.metricas import RECUPERACOES_SENHA, RECUPERACOES_SENHA_PENDENTES
+from apps.usuarios.models import PedidoRecuperacaoSenha, User
+from apps.usuarios.services.recuperacao_senha_service import RecuperacaoSenhaService
+
+INFORMACAO_SGP = "apps.usuarios.services.recuperacao_senha_service.SmeIntegracaoService.informacao_usuario_sgp"
+ENVIAR = "apps.usuarios.services.recuperacao_senha_service.EnviaEmailService.enviar"
+
+
+@pytest.fixture(autouse=True)
+def ambiente(monkeypatch, settings):
+    monkeypatch.setenv("AMBIENTE_URL", "http://testserver")
+    settings.RECUPERACAO_SENHA_ESPERA = 30
+    settings.RECUPERACAO_SENHA_TENTATIVAS = 3
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create_user(username="1234567", email="local@teste.com", name="Maria da Silva")
+
+
+def _resultado(nome):
+    return RECUPERACOES_SENHA.labels(nome)._value.get()
+
+
+@patch(INFORMACAO_SGP, return_value={"email": "sgp@teste.com"})
+def test_envia_o_link_para_o_email_do_sgp(mock_sgp, user):
+    enviados = _resultado("enviado")
+    RecuperacaoSenhaService.solicitar("1234567")
+
+    assert RecuperacaoSenhaService.processar_pendentes() == 1
+
+    assert len(mail.outbox) == 1
+    assert mail.outbox[0].to == ["sgp@teste.com"]
+    assert "http://testserver/recuperar-senha/" in mail.outbox[0].body
+    assert "Maria" in mail.outbox[0].body
+    assert not PedidoRecuperacaoSenha.objects.exists()
+    assert _resultado("enviado") == enviados + 1
+
+
+@pytest.mark.parametrize("erro", [SmeIntegracaoException("Dados não encontrados."), requests.ConnectionError()])
+def test_sgp_sem_email_usa_o_local(user, erro):
+    with patch(INFORMACAO_SGP, side_effect=erro):
+        RecuperacaoSenhaService.solicitar("1234567")
+        RecuperacaoSenhaService.processar_pendentes()
+
+    assert mail.outbox[0].to == ["local@teste.com"]
+
+
+@patch(INFORMACAO_SGP, return_value={})
+@pytest.mark.parametrize("username, resultado", [("9999999", "sem_usuario"), ("7654321", "sem_email")])
+def test_sem_usuario_ou_sem_email_conclui_sem_enviar(mock_sgp, db, username, resultado):
+    User.objects.create(username="7654321")
+    antes = _resultado(resultado)
+    RecuperacaoSenhaService.solicitar(username)
+
+    RecuperacaoSenhaService.processar_pendentes()
+
+    assert mail.outbox == []
+    assert not PedidoRecuperacaoSenha.objects.exists()
+    assert _resultado(resultado) == antes + 1
+
+
+@patch(INFORMACAO_SGP, return_value={"email": "sgp@teste.com"})
+@patch(ENVIAR, side_effect=RuntimeError("Erro inesperado ao enviar e-mail."))
+def test_falha_volta_para_a_fila_com_espera_exponencial(mock_enviar, mock_sgp, user):
+    RecuperacaoSenhaService.solicitar("1234567")
+    esperas = []
+
+    for _ in range(2):
+        inicio = timezone.now()
+        RecuperacaoSenhaService.processar_pendentes()
+        pedido = PedidoRecuperacaoSenha.objects.get()
+        esperas.append(round((pedido.disponivel_em - inicio).total_seconds()))
+        # Sem a espera vencida, o pedido não é reservado de novo.
+        assert RecuperacaoSenhaService.processar_pendentes() == 0
+        PedidoRecuperacaoSenha.objects.update(disponivel_em=timezone.now())
+
+    assert esperas == [30, 60]
+    assert pedido.tentativas == 2
+
+    descartados = _resultado("descartado")
+    RecuperacaoSenhaService.processar_pendentes()
+
+    assert not PedidoRecuperacaoSenha.objects.exists()
+    assert mock_enviar.call_count == 3
+    assert _resultado("descartado") == descartados + 1
+
+
+@patch(INFORMACAO_SGP, side_effect=requests.ConnectionError())
+def test_sgp_fora_do_ar_sem_email_local_tenta_de_novo(mock_sgp, db):
+    User.objects.create(username="7654321")
+    RecuperacaoSenhaService.solicitar("7654321")
+
+    RecuperacaoSenhaService.processar_pendentes()
+
+    assert PedidoRecuperacaoSenha.objects.get().tentativas == 1
+
+
+@patch(INFORMACAO_SGP, return_value={"email": "sgp@teste.com"})
+def test_pedidos_repetidos_no_lote_enviam_um_email(mock_sgp, user):
+    for _ in range(3):
+        RecuperacaoSenhaService.solicitar("1234567")
+
+    assert RecuperacaoSenhaService.processar_pendentes() == 3
+
+    assert len(mail.outbox) == 1
+    assert not PedidoRecuperacaoSenha.objects.exists()
+
+
+def test_pedido_reservado_nao_e_pego_de_novo(user):
+    RecuperacaoSenhaService.solicitar("1234567")
+    PedidoRecuperacaoSenha.objects.update(disponivel_em=timezone.now() + timedelta(minutes=5))
+
+    with patch(INFORMACAO_SGP) as mock_sgp:
+        assert RecuperacaoSenhaService.processar_pendentes() == 0
+
+    mock_sgp.assert_not_called()
+
+
+@pytest.mark.django_db(transaction=True)
+@patch(INFORMACAO_SGP, return_value={"email": "sgp@teste.com"})
+def test_comando_uma_vez(mock_sgp):
+    User.objects.create_user(username="1234567", email="local@teste.com", name="Maria")
+    RecuperacaoSenhaService.solicitar("1234567")
+    saida = io.StringIO()
+
+    call_command("processar_recuperacoes_senha", "--uma-vez", stdout=saida)
+
+    assert "1 pedidos processados" in saida.getvalue()
+    assert len(mail.outbox) == 1
+    assert RECUPERACOES_SENHA_PENDENTES._value.get() == 0
+
+
+COMANDO = "apps.usuarios.management.commands.processar_recuperacoes_senha"
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize("argumentos, porta", [
+    ([], 9101),
+    (["--porta-metricas", "9200"], 9200),
+    (["--porta-metricas", "0"], None),
+])
+def test_comando_em_loop_exporta_metricas_e_a_fila(argumentos, porta):
+    RecuperacaoSenhaService.solicitar("1234567")
+    RecuperacaoSenhaService.solicitar("7654321")
+    PedidoRecuperacaoSenha.objects.update(disponivel_em=timezone.now() + timedelta(minutes=5))
+    tratadores = {}
+
+    with (
+        patch(f"{COMANDO}.signal.signal", side_effect=tratadores.__setitem__),
+        patch(f"{COMANDO}.start_http_server") as mock_servidor,
+        patch(f"{COMANDO}.time.sleep", side_effect=lambda _: tratadores[signal.SIGTERM](signal.SIGTERM, None)),
+    ):
+        call_command("processar_recuperacoes_senha", *argumentos, stdout=io.StringIO())
+
+    if porta:
+        mock_servidor.assert_called_once_with(porta)
+    else:
+        mock_servidor.assert_not_called()
+    assert RECUPERACOES_SENHA_PENDENTES._value.get() == 2
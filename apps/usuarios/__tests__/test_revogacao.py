@@ -0,0 +1,220 @@
+import threading
+
+import pytest
+from unittest.mock import patch
+from django.contrib.auth import get_user_model
+from django.contrib.auth.tokens import default_token_generator
+from django.core.cache import cache
+from django.test import override_settings
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from apps.usuarios.services.revogacao_service import RevogacaoService
+
+User = get_user_model()
+
+URL_ME = "/api/usuario/me"
+URL_REFRESH = "/api/token/refresh/"
+
+
+@pytest.fixture
+def user():
+    return User.objects.create_user(username="1234567", password="Senha@123")
+
+
+def _api(token):
+    api = APIClient()
+    api.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    return api
+
+
+@pytest.mark.django_db
+def test_token_revogado_pelo_jti(user):
+    revogado, outro = AccessToken.for_user(user), AccessToken.for_user(user)
+
+    RevogacaoService.revogar_token(revogado)
+
+    assert _api(revogado).get(URL_ME).status_code == 401
+    assert _api(outro).get(URL_ME).status_code == 200
+
+
+@pytest.mark.django_db
+def test_tokens_do_usuario_revogados_ate_o_instante_da_revogacao(user):
+    antigo = AccessToken.for_user(user)
+    antigo["iat"] -= 10
+
+    RevogacaoService.revogar_tokens_do_usuario(user.id)
+    novo = AccessToken.for_user(user)
+
+    assert RevogacaoService.revogado(antigo)
+    assert not RevogacaoService.revogado(novo)
+    assert not RevogacaoService.revogado(AccessToken.for_user(User(id=user.id + 1, username="7654321")))
+
+
+@pytest.mark.django_db
+def test_token_emitido_no_mesmo_segundo_apos_a_revogacao_vale(user):
+    # Só o relógio do serviço: o TTL da chave no cache continua contando do instante real.
+    with patch("apps.usuarios.services.revogacao_service.time") as mock_time:
+        mock_time.time.return_value = 1_000_000.7
+        RevogacaoService.revogar_tokens_do_usuario(user.id)
+
+    mesmo_segundo, segundo_anterior = AccessToken.for_user(user), AccessToken.for_user(user)
+    mesmo_segundo["iat"] = 1_000_000
+    segundo_anterior["iat"] = 999_999
+
+    assert not RevogacaoService.revogado(mesmo_segundo)
+    assert RevogacaoService.revogado(segundo_anterior)
+
+
+@pytest.mark.django_db
+def test_sessao_criada_logo_apos_a_revogacao_funciona(user):
+    for _ in range(20):
+        RevogacaoService.revogar_tokens_do_usuario(user.id)
+        refresh = RefreshToken.for_user(user)
+
+        assert _api(refresh.access_token).get(URL_ME).status_code == 200
+        assert not RevogacaoService.revogado(refresh)
+
+
+@pytest.mark.django_db
+def test_verificacao_sem_consultar_o_cache_entre_sincronizacoes(user):
+    token = AccessToken.for_user(user)
+    RevogacaoService.revogado(token)
+
+    with patch("apps.usuarios.services.revogacao_service.cache") as mock_cache:
+        for _ in range(3):
+            assert not RevogacaoService.revogado(token)
+
+    assert mock_cache.method_calls == []
+
+
+@pytest.mark.django_db
+def test_revogacao_de_outro_processo_vale_apos_sincronizar(user):
+    token = AccessToken.for_user(user)
+    assert not RevogacaoService.revogado(token)
+
+    # Outro worker grava no cache compartilhado; este processo ainda tem a resposta antiga.
+    cache.set(RevogacaoService.CHAVE_JTI.format(token["jti"]), True)
+    cache.set(RevogacaoService.CHAVE_VERSAO, 1)
+
+    assert not RevogacaoService.revogado(token)
+    with override_settings(REVOGACAO_SINCRONIZACAO=0):
+        assert RevogacaoService.revogado(token)
+
+
+@pytest.mark.django_db
+def test_revogacoes_com_ttl_proprio(user):
+    expirado, valido = AccessToken.for_user(user), AccessToken.for_user(user)
+    expirado["exp"] = 1
+
+    with patch.object(cache, "set", wraps=cache.set) as mock_set:
+        RevogacaoService.revogar_token(expirado)
+        RevogacaoService.revogar_token(valido)
+        RevogacaoService.revogar_tokens_do_usuario(user.id)
+
+    chaves = {chamada.args[0]: chamada.kwargs["timeout"] for chamada in mock_set.call_args_list}
+    assert RevogacaoService.CHAVE_JTI.format(expirado["jti"]) not in chaves
+    assert 0 < chaves[RevogacaoService.CHAVE_JTI.format(valido["jti"])] <= valido["exp"] - valido["iat"] + 1
+    assert chaves[RevogacaoService.CHAVE_USUARIO.format(user.id)] == 7 * 24 * 60 * 60
+
+
+@pytest.mark.django_db
+def test_revogar_nao_rele_as_revogacoes_anteriores(user):
+    for _ in range(50):
+        RevogacaoService.revogar_token(AccessToken.for_user(user))
+
+    with patch("apps.usuarios.services.revogacao_service.cache") as mock_cache:
+        RevogacaoService.revogar_token(AccessToken.for_user(user))
+
+    assert [chamada[0] for chamada in mock_cache.method_calls] == ["set", "add", "incr"]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_revogacoes_concorrentes_nao_se_perdem(user):
+    tokens = [AccessToken.for_user(user) for _ in range(20)]
+    barreira = threading.Barrier(len(tokens))
+
+    def revogar(token):
+        barreira.wait()
+        RevogacaoService.revogar_token(token)
+
+    threads = [threading.Thread(target=revogar, args=(token,)) for token in tokens]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    RevogacaoService.descartar_estado_local()
+
+    assert all(RevogacaoService.revogado(token) for token in tokens)
+    assert cache.get(RevogacaoService.CHAVE_VERSAO) == len(tokens)
+
+
+@pytest.mark.django_db
+def test_autenticacao_sem_consultas_extras(user, django_assert_num_queries):
+    api = _api(AccessToken.for_user(user))
+    RevogacaoService.revogar_tokens_do_usuario(999)
+
+    # Só a busca do usuário pelo JWTAuthentication.
+    with django_assert_num_queries(1):
+        assert api.get(URL_ME).status_code == 200
+
+
+@pytest.mark.django_db
+def test_refresh_revogado_nao_renova(client, user):
+    refresh = RefreshToken.for_user(user)
+    RevogacaoService.revogar_token(refresh)
+    client.cookies["signa_refresh"] = str(refresh)
+
+    assert client.post(URL_REFRESH).status_code == 401
+
+
+@pytest.mark.django_db
+def test_encerrar_sessao_revoga_refresh_e_access(client, user):
+    refresh, access = RefreshToken.for_user(user), AccessToken.for_user(user)
+    client.cookies["signa_refresh"] = str(refresh)
+
+    response = client.delete(URL_REFRESH, HTTP_AUTHORIZATION=f"Bearer {access}")
+
+    assert response.status_code == 204
+    assert response.cookies["signa_refresh"]["max-age"] == 0
+    assert RevogacaoService.revogado(refresh)
+    assert RevogacaoService.revogado(access)
+
+
+@pytest.mark.django_db
+def test_encerrar_sessao_sem_tokens(client):
+    response = client.delete(URL_REFRESH, HTTP_AUTHORIZATION="Bearer")
+
+    assert response.status_code == 204
+
+
+@pytest.mark.django_db
+@patch("apps.usuarios.api.views.senha_view.SmeIntegracaoService.redefine_senha")
+def test_atualizar_senha_revoga_tokens_anteriores(mock_redefine, user, django_capture_on_commit_callbacks):
+    token = AccessToken.for_user(user)
+    token["iat"] -= 10
+    api = _api(token)
+    dados = {"senha_atual": "Senha@123", "nova_senha": "Nova@1234", "confirmacao_nova_senha": "Nova@1234"}
+
+    with django_capture_on_commit_callbacks(execute=True):
+        assert api.post("/api/usuario/atualizar-senha", dados, format="json").status_code == 200
+
+    assert api.get(URL_ME).status_code == 401
+
+
+@pytest.mark.django_db
+@patch("apps.usuarios.api.views.senha_view.SmeIntegracaoService.redefine_senha")
+def test_redefinir_senha_revoga_tokens_anteriores(mock_redefine, client, user):
+    refresh = RefreshToken.for_user(user)
+    refresh["iat"] -= 10
+    dados = {
+        "uid": urlsafe_base64_encode(force_bytes(user.pk)),
+        "token": default_token_generator.make_token(user),
+        "new_pass": "Nova@1234",
+        "new_pass_confirm": "Nova@1234",
+    }
+
+    assert client.post("/api/usuario/redefinir-senha", dados, content_type="application/json").status_code == 200
+    assert RevogacaoService.revogado(refresh)
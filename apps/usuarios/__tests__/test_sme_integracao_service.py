@@ -26,7 +26,7 @@ def test_sme_autentica_success(monkeypatch):
             {"nome": "João", "email": "joao@email.com"}
         )
 
-    monkeypatch.setattr(requests, "post", fake_post)
+    monkeypatch.setattr(requests.Session, "post", fake_post)
 
     result = SmeIntegracaoService.autentica("1234", "senha")
 
@@ -37,7 +37,7 @@ def test_sme_autentica_unauthorized(monkeypatch):
     def fake_post(*args, **kwargs):
         return FakeResponse(401)
 
-    monkeypatch.setattr(requests, "post", fake_post)
+    monkeypatch.setattr(requests.Session, "post", fake_post)
 
     with pytest.raises(AuthenticationError):
         SmeIntegracaoService.autentica("1234", "errada")
@@ -47,7 +47,7 @@ def test_sme_autentica_other_status(monkeypatch):
     def fake_post(*args, **kwargs):
         return FakeResponse(500)
 
-    monkeypatch.setattr(requests, "post", fake_post)
+    monkeypatch.setattr(requests.Session, "post", fake_post)
 
     with pytest.raises(SmeIntegracaoException):
         SmeIntegracaoService.autentica("1234", "senha")
@@ -57,7 +57,7 @@ def test_sme_autentica_request_exception(monkeypatch):
     def fake_post(*args, **kwargs):
         raise requests.exceptions.RequestException("timeout")
 
-    monkeypatch.setattr(requests, "post", fake_post)
+    monkeypatch.setattr(requests.Session, "post", fake_post)
 
     with pytest.raises(SmeIntegracaoException):
         SmeIntegracaoService.autentica("1234", "senha")
@@ -67,7 +67,7 @@ def test_sme_autentica_internal_error(monkeypatch):
     def fake_post(*args, **kwargs):
         raise ValueError("erro inesperado")
 
-    monkeypatch.setattr(requests, "post", fake_post)
+    monkeypatch.setattr(requests.Session, "post", fake_post)
 
     with pytest.raises(InternalError):
         SmeIntegracaoService.autentica("1234", "senha")
@@ -75,7 +75,7 @@ def test_sme_autentica_internal_error(monkeypatch):
 
 def test_informacao_usuario_sgp_success():
     """Testa quando a API retorna 200 com dados"""
-    with patch('requests.get') as mock_get:
+    with patch('requests.Session.get') as mock_get:
         mock_response = MagicMock(status_code=200)
         mock_response.json.return_value = {"email": "teste@email.com"}
         mock_get.return_value = mock_response
@@ -88,7 +88,7 @@ def test_informacao_usuario_sgp_success():
 
 def test_informacao_usuario_sgp_not_found():
     """Testa quando a API retorna 404"""
-    with patch('requests.get') as mock_get:
+    with patch('requests.Session.get') as mock_get:
         mock_response = MagicMock(status_code=404)
         mock_get.return_value = mock_response
         
@@ -100,7 +100,7 @@ def test_informacao_usuario_sgp_not_found():
 
 def test_informacao_usuario_sgp_other_error_status():
     """Testa quando a API retorna outro erro (ex: 500)"""
-    with patch('requests.get') as mock_get:
+    with patch('requests.Session.get') as mock_get:
         mock_response = MagicMock(status_code=500)
         mock_get.return_value = mock_response
         
@@ -110,7 +110,7 @@ def test_informacao_usuario_sgp_other_error_status():
 
 def test_informacao_usuario_sgp_connection_error():
     """Testa quando há erro de conexão"""
-    with patch('requests.get') as mock_get:
+    with patch('requests.Session.get') as mock_get:
         mock_get.side_effect = requests.exceptions.ConnectionError
         
         with pytest.raises(requests.exceptions.RequestException):
@@ -122,7 +122,7 @@ def test_redefine_senha_success(monkeypatch):
     def fake_post(*args, **kwargs):
         return FakeResponse(200)
 
-    monkeypatch.setattr(requests, "post", fake_post)
+    monkeypatch.setattr(requests.Session, "post", fake_post)
 
     result = SmeIntegracaoService.redefine_senha("123456", "NovaSenha123")
 
@@ -142,7 +142,7 @@ def test_redefine_senha_server_error(monkeypatch):
     def fake_post(*args, **kwargs):
         return FakeResponse(500)
 
-    monkeypatch.setattr(requests, "post", fake_post)
+    monkeypatch.setattr(requests.Session, "post", fake_post)
 
     with pytest.raises(SmeIntegracaoException):
         SmeIntegracaoService.redefine_senha("123456", "NovaSenha123")
@@ -153,7 +153,7 @@ def test_redefine_senha_request_exception(monkeypatch):
     def fake_post(*args, **kwargs):
         raise requests.exceptions.RequestException("timeout")
 
-    monkeypatch.setattr(requests, "post", fake_post)
+    monkeypatch.setattr(requests.Session, "post", fake_post)
 
     with pytest.raises(SmeIntegracaoException):
         SmeIntegracaoService.redefine_senha("123456", "NovaSenha123")
@@ -164,7 +164,7 @@ def test_redefine_senha_internal_error(monkeypatch):
     def fake_post(*args, **kwargs):
         raise ValueError("erro inesperado")
 
-    monkeypatch.setattr(requests, "post", fake_post)
+    monkeypatch.setattr(requests.Session, "post", fake_post)
 
     with pytest.raises(SmeIntegracaoException):
         SmeIntegracaoService.redefine_senha("123456", "NovaSenha123")
@@ -172,7 +172,7 @@ def test_redefine_senha_internal_error(monkeypatch):
 
 def test_redefine_senha_bad_request_with_message():
     """Cobre o bloco else que extrai mensagem do response.content"""
-    with patch('requests.post') as mock_post:
+    with patch('requests.Session.post') as mock_post:
         mock_response = MagicMock()
         mock_response.status_code = 400
         mock_response.content = b'{"Erro":"Senha invalida"}'
@@ -183,7 +183,7 @@ def test_redefine_senha_bad_request_with_message():
         
         assert "Senha invalida" in str(exc.value)
 
-@patch("apps.usuarios.services.sme_integracao_service.requests.post")
+@patch("requests.Session.post")
 class TestAlteraEmail:
 
     def test_sucesso(self, mock_post):
@@ -252,7 +252,7 @@ class TestDesignacao:
             }
         ]
 
-        with patch("apps.usuarios.services.sme_integracao_service.requests.get") as mock_get:
+        with patch("requests.Session.get") as mock_get:
             mock_response = MagicMock()
             mock_response.status_code = status.HTTP_200_OK
             mock_response.json.return_value = cargos_mock
@@ -266,7 +266,7 @@ class TestDesignacao:
 
     def test_consulta_cargos_funcionario_status_invalido(self):
         """Deve lançar exceção quando API retorna status diferente de 200"""
-        with patch("apps.usuarios.services.sme_integracao_service.requests.get") as mock_get:
+        with patch("requests.Session.get") as mock_get:
             mock_response = MagicMock()
             mock_response.status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
             mock_response.text = "Erro interno"
@@ -282,7 +282,7 @@ class TestDesignacao:
     def test_consulta_cargos_funcionario_request_exception(self):
         """Deve lançar exceção quando ocorre erro de comunicação"""
         with patch(
-            "apps.usuarios.services.sme_integracao_service.requests.get",
+            "requests.Session.get",
             side_effect=requests.exceptions.RequestException("timeout")
         ):
             with pytest.raises(SmeIntegracaoException) as exc:
@@ -0,0 +1,134 @@
+import pytest
+from unittest.mock import patch
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APIRequestFactory
+from rest_framework.request import Request
+from rest_framework.parsers import JSONParser
+
+from apps.helpers.exceptions import AuthenticationError
+from apps.helpers.throttles import PorIPThrottle, rf_da_requisicao
+from apps.monitoramento.metricas import THROTTLE_RECUSAS
+from apps.usuarios.models import PedidoRecuperacaoSenha
+from config.settings.base import REST_FRAMEWORK
+
+User = get_user_model()
+
+TAXAS = {"login_ip": "100/m", "login_rf": "3/15m", "esqueci_senha_ip": "2/m", "esqueci_senha_rf": "5/m"}
+
+
+@pytest.fixture(autouse=True)
+def taxas_de_teste():
+    with override_settings(REST_FRAMEWORK={**REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": TAXAS}):
+        yield
+
+
+@pytest.mark.django_db
+@patch("apps.usuarios.api.views.login_view.SmeIntegracaoService.autentica", side_effect=AuthenticationError("x"))
+def test_login_limitado_por_rf_sem_chamar_o_coresso(mock_autentica, client):
+    recusas = THROTTLE_RECUSAS.labels("login_rf")._value.get()
+
+    respostas = [
+        client.post(reverse("login"), {"username": username, "password": "errada"})
+        for username in ("1234567", "123.456-7", "1234567", "1234567")
+    ]
+
+    assert [r.status_code for r in respostas] == [401, 401, 401, 429]
+    assert int(respostas[-1]["Retry-After"]) > 0
+    assert mock_autentica.call_count == 3
+    assert THROTTLE_RECUSAS.labels("login_rf")._value.get() == recusas + 1
+
+    outro_rf = client.post(reverse("login"), {"username": "7654321", "password": "errada"})
+    assert outro_rf.status_code == 401
+
+
+@pytest.mark.django_db
+def test_esqueci_senha_limitado_por_ip(client):
+    respostas = [
+        client.post(reverse("esqueci-senha"), {"username": rf}, REMOTE_ADDR="10.0.0.1")
+        for rf in ("1111111", "2222222", "3333333")
+    ]
+    outro_ip = client.post(reverse("esqueci-senha"), {"username": "4444444"}, REMOTE_ADDR="10.0.0.2")
+
+    assert [r.status_code for r in respostas] == [202, 202, 429]
+    assert outro_ip.status_code == 202
+    assert PedidoRecuperacaoSenha.objects.count() == 3
+
+
+@pytest.mark.django_db
+def test_x_forwarded_for_forjado_nao_renova_o_limite_por_ip(client):
+    respostas = [
+        client.post(
+            reverse("esqueci-senha"), {"username": rf}, REMOTE_ADDR="10.0.0.1", HTTP_X_FORWARDED_FOR=f"203.0.113.{i}"
+        )
+        for i, rf in enumerate(("1111111", "2222222", "3333333"))
+    ]
+
+    assert [r.status_code for r in respostas] == [202, 202, 429]
+
+
+@pytest.mark.django_db
+def test_x_forwarded_for_atras_de_proxy_conhecido(client):
+    taxas = {**REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": TAXAS, "NUM_PROXIES": 1}
+    with override_settings(REST_FRAMEWORK=taxas):
+        respostas = [
+            client.post(
+                reverse("esqueci-senha"), {"username": rf}, REMOTE_ADDR="10.0.0.1",
+                HTTP_X_FORWARDED_FOR=f"198.51.100.9, 203.0.113.{i}",
+            )
+            for i, rf in enumerate(("1111111", "2222222", "3333333"))
+        ]
+
+    # Cada requisição chegou ao proxy por um cliente diferente: o IP é o que o proxy acrescentou.
+    assert [r.status_code for r in respostas] == [202, 202, 202]
+
+
+@pytest.mark.django_db
+@patch("apps.usuarios.api.views.login_view.SmeIntegracaoService.autentica", side_effect=AuthenticationError("x"))
+def test_janela_deslizante(mock_autentica, client):
+    with patch("rest_framework.throttling.SimpleRateThrottle.timer", return_value=1000.0):
+        for _ in range(3):
+            client.post(reverse("login"), {"username": "1234567", "password": "errada"})
+        assert client.post(reverse("login"), {"username": "1234567", "password": "errada"}).status_code == 429
+
+    with patch("rest_framework.throttling.SimpleRateThrottle.timer", return_value=1000.0 + 15 * 60 + 1):
+        assert client.post(reverse("login"), {"username": "1234567", "password": "errada"}).status_code == 401
+
+
+@pytest.mark.django_db
+@patch("apps.usuarios.api.views.login_view.SmeIntegracaoService.autentica", side_effect=AuthenticationError("x"))
+def test_taxa_vazia_desliga_o_limite(mock_autentica, client):
+    with override_settings(REST_FRAMEWORK={**REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": {}}):
+        respostas = [client.post(reverse("login"), {"username": "1234567", "password": "x"}) for _ in range(5)]
+
+    assert {r.status_code for r in respostas} == {401}
+
+
+@pytest.mark.parametrize("taxa, esperado", [
+    ("5/m", (5, 60)),
+    ("10/15m", (10, 900)),
+    ("100/2h", (100, 7200)),
+    ("3/day", (3, 86400)),
+])
+def test_parse_rate(taxa, esperado):
+    assert PorIPThrottle().parse_rate(taxa) == esperado
+
+
+def test_parse_rate_invalida():
+    with pytest.raises(ValueError):
+        PorIPThrottle().parse_rate("5/semana")
+
+
+@pytest.mark.parametrize("dados, esperado", [
+    ({"username": "123.456-7"}, "1234567"),
+    ({"username": 1234567}, "1234567"),
+    ({"username": ""}, None),
+    ({"username": ["1234567"]}, None),
+    ({}, None),
+    (["1234567"], None),
+])
+def test_rf_da_requisicao(dados, esperado):
+    request = Request(APIRequestFactory().post("/", dados, format="json"), parsers=[JSONParser()])
+
+    assert rf_da_requisicao(request) == esperado
@@ -0,0 +1,92 @@
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from apps.usuarios.services.perfis_service import PerfisService
+
+URL_REFRESH = "/api/token/refresh/"
+
+
+@pytest.fixture(autouse=True)
+def set_signa_env(monkeypatch):
+    monkeypatch.setenv("GUIDE_PERFIL_SIGNA", "0000")
+
+
+@pytest.fixture
+def login(client, mock_sme_success):
+    response = client.post(reverse("login"), {"username": "1234567", "password": "Senha@123"})
+    assert response.status_code == 200
+    mock_sme_success.reset_mock()
+    return response
+
+
+@pytest.mark.django_db
+def test_login_envia_refresh_em_cookie_httponly(login):
+    cookie = login.cookies["signa_refresh"]
+
+    assert cookie["httponly"]
+    assert cookie["path"] == URL_REFRESH
+    assert int(cookie["max-age"]) == 7 * 24 * 3600
+    assert RefreshToken(cookie.value)["username"] == "1234567"
+    assert "refresh" not in login.json()
+
+
+@pytest.mark.django_db
+def test_refresh_sem_banco_nem_coresso(client, login, mock_sme_success, django_assert_num_queries):
+    with django_assert_num_queries(0):
+        response = client.post(URL_REFRESH)
+
+    assert response.status_code == 200
+    access = AccessToken(response.json()["token"])
+    assert access["username"] == "1234567"
+    assert access["name"] == "João da Silva"
+    assert access["email"] == "joao@email.com"
+    assert access["perfis"] == ["0000"]
+    mock_sme_success.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_refresh_pelo_corpo(client, login):
+    refresh = login.cookies["signa_refresh"].value
+    client.cookies.clear()
+
+    response = client.post(URL_REFRESH, {"refresh": refresh}, content_type="application/json")
+
+    assert response.status_code == 200
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("refresh", [None, "invalido"])
+def test_refresh_ausente_ou_invalido(client, refresh):
+    if refresh:
+        client.cookies["signa_refresh"] = refresh
+
+    response = client.post(URL_REFRESH)
+
+    assert response.status_code == 401
+    assert response.cookies["signa_refresh"]["max-age"] == 0
+
+
+@pytest.mark.django_db
+def test_access_token_nao_serve_como_refresh(client, login):
+    client.cookies["signa_refresh"] = login.json()["token"]
+
+    assert client.post(URL_REFRESH).status_code == 401
+
+
+@pytest.mark.django_db
+def test_perfil_revogado_no_login_seguinte_impede_refresh(client, login):
+    PerfisService.registrar("1234567", ["OUTRO"])
+
+    assert client.post(URL_REFRESH).status_code == 401
+
+
+@pytest.mark.django_db
+def test_sem_perfis_guardados_usa_a_claim_dentro_do_ttl(client, login):
+    cache.clear()
+    assert client.post(URL_REFRESH).status_code == 200
+
+    with override_settings(PERFIS_SIGNA_TTL=0):
+        assert client.post(URL_REFRESH).status_code == 401
@@ -1,6 +1,7 @@
 import pytest
 import secrets
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError
 
 User = get_user_model()
 
@@ -43,3 +44,77 @@ def test_password_is_hashed_on_save():
 
     assert user.password != raw_password
     assert user.password.startswith("pbkdf2_sha256")
+
+
+@pytest.mark.django_db
+def test_senha_em_texto_puro_com_exclamacao_e_codificada():
+    user = User(username="testeuser", password="!Senha@123")
+    user.save()
+
+    assert user.password.startswith("pbkdf2_sha256")
+    assert user.check_password("!Senha@123")
+
+
+@pytest.mark.django_db
+def test_senha_inutilizavel_preservada_no_save():
+    user = User(username="testeuser")
+    user.set_unusable_password()
+    user.save()
+
+    user = User.objects.get(pk=user.pk)
+    user.name = "Outro Nome"
+    user.save()
+
+    user.refresh_from_db()
+    assert not user.has_usable_password()
+
+
+@pytest.mark.django_db
+def test_hash_existente_nao_e_recodificado():
+    user = User.objects.create_user(username="testeuser", password="Senha@123")
+    codificada = user.password
+
+    user.save()
+    User.objects.get(pk=user.pk).save()
+
+    user.refresh_from_db()
+    assert user.password == codificada
+    assert user.check_password("Senha@123")
+
+
+@pytest.mark.django_db
+def test_email_unico_ignora_maiusculas():
+    User.objects.create_user(username="usuario1", email="teste@example.com")
+
+    with pytest.raises(IntegrityError):
+        User.objects.create_user(username="usuario2", email="Teste@Example.com")
+
+
+@pytest.mark.django_db(transaction=True)
+def test_migracao_do_email_minusculo_libera_repetidos():
+    from datetime import datetime, timezone
+
+    from django.db import connection
+    from django.db.migrations.executor import MigrationExecutor
+
+    anterior, constraint = ("usuarios", "0001_initial"), ("usuarios", "0002_user_email_lower_uniq")
+    executor = MigrationExecutor(connection)
+    executor.migrate([anterior])
+    try:
+        HistoricoUser = executor.loader.project_state([anterior]).apps.get_model("usuarios", "User")
+        recente = HistoricoUser.objects.create(
+            username="1111111", email="Ana@Email.com", last_login=datetime(2026, 1, 2, tzinfo=timezone.utc)
+        )
+        antigo = HistoricoUser.objects.create(
+            username="2222222", email="ana@email.com", last_login=datetime(2026, 1, 1, tzinfo=timezone.utc)
+        )
+        outro = HistoricoUser.objects.create(username="3333333", email="outro@email.com")
+
+        executor = MigrationExecutor(connection)
+        executor.migrate([constraint])
+
+        emails = dict(HistoricoUser.objects.values_list("pk", "email"))
+        assert emails == {recente.pk: "Ana@Email.com", antigo.pk: None, outro.pk: "outro@email.com"}
+    finally:
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
@@ -0,0 +1,19 @@
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+
+from apps.usuarios.services.revogacao_service import RevogacaoService
+
+
+class JWTRevogavelAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication que recusa tokens revogados (logout, troca de senha).
+
+    A verificação usa as respostas guardadas no processo por RevogacaoService,
+    sem consultar o banco nem, na maior parte das requisições, o cache.
+    """
+
+    def get_validated_token(self, raw_token):
+        token = super().get_validated_token(raw_token)
+        if RevogacaoService.revogado(token):
+            raise InvalidToken({"detail": "Token revogado.", "code": "token_revoked"})
+        return token
@@ -0,0 +1,27 @@
+from rest_framework.permissions import BasePermission
+
+from apps.usuarios.services.perfis_service import PerfisService
+
+
+class PerfilSignaPermission(BasePermission):
+    """
+    Exige o perfil SIGNA, sem consultar o CoreSSO.
+
+    Vale a cópia dos perfis guardada no login por PerfisService: um login
+    posterior recusado por perfil revoga o acesso na hora, mesmo com um access
+    token ainda válido. A claim ``perfis`` do token só é usada sem essa cópia
+    (cache expirado ou perdido) e enquanto o login tiver menos de
+    PERFIS_SIGNA_TTL. Sem nenhum dos dois o acesso é negado e o usuário
+    precisa entrar de novo.
+    """
+
+    message = "Desculpe, mas o acesso ao SIGNA é restrito a perfis específicos."
+
+    def has_permission(self, request, view):
+        user = request.user
+        if not (user and user.is_authenticated):
+            return False
+
+        token = request.auth if request.auth is not None else {}
+        perfis = PerfisService.vigentes(user.username, token.get("perfis"), token.get("iat"))
+        return PerfisService.autorizado(perfis)
@@ -1,8 +1,4 @@
-import environ
 import logging
-from django.contrib.auth import get_user_model
-from django.db import transaction
-from django.utils import timezone
 
 from rest_framework import status, permissions
 from rest_framework.exceptions import ValidationError
@@ -11,20 +7,25 @@ from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenObtainPairView
 
 from apps.usuarios.api.serializers.login_serializer import LoginSerializer
+from apps.usuarios.api.views.token_view import definir_cookie_refresh
+from apps.usuarios.services.espelho_service import EspelhoService
+from apps.usuarios.services.perfis_service import PerfisService
 from apps.usuarios.services.sme_integracao_service import SmeIntegracaoService
+from apps.helpers.throttles import PorIPThrottle, PorRFThrottle
 from apps.helpers.exceptions import (
     AuthenticationError,
     SmeIntegracaoException,
     PerfilNaoAutorizadoError
 )
 
-User = get_user_model()
 logger = logging.getLogger(__name__)
-env = environ.Env()
 
 
 class LoginView(TokenObtainPairView):
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [PorIPThrottle, PorRFThrottle]
+    throttle_scope = "login"
+    orcamento_consultas = 2
 
     def post(self, request, *args, **kwargs):
         serializer = LoginSerializer(data=request.data)
@@ -44,13 +45,14 @@ class LoginView(TokenObtainPairView):
 
             dados_sme = SmeIntegracaoService.autentica(login, senha)
 
-            self._valida_perfil_signa(dados_sme)
+            perfis = PerfisService.registrar(login, dados_sme.get("perfis"))
+            self._valida_perfil_signa(perfis)
 
             user = self._criar_ou_atualizar_user(login, senha, dados_sme)
-            tokens = self._gerar_tokens(user)
+            tokens = self._gerar_tokens(user, perfis)
 
 
-            return Response(
+            response = Response(
                 {
                     "token": tokens["access"],
                     "name": user.name,
@@ -59,6 +61,8 @@ class LoginView(TokenObtainPairView):
                 },
                 status=status.HTTP_200_OK,
             )
+            definir_cookie_refresh(response, tokens["refresh"])
+            return response
 
         except AuthenticationError:
             return Response(
@@ -90,52 +94,28 @@ class LoginView(TokenObtainPairView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
         
-    def _valida_perfil_signa(self, dados_sme: dict):
-        perfis = dados_sme.get("perfis")
-
-        if not perfis or not isinstance(perfis, list):
-            raise PerfilNaoAutorizadoError()
-
-        perfis_normalizados = [p.upper() for p in perfis]
-        perfil_signa = env("GUIDE_PERFIL_SIGNA")
-        
-        if perfil_signa not in perfis_normalizados:
+    def _valida_perfil_signa(self, perfis: list[str]):
+        if not PerfisService.autorizado(perfis):
             raise PerfilNaoAutorizadoError()
 
 
     def _criar_ou_atualizar_user(self, login, senha, dados_sme):
-        """Cria ou atualiza usuário local"""
-
-        with transaction.atomic():
-            defaults = {
-                "name": dados_sme.get("nome"),
-                "email": dados_sme.get("email"),
-                "cpf": dados_sme.get("numeroDocumento"),
-                "last_login": timezone.now(),
-            }
-
-            user, created = User.objects.update_or_create(
-                username=login,
-                defaults=defaults,
-            )
-
-            if created or not user.check_password(senha):
-                user.set_password(senha)
-                user.save()
-
-            return user
+        """Cria ou atualiza usuário local (upsert em uma consulta; a senha só quando muda)"""
+        return EspelhoService.registrar_login(login, senha, dados_sme)
 
-    def _gerar_tokens(self, user):
+    def _gerar_tokens(self, user, perfis=()):
         refresh = RefreshToken.for_user(user)
 
         refresh["username"] = user.username
         refresh["name"] = user.name or ""
         refresh["email"] = user.email or ""
+        refresh["perfis"] = list(perfis)
 
         access = refresh.access_token
         access["username"] = user.username
         access["name"] = user.name or ""
         access["email"] = user.email or ""
+        access["perfis"] = list(perfis)
 
         return {
             "refresh": str(refresh),
@@ -13,6 +13,7 @@ class MeView(APIView):
     Retorna os dados do usuário autenticado (requer Bearer access token).
     """
     permission_classes = (permissions.IsAuthenticated,)
+    orcamento_consultas = 1
 
     def get(self, request, *args, **kwargs):
         serializer = UserMeSerializer(request.user)
@@ -1,4 +1,3 @@
-import environ
 import logging
 
 from django.db import transaction
@@ -10,98 +9,48 @@ from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
-from apps.helpers.utils import anonimizar_email
+from apps.helpers.idempotencia import idempotente
+from apps.helpers.throttles import PorIPThrottle, PorRFThrottle
 from apps.usuarios.api.serializers.senha_serializer import EsqueciMinhaSenhaSerializer, RedefinirSenhaSerializer, AtualizarSenhaSerializer
-from apps.helpers.exceptions import EmailNaoCadastrado, UserNotFoundError, SmeIntegracaoException
-from apps.usuarios.services.senha_service import SenhaService
+from apps.helpers.exceptions import SmeIntegracaoException
 from apps.usuarios.services.sme_integracao_service import SmeIntegracaoService
-from apps.usuarios.services.envia_email_service import EnviaEmailService
+from apps.usuarios.services.recuperacao_senha_service import RecuperacaoSenhaService
+from apps.usuarios.services.revogacao_service import RevogacaoService
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
-env = environ.Env()
 
 
 class EsqueciMinhaSenhaViewSet(APIView):
+    """
+    Pedido de recuperação de senha.
+
+    Só valida o RF e enfileira o pedido (RecuperacaoSenhaService); a busca
+    do usuário, a consulta ao SGP e o envio do e-mail ficam com o worker
+    (manage.py processar_recuperacoes_senha). A resposta é a mesma, e com o
+    mesmo custo, para RFs existentes ou não.
+    """
     permission_classes = [AllowAny]
+    throttle_classes = [PorIPThrottle, PorRFThrottle]
+    throttle_scope = "esqueci_senha"
+    orcamento_consultas = 1
 
-    MENSAGEM_EMAIL_NAO_CADASTRADO = (
-        "E-mail não encontrado! <br/>"
-        "Para resolver este problema, entre em contato com o administrador do sistema."
+    MENSAGEM_PEDIDO_RECEBIDO = (
+        "Se o RF informado estiver cadastrado, enviaremos um link de recuperação para o e-mail dele. <br/>"
+        "Verifique sua caixa de entrada ou spam."
     )
 
     def post(self, request):
         serializer = EsqueciMinhaSenhaSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        username = serializer.validated_data["username"]
-
         try:
-            logger.info("Fluxo de recuperação iniciado")
-
-            # 1. Verifica usuário local
-            user_local = User.objects.filter(username=username).first()
-            if not user_local:
-                logger.warning("RF %s não encontrado no banco local", username)
-                raise UserNotFoundError("Usuário não encontrado")
-
-            # 2. Consulta API coreSSO
-            try:
-                result = SmeIntegracaoService.informacao_usuario_sgp(username)
-                email = result.get("email")
-            except Exception:
-                logger.warning("Falha ao consultar API externa para RF %s", username)
-                email = None
-
-            # 3. Se API não retornou email → tenta usar banco local
-            if not email:
-                email = getattr(user_local, "email", None)
-
-            # 4. Ainda sem email → erro
-            if not email:
-                logger.warning("RF %s sem email cadastrado em nenhum lugar", username)
-                raise EmailNaoCadastrado(self.MENSAGEM_EMAIL_NAO_CADASTRADO)
-
-            # 5. gerar token + enviar email
-            return self._processar_envio_email(username, email)
-
-        except EmailNaoCadastrado as e:
-            return Response({"detail": str(e)}, status=400)
-
-        except UserNotFoundError as e:
-            return Response({"detail": str(e)}, status=404)
-
+            RecuperacaoSenhaService.solicitar(serializer.validated_data["username"])
         except Exception:
             logger.exception("Erro inesperado no fluxo de esqueci minha senha")
             return Response({"detail": "Erro interno no servidor."}, status=500)
 
-    def _processar_envio_email(self, username, email):
-        logger.info("Gerando token: %s", username)
-
-        token_data = SenhaService.gerar_token_para_reset(username, email)
-
-        link_reset = f"{env('AMBIENTE_URL')}/recuperar-senha/{token_data['uid']}/{token_data['token']}"
-
-        contexto = {
-            "nome_usuario": token_data.get("name"),
-            "link_reset": link_reset,
-            "aplicacao_url": env("AMBIENTE_URL"),
-        }
-
-        EnviaEmailService.enviar(
-            destinatario=email,
-            assunto="Redefinição de senha",
-            template_html="emails/reset_senha.html",
-            contexto=contexto,
-        )
-
-        return Response(
-            {
-                "detail": f"Enviamos um link de recuperação para {anonimizar_email(email)}. <br/>"
-                          "Verifique sua caixa de entrada ou spam.",
-            },
-            status=200,
-        )
+        return Response({"detail": self.MENSAGEM_PEDIDO_RECEBIDO}, status=status.HTTP_202_ACCEPTED)
 
 
 class RedefinirSenhaViewSet(APIView):
@@ -116,11 +65,14 @@ class RedefinirSenhaViewSet(APIView):
     1. Valida UID, token e senhas
     2. Redefine senha na SME (passo crítico)
     3. Tenta atualizar senha local (não crítico)
-    4. Retorna sucesso ao usuário
+    4. Revoga os tokens emitidos antes da troca
+    5. Retorna sucesso ao usuário
     """
+    orcamento_consultas = 2
 
     permission_classes = [permissions.AllowAny]
 
+    @idempotente
     def post(self, request, *args, **kwargs):
         serializer = RedefinirSenhaSerializer(data=request.data)
 
@@ -177,7 +129,9 @@ class RedefinirSenhaViewSet(APIView):
                 "para usuário ID=%s",
                 user.id,
             )
-            
+
+        RevogacaoService.revogar_tokens_do_usuario(user.id)
+
         logger.info(
             "Fluxo de redefinição de senha concluído para usuário ID=%s",
             user.id,
@@ -194,7 +148,9 @@ class RedefinirSenhaViewSet(APIView):
 
 class AtualizarSenhaViewSet(APIView):
     permission_classes = [IsAuthenticated]
+    orcamento_consultas = 2
 
+    @idempotente
     def post(self, request):
         serializer = AtualizarSenhaSerializer(data=request.data, context={"request": request})
 
@@ -212,6 +168,7 @@ class AtualizarSenhaViewSet(APIView):
 
                 user.set_password(nova_senha)
                 user.save(update_fields=["password"])
+                transaction.on_commit(lambda: RevogacaoService.revogar_tokens_do_usuario(user.id))
 
                 logger.info("Usuário ID %s alterou a senha com sucesso.", user.id)
 
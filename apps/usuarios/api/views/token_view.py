@@ -0,0 +1,141 @@
+import logging
+
+from django.conf import settings
+from django.http import Http404, HttpResponse, HttpResponseNotModified
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from apps.helpers.chaves_jwt import chaves_jwt
+from apps.usuarios.api.authentication import JWTRevogavelAuthentication
+from apps.usuarios.services.perfis_service import PerfisService
+from apps.usuarios.services.revogacao_service import RevogacaoService
+
+logger = logging.getLogger(__name__)
+
+
+def definir_cookie_refresh(response, refresh):
+    """ Envia o refresh token em cookie HttpOnly, restrito ao endpoint de renovação. """
+    response.set_cookie(
+        settings.REFRESH_COOKIE_NOME,
+        str(refresh),
+        max_age=int(jwt_settings.REFRESH_TOKEN_LIFETIME.total_seconds()),
+        path=reverse("token_refresh"),
+        secure=settings.REFRESH_COOKIE_SECURE,
+        httponly=True,
+        samesite=settings.REFRESH_COOKIE_SAMESITE,
+    )
+
+
+def remover_cookie_refresh(response):
+    response.delete_cookie(
+        settings.REFRESH_COOKIE_NOME,
+        path=reverse("token_refresh"),
+        samesite=settings.REFRESH_COOKIE_SAMESITE,
+    )
+
+
+class RenovarTokenView(APIView):
+    """
+    Emite um novo access token a partir do refresh token (cookie HttpOnly do
+    login ou campo ``refresh`` no corpo).
+
+    Não consulta o banco nem o CoreSSO: as claims (username, name, email)
+    vêm do próprio refresh token e a autorização do perfil SIGNA, dos perfis
+    guardados no login (PerfisService) ou, na falta deles, da claim
+    ``perfis`` do refresh token enquanto estiver dentro de PERFIS_SIGNA_TTL.
+
+    ``DELETE`` encerra a sessão: revoga o refresh token (e o access token do
+    header Authorization, se houver) e remove o cookie.
+    """
+
+    authentication_classes = []
+    permission_classes = [AllowAny]
+    orcamento_consultas = 0
+
+    MENSAGEM_SESSAO_EXPIRADA = "Sua sessão expirou. Entre novamente."
+
+    def post(self, request):
+        refresh = self._refresh_da_requisicao(request)
+        if refresh is None or RevogacaoService.revogado(refresh):
+            return self._sessao_expirada()
+
+        username = refresh.get("username")
+        perfis = PerfisService.vigentes(username, refresh.get("perfis"), refresh.get("iat"))
+        if not PerfisService.autorizado(perfis):
+            logger.info("Renovação sem perfil SIGNA vigente para %s", username)
+            return self._sessao_expirada()
+
+        access = refresh.access_token
+        access["perfis"] = list(perfis)
+        return Response({"token": str(access)}, status=status.HTTP_200_OK)
+
+    def delete(self, request):
+        refresh = self._refresh_da_requisicao(request)
+        if refresh is not None:
+            RevogacaoService.revogar_token(refresh)
+
+        access = self._access_da_requisicao(request)
+        if access is not None:
+            RevogacaoService.revogar_token(access)
+
+        response = Response(status=status.HTTP_204_NO_CONTENT)
+        remover_cookie_refresh(response)
+        return response
+
+    @staticmethod
+    def _refresh_da_requisicao(request):
+        token = request.COOKIES.get(settings.REFRESH_COOKIE_NOME) or request.data.get("refresh")
+        if not token:
+            return None
+        try:
+            return RefreshToken(token)
+        except TokenError as e:
+            logger.info("Refresh token recusado: %s", e)
+            return None
+
+    @staticmethod
+    def _access_da_requisicao(request):
+        autenticacao = JWTRevogavelAuthentication()
+        header = autenticacao.get_header(request)
+        try:
+            token = autenticacao.get_raw_token(header) if header else None
+            return AccessToken(token) if token else None
+        except (AuthenticationFailed, TokenError):
+            return None
+
+    def _sessao_expirada(self):
+        response = Response({"detail": self.MENSAGEM_SESSAO_EXPIRADA}, status=status.HTTP_401_UNAUTHORIZED)
+        remover_cookie_refresh(response)
+        return response
+
+
+class JwksView(APIView):
+    """
+    Chaves públicas (JWKS) para outros serviços validarem os tokens sem
+    chamar esta API. Só existe com JWT_ALGORITMO assimétrico; o corpo já vem
+    serializado de apps.helpers.chaves_jwt e pode ser guardado em cache HTTP.
+    """
+
+    authentication_classes = []
+    permission_classes = [AllowAny]
+    orcamento_consultas = 0
+
+    def get(self, request):
+        chaves = chaves_jwt()
+        if chaves is None:
+            raise Http404
+
+        if request.headers.get("If-None-Match") == chaves.etag:
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(chaves.jwks, content_type="application/json")
+        response["ETag"] = chaves.etag
+        response["Cache-Control"] = f"public, max-age={settings.JWKS_CACHE_MAX_AGE}"
+        return response
@@ -4,3 +4,18 @@ class UsuariosConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.usuarios'
     label = 'usuarios'
+
+    def ready(self):
+        from django.core import checks
+        from apps.helpers.cache_compartilhado import verificar_cache_compartilhado
+        from apps.helpers.chaves_jwt import instalar_backend_jwt, verificar_chaves_jwt
+        from apps.helpers.configuracao_sme import (
+            verificar_configuracao_sme,
+            verificar_configuracao_sme_deploy,
+        )
+
+        checks.register(verificar_configuracao_sme)
+        checks.register(verificar_configuracao_sme_deploy, deploy=True)
+        checks.register(verificar_chaves_jwt)
+        checks.register(verificar_cache_compartilhado)
+        instalar_backend_jwt()
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.usuarios.services.conciliacao_service import ConciliacaoService
+
+
+class Command(BaseCommand):
+    help = (
+        "Procura usuários locais com e-mail/CPF repetidos (após normalização) ou em branco. "
+        "Com --corrigir, mantém o valor no usuário de login mais recente e grava NULL nos demais."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--corrigir", action="store_true", help="Aplica as correções (padrão: só relata).")
+        parser.add_argument("--lote", type=int, default=500, help="Usuários por UPDATE ao corrigir.")
+
+    def handle(self, *args, **options):
+        if options["lote"] < 1:
+            raise CommandError("--lote deve ser maior que zero.")
+
+        resultado = ConciliacaoService.auditar()
+
+        for duplicidade in resultado.duplicidades:
+            liberados = ", ".join(username for _, username in duplicidade.liberados)
+            self.stdout.write(
+                f"{duplicidade.campo} {duplicidade.valor}: mantido em {duplicidade.mantido}, liberado em {liberados}"
+            )
+        for campo, vazios in resultado.vazios.items():
+            if vazios:
+                self.stdout.write(f"{campo} em branco: {', '.join(username for _, username in vazios)}")
+
+        total = sum(len(pks) for pks in resultado.liberados.values())
+        if not total:
+            self.stdout.write(self.style.SUCCESS("Nenhuma duplicidade encontrada."))
+            return
+        if not options["corrigir"]:
+            self.stdout.write(self.style.WARNING(f"{total} campos a liberar. Rode com --corrigir para aplicar."))
+            return
+
+        alterados = ConciliacaoService.corrigir(resultado, options["lote"])
+        self.stdout.write(self.style.SUCCESS(f"{alterados} campos liberados."))
@@ -0,0 +1,58 @@
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from prometheus_client import start_http_server
+
+from apps.usuarios.services.recuperacao_senha_service import RecuperacaoSenhaService
+
+
+class Command(BaseCommand):
+    help = (
+        "Worker da recuperação de senha: consulta o SGP e envia os links dos pedidos "
+        "feitos em /api/usuario/esqueci-senha. Roda até receber SIGTERM/SIGINT."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--uma-vez", action="store_true", help="Processa os pedidos disponíveis e sai.")
+        parser.add_argument("--intervalo", type=float, default=1.0, help="Espera (segundos) com a fila vazia.")
+        parser.add_argument("--lote", type=int, default=20, help="Pedidos reservados por vez.")
+        parser.add_argument(
+            "--porta-metricas",
+            type=int,
+            default=None,
+            help="Porta do /metrics do worker (padrão RECUPERACAO_SENHA_METRICAS_PORTA; 0 desliga).",
+        )
+
+    def handle(self, *args, **options):
+        if options["lote"] < 1 or options["intervalo"] <= 0:
+            raise CommandError("--lote e --intervalo devem ser maiores que zero.")
+
+        self._parar = False
+        if not options["uma_vez"]:
+            signal.signal(signal.SIGTERM, self._sinal)
+            signal.signal(signal.SIGINT, self._sinal)
+            porta = options["porta_metricas"]
+            if porta is None:
+                porta = settings.RECUPERACAO_SENHA_METRICAS_PORTA
+            if porta:
+                # Contadores e fila deste processo, coletados pelo Prometheus como um alvo à parte.
+                start_http_server(porta)
+
+        total = 0
+        while not self._parar:
+            close_old_connections()
+            reservados = RecuperacaoSenhaService.processar_pendentes(options["lote"])
+            total += reservados
+            RecuperacaoSenhaService.medir_fila()
+            if reservados < options["lote"]:
+                if options["uma_vez"]:
+                    break
+                time.sleep(options["intervalo"])
+
+        self.stdout.write(f"{total} pedidos processados.")
+
+    def _sinal(self, signum, frame):
+        self._parar = True
@@ -0,0 +1,57 @@
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.usuarios.services.provisionamento_service import ProvisionamentoService
+
+
+class Command(BaseCommand):
+    help = (
+        "Cria/atualiza os usuários locais a partir do CoreSSO para uma lista de RFs "
+        "(um por linha, em arquivo ou na entrada padrão), antes do primeiro login."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("arquivo", nargs="?", default="-", help="Arquivo com os RFs ou - para stdin.")
+        parser.add_argument(
+            "--concorrencia",
+            type=int,
+            default=8,
+            help="Consultas simultâneas ao SGP (limitadas a SME_INTEGRACAO_POOL_CONEXOES).",
+        )
+        parser.add_argument("--lote", type=int, default=500, help="Usuários gravados por bulk_create.")
+
+    def handle(self, *args, **options):
+        if options["concorrencia"] < 1 or options["lote"] < 1:
+            raise CommandError("--concorrencia e --lote devem ser maiores que zero.")
+        concorrencia = min(options["concorrencia"], settings.SME_INTEGRACAO_POOL_CONEXOES)
+
+        rfs = ProvisionamentoService.ler_rfs(self._linhas(options["arquivo"]))
+        if not rfs:
+            raise CommandError("Nenhum RF informado.")
+
+        inicio = time.perf_counter()
+        resultado = ProvisionamentoService.provisionar(rfs, concorrencia, options["lote"])
+        duracao = time.perf_counter() - inicio
+
+        for rf, erro in resultado.falhas:
+            self.stderr.write(f"{rf}: {erro}")
+        if resultado.nao_encontrados:
+            self.stderr.write(f"Não encontrados no CoreSSO: {', '.join(resultado.nao_encontrados)}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(rfs)} RFs em {duracao:.1f}s: {resultado.criados} criados, {resultado.atualizados} atualizados, "
+            f"{len(resultado.nao_encontrados)} não encontrados, {len(resultado.falhas)} falhas."
+        ))
+
+    @staticmethod
+    def _linhas(arquivo):
+        if arquivo == "-":
+            return sys.stdin.readlines()
+        try:
+            with open(arquivo, encoding="utf-8") as f:
+                return f.readlines()
+        except OSError as e:
+            raise CommandError(f"Não foi possível ler {arquivo}: {e}")
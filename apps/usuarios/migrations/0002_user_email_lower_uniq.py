@@ -0,0 +1,44 @@
+# Generated by Django 4.2.30 on 2026-10-19 18:09
+
+from django.db import migrations, models
+import django.db.models.functions.text
+from django.db.models import Count, F
+from django.db.models.functions import Lower
+
+
+def liberar_emails_repetidos(apps, schema_editor):
+    """
+    E-mails iguais a menos de maiúsculas impediriam a constraint: fica com o
+    e-mail o usuário de login mais recente (depois o de maior id) e os demais
+    ficam com NULL, voltando a ser preenchidos no próximo login.
+    """
+    User = apps.get_model('usuarios', 'User')
+    usuarios = User.objects.filter(email__isnull=False).annotate(email_minusculo=Lower('email'))
+    repetidos = (
+        usuarios.values('email_minusculo')
+        .annotate(total=Count('id'))
+        .filter(total__gt=1)
+        .values_list('email_minusculo', flat=True)
+    )
+    for email in list(repetidos):
+        ids = list(
+            usuarios.filter(email_minusculo=email)
+            .order_by(F('last_login').desc(nulls_last=True), '-pk')
+            .values_list('pk', flat=True)
+        )
+        User.objects.filter(pk__in=ids[1:]).update(email=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('usuarios', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(liberar_emails_repetidos, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='user',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('email'), name='usuarios_user_email_lower_uniq'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-19 19:37
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('usuarios', '0002_user_email_lower_uniq'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PedidoRecuperacaoSenha',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('username', models.CharField(max_length=150)),
+                ('criado_em', models.DateTimeField(auto_now_add=True)),
+                ('disponivel_em', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('tentativas', models.PositiveSmallIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Pedido de recuperação de senha',
+                'verbose_name_plural': 'Pedidos de recuperação de senha',
+            },
+        ),
+    ]
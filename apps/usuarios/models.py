@@ -1,6 +1,9 @@
 import uuid
 from django.db import models
+from django.db.models.functions import Lower
+from django.contrib.auth.hashers import identify_hasher
 from django.contrib.auth.models import AbstractUser
+from django.utils import timezone
 
 class User(AbstractUser):
     """
@@ -14,16 +17,56 @@ class User(AbstractUser):
     class Meta:
         verbose_name = "Usuário"
         verbose_name_plural = "Usuários"
+        constraints = [
+            models.UniqueConstraint(Lower("email"), name="usuarios_user_email_lower_uniq"),
+        ]
 
     def __str__(self):
         return self.username or self.email or str(self.uuid)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        user = super().from_db(db, field_names, values)
+        user._senha_codificada = user.__dict__.get("password")
+        return user
+
+    def set_unusable_password(self):
+        super().set_unusable_password()
+        self._senha_codificada = self.password
+
     def save(self, *args, **kwargs):
         """
         Sobrescreve o método save para garantir que a senha seja criptografada
         quando o usuário é criado via seed, script ou API personalizada.
+
+        Só é mantido como está o que já é um hash conhecido (identify_hasher),
+        a marca de set_unusable_password() ou o valor lido do banco. Qualquer
+        outro valor, mesmo começando com "!", é tratado como senha em texto puro.
         """
-        if self.password and not self.password.startswith(('pbkdf2_', 'bcrypt', 'argon2')):
-            self.set_password(self.password)
+        if self.password and self.password != getattr(self, "_senha_codificada", None):
+            try:
+                identify_hasher(self.password)
+            except ValueError:
+                self.set_password(self.password)
 
         super().save(*args, **kwargs)
+        self._senha_codificada = self.password
+
+
+class PedidoRecuperacaoSenha(models.Model):
+    """
+    Fila dos pedidos de "esqueci minha senha". A view só grava o pedido; o
+    comando processar_recuperacoes_senha consulta o SGP e envia o e-mail.
+    O pedido é apagado ao ser concluído.
+    """
+    username = models.CharField(max_length=150)
+    criado_em = models.DateTimeField(auto_now_add=True)
+    disponivel_em = models.DateTimeField(default=timezone.now, db_index=True)
+    tentativas = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Pedido de recuperação de senha"
+        verbose_name_plural = "Pedidos de recuperação de senha"
+
+    def __str__(self):
+        return self.username
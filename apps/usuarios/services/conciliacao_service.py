@@ -0,0 +1,143 @@
+import logging
+import re
+from dataclasses import dataclass, field
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F, Q
+from django.db.models.functions import Lower
+
+from apps.monitoramento.metricas import USUARIOS_CONFLITOS
+
+logger = logging.getLogger(__name__)
+User = get_user_model()
+
+
+def normalizar_email(email):
+    # Mesma forma do AlteracaoEmailSerializer: sem espaços e em minúsculas.
+    return (email or "").strip().lower() or None
+
+
+def normalizar_cpf(cpf):
+    return re.sub(r"\D", "", cpf or "") or None
+
+
+@dataclass
+class Duplicidade:
+    campo: str
+    valor: str
+    mantido: str
+    liberados: list = field(default_factory=list)
+
+
+@dataclass
+class ResultadoAuditoria:
+    duplicidades: list = field(default_factory=list)
+    vazios: dict = field(default_factory=lambda: {"email": [], "cpf": []})
+
+    @property
+    def liberados(self) -> dict:
+        """ pks cujo campo deve ir para NULL, por campo. """
+        liberados = {campo: [pk for pk, _ in vazios] for campo, vazios in self.vazios.items()}
+        for duplicidade in self.duplicidades:
+            liberados[duplicidade.campo].extend(pk for pk, _ in duplicidade.liberados)
+        return liberados
+
+
+class ConciliacaoService:
+    """
+    Conflitos de e-mail/CPF (únicos) entre espelhos locais do CoreSSO.
+
+    O CoreSSO é a fonte da verdade: quando o login de um RF traz um e-mail
+    ou CPF que ainda está em outro User, o dado daquele outro registro está
+    desatualizado e é liberado (NULL); ele volta a ser preenchido no próximo
+    login do dono. Na auditoria em lote, dentre os registros com o mesmo
+    valor normalizado, fica com ele o de login mais recente (depois o de
+    maior id); os demais são liberados.
+    """
+
+    @staticmethod
+    def liberar(login, email, cpf) -> int:
+        """
+        Libera o e-mail/CPF ocupados por outros usuários para ``login``.
+
+        Uma consulta pelos índices únicos (lower(email) e cpf), com os
+        registros travados; deve rodar na mesma transação da gravação.
+        Devolve quantos registros foram alterados.
+        """
+        filtro = Q()
+        if email:
+            filtro |= Q(email_minusculo=email.lower())
+        if cpf:
+            filtro |= Q(cpf=cpf)
+        if not filtro:
+            return 0
+
+        conflitantes = list(
+            User.objects.select_for_update()
+            .alias(email_minusculo=Lower("email"))
+            .filter(filtro)
+            .exclude(username=login)
+            .values_list("pk", "username", "email", "cpf")
+        )
+        liberados = {"email": [], "cpf": []}
+        for pk, username, email_atual, cpf_atual in conflitantes:
+            if email and email_atual and email_atual.lower() == email.lower():
+                liberados["email"].append(pk)
+            if cpf and cpf_atual == cpf:
+                liberados["cpf"].append(pk)
+            logger.warning("E-mail/CPF do usuário %s liberado para o login de %s.", username, login)
+
+        for campo, pks in liberados.items():
+            if pks:
+                User.objects.filter(pk__in=pks).update(**{campo: None})
+                USUARIOS_CONFLITOS.labels(campo, "login").inc(len(pks))
+        return len(conflitantes)
+
+    @staticmethod
+    def auditar() -> ResultadoAuditoria:
+        """
+        Procura e-mails/CPFs repetidos após normalização (espaços em volta do
+        e-mail, maiúsculas, CPF com pontuação) e valores em branco — casos
+        que as constraints únicas não barram, mas que fazem um mesmo dado do
+        CoreSSO corresponder a mais de um usuário.
+        """
+        resultado = ResultadoAuditoria()
+        grupos = {"email": {}, "cpf": {}}
+        usuarios = (
+            User.objects.filter(Q(email__isnull=False) | Q(cpf__isnull=False))
+            .order_by(F("last_login").desc(nulls_last=True), "-pk")
+            .values_list("pk", "username", "email", "cpf")
+        )
+        for pk, username, email, cpf in usuarios.iterator(chunk_size=2000):
+            normalizados = {
+                "email": (email, (normalizar_email(email) or "").lower()),
+                "cpf": (cpf, normalizar_cpf(cpf)),
+            }
+            for campo, (atual, normalizado) in normalizados.items():
+                if atual is None:
+                    continue
+                if not normalizado:
+                    resultado.vazios[campo].append((pk, username))
+                elif normalizado in grupos[campo]:
+                    grupos[campo][normalizado].liberados.append((pk, username))
+                else:
+                    grupos[campo][normalizado] = Duplicidade(campo, normalizado, username)
+
+        resultado.duplicidades = [
+            duplicidade for grupo in grupos.values() for duplicidade in grupo.values() if duplicidade.liberados
+        ]
+        return resultado
+
+    @staticmethod
+    def corrigir(resultado: ResultadoAuditoria, tamanho_lote=500) -> int:
+        """ Grava NULL nos campos liberados pela auditoria, em lotes, numa transação. """
+        total = 0
+        with transaction.atomic():
+            for campo, pks in resultado.liberados.items():
+                iterador = iter(pks)
+                while lote := list(islice(iterador, tamanho_lote)):
+                    total += User.objects.filter(pk__in=lote).update(**{campo: None})
+                USUARIOS_CONFLITOS.labels(campo, "auditoria").inc(len(pks))
+        return total
@@ -1,9 +1,12 @@
+import time
 import logging
 
 from django.core.exceptions import ValidationError
 from django.template.loader import render_to_string
 from django.core.mail import EmailMessage, BadHeaderError
 
+from apps.monitoramento.metricas import EMAILS_DURACAO, EMAILS_ENVIADOS
+
 logger = logging.getLogger(__name__)
 
 
@@ -25,6 +28,8 @@ class EnviaEmailService:
     def enviar(cls, destinatario, assunto, template_html, contexto):
         """ Envia e-mail HTML sem necessidade de instanciar a classe. """
 
+        inicio = time.perf_counter()
+        resultado = "erro"
         try:
             cls.validar(destinatario, assunto)
 
@@ -37,6 +42,7 @@ class EnviaEmailService:
             )
             email.content_subtype = 'html'
             email.send()
+            resultado = "sucesso"
 
             logger.info(
                 f"E-mail enviado com sucesso para {destinatario} usando o template '{template_html}'."
@@ -48,4 +54,8 @@ class EnviaEmailService:
 
         except Exception as e:
             logger.exception("Erro inesperado ao enviar e-mail.")
-            raise RuntimeError("Erro inesperado ao enviar e-mail.") from e
\ No newline at end of file
+            raise RuntimeError("Erro inesperado ao enviar e-mail.") from e
+
+        finally:
+            EMAILS_DURACAO.observe(time.perf_counter() - inicio)
+            EMAILS_ENVIADOS.labels(template_html, resultado).inc()
\ No newline at end of file
@@ -0,0 +1,104 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import check_password, make_password
+from contextlib import nullcontext
+
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+
+from apps.monitoramento.instrumentacao import medir_fase
+from apps.monitoramento.orcamento import fora_do_orcamento
+from apps.usuarios.services.conciliacao_service import ConciliacaoService, normalizar_cpf, normalizar_email
+
+User = get_user_model()
+
+CAMPOS_DO_LOGIN = ("name", "email", "cpf", "last_login")
+# Vazios no CoreSSO não apagam o valor gravado; o valor final volta no RETURNING.
+CAMPOS_PRESERVADOS = ("name", "email", "cpf")
+CAMPOS_RETORNADOS = ("id", "password", "is_active", "name", "email", "cpf")
+
+
+class EspelhoService:
+    """
+    Espelho local do usuário do CoreSSO, gravado a cada login.
+
+    Um único ``INSERT ... ON CONFLICT (username) DO UPDATE ... RETURNING``
+    grava nome, e-mail, CPF (os que vierem preenchidos) e último login (só
+    essas colunas) e devolve o hash da senha guardada. A senha só é regravada, num UPDATE à parte,
+    quando não confere com a informada (primeiro login, senha trocada no
+    CoreSSO ou hash a atualizar). Para quem volta com a mesma senha, o
+    login custa uma consulta.
+
+    Se o e-mail/CPF vindos do CoreSSO ainda estiverem em outro User, o
+    INSERT viola a unicidade; só então, numa transação, o conflito é
+    procurado e resolvido (``ConciliacaoService.liberar``) e o upsert
+    repetido (fora do orçamento de consultas da view). O caminho comum não
+    paga a consulta de conflito.
+    """
+
+    @classmethod
+    def registrar_login(cls, login, senha, dados_sme) -> User:
+        valores = {
+            "username": login,
+            "name": dados_sme.get("nome") or "",
+            "email": normalizar_email(dados_sme.get("email")),
+            "cpf": normalizar_cpf(dados_sme.get("numeroDocumento")),
+            "last_login": timezone.now(),
+        }
+        novo = User(**valores)
+        novo.set_unusable_password()
+        try:
+            # Dentro de uma transação, o erro do INSERT precisa de um savepoint
+            # para não invalidá-la; em autocommit, a instrução basta.
+            with transaction.atomic() if connection.in_atomic_block else nullcontext():
+                gravados = cls._upsert(novo)
+        except IntegrityError:
+            with fora_do_orcamento(), transaction.atomic():
+                if not ConciliacaoService.liberar(login, valores["email"], valores["cpf"]):
+                    raise
+                gravados = cls._upsert(novo)
+        retornados = dict(zip(CAMPOS_RETORNADOS, gravados))
+        retornados["is_active"] = bool(retornados["is_active"])
+        senha_guardada = retornados["password"]
+        user = cls._instancia(valores, **retornados)
+
+        with medir_fase("senha"):
+            desatualizada = []
+            if not check_password(senha, senha_guardada, setter=desatualizada.append) or desatualizada:
+                user.password = make_password(senha)
+                User.objects.filter(pk=user.pk).update(password=user.password)
+
+        return user
+
+    @staticmethod
+    def _upsert(user):
+        meta = User._meta
+        qn = connection.ops.quote_name
+        campos = [f for f in meta.concrete_fields if not f.primary_key]
+        colunas = ", ".join(qn(f.column) for f in campos)
+        marcadores = ", ".join(["%s"] * len(campos))
+        tabela = qn(meta.db_table)
+        atualizadas = []
+        for nome in CAMPOS_DO_LOGIN:
+            coluna = qn(meta.get_field(nome).column)
+            if nome in CAMPOS_PRESERVADOS:
+                atualizadas.append(f"{coluna} = COALESCE(NULLIF(EXCLUDED.{coluna}, ''), {tabela}.{coluna})")
+            else:
+                atualizadas.append(f"{coluna} = EXCLUDED.{coluna}")
+        retornadas = ", ".join(qn(meta.get_field(nome).column) for nome in CAMPOS_RETORNADOS)
+        sql = (
+            f"INSERT INTO {tabela} ({colunas}) VALUES ({marcadores}) "
+            f"ON CONFLICT ({qn(meta.get_field('username').column)}) DO UPDATE SET {', '.join(atualizadas)} "
+            f"RETURNING {retornadas}"
+        )
+        parametros = [f.get_db_prep_save(f.pre_save(user, add=True), connection) for f in campos]
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, parametros)
+            return cursor.fetchone()
+
+    @staticmethod
+    def _instancia(valores, **retornados) -> User:
+        """ User com os campos conhecidos; os demais ficam adiados (carregados se acessados). """
+        conhecidos = {**valores, **retornados}
+        nomes = [f.attname for f in User._meta.concrete_fields if f.attname in conhecidos]
+        return User.from_db(connection.alias, nomes, [conhecidos[nome] for nome in nomes])
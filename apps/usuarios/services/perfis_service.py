@@ -0,0 +1,54 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.helpers.configuracao_sme import configuracao_sme
+
+
+class PerfisService:
+    """
+    Perfis do CoreSSO de cada usuário, guardados no login.
+
+    A decisão de autorização (o perfil SIGNA está entre os perfis do usuário)
+    é refeita a partir desta cópia local, por PERFIS_SIGNA_TTL segundos, sem
+    consultar o CoreSSO de novo. A chave é o RF: um login recusado por perfil
+    também sobrescreve a cópia, revogando a autorização anterior.
+    """
+
+    CHAVE = "usuarios:perfis:{}"
+
+    @staticmethod
+    def normalizar(perfis) -> list[str]:
+        if not perfis or not isinstance(perfis, list):
+            return []
+        return sorted({str(perfil).strip().upper() for perfil in perfis if perfil})
+
+    @classmethod
+    def registrar(cls, username: str, perfis) -> list[str]:
+        """ Normaliza e guarda os perfis retornados pelo CoreSSO no login. """
+        normalizados = cls.normalizar(perfis)
+        cache.set(cls.CHAVE.format(username), normalizados, settings.PERFIS_SIGNA_TTL)
+        return normalizados
+
+    @classmethod
+    def obter(cls, username: str) -> list[str] | None:
+        """ Perfis guardados no último login, ou None se expirados/inexistentes. """
+        return cache.get(cls.CHAVE.format(username))
+
+    @classmethod
+    def vigentes(cls, username: str, perfis_do_token, emitido_em) -> list[str] | None:
+        """
+        Perfis guardados no login ou, sem eles (cache expirado ou de outro
+        processo), os do token enquanto o login tiver menos de PERFIS_SIGNA_TTL.
+        """
+        perfis = cls.obter(username)
+        if perfis is None and perfis_do_token is not None and emitido_em:
+            if time.time() - emitido_em < settings.PERFIS_SIGNA_TTL:
+                perfis = perfis_do_token
+        return perfis
+
+    @staticmethod
+    def autorizado(perfis) -> bool:
+        perfil_signa = configuracao_sme().perfil_signa.upper()
+        return bool(perfil_signa) and perfil_signa in (perfis or ())
@@ -0,0 +1,127 @@
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+
+from apps.helpers.exceptions import SmeIntegracaoException
+from apps.usuarios.services.conciliacao_service import normalizar_cpf, normalizar_email
+from apps.usuarios.services.sme_integracao_service import SmeIntegracaoService
+
+logger = logging.getLogger(__name__)
+User = get_user_model()
+
+CAMPOS_ATUALIZADOS = ["name", "email", "cpf"]
+
+
+@dataclass
+class ResultadoProvisionamento:
+    criados: int = 0
+    atualizados: int = 0
+    nao_encontrados: list = field(default_factory=list)
+    falhas: list = field(default_factory=list)
+
+
+class ProvisionamentoService:
+    """
+    Cria/atualiza em lote os espelhos locais (User) a partir dos dados do
+    CoreSSO, antes do primeiro login.
+
+    As consultas ao SGP rodam em paralelo, limitadas a ``concorrencia``
+    threads (só HTTP; o banco é usado apenas pela thread principal); as
+    gravações são ``bulk_create(update_conflicts=True)`` por lote de
+    ``tamanho_lote``. Usuários novos ficam com senha inutilizável, definida
+    no primeiro login; os existentes mantêm a senha, e também o nome, e-mail
+    e CPF que o CoreSSO não trouxer.
+    """
+
+    @staticmethod
+    def ler_rfs(linhas) -> list[str]:
+        """ RFs (só dígitos), sem repetição, na ordem; ignora linhas vazias e comentários (#). """
+        rfs = {}
+        for linha in linhas:
+            linha = linha.split("#", 1)[0].strip()
+            rf = re.sub(r"\D", "", linha)
+            if rf:
+                rfs.setdefault(rf, None)
+        return list(rfs)
+
+    @classmethod
+    def provisionar(cls, rfs, concorrencia=8, tamanho_lote=500) -> ResultadoProvisionamento:
+        resultado = ResultadoProvisionamento()
+        with ThreadPoolExecutor(max_workers=concorrencia, thread_name_prefix="provisionamento") as executor:
+            consultas = executor.map(cls._consultar, rfs)
+            while lote := list(islice(consultas, tamanho_lote)):
+                usuarios = []
+                for rf, dados, erro in lote:
+                    if dados is not None:
+                        usuarios.append(cls._usuario(rf, dados))
+                    elif isinstance(erro, SmeIntegracaoException):
+                        resultado.nao_encontrados.append(rf)
+                    else:
+                        resultado.falhas.append((rf, str(erro)))
+                cls._gravar(usuarios, resultado)
+        return resultado
+
+    @staticmethod
+    def _consultar(rf):
+        try:
+            return rf, SmeIntegracaoService.informacao_usuario_sgp(rf), None
+        except Exception as e:
+            return rf, None, e
+
+    @staticmethod
+    def _usuario(rf, dados) -> User:
+        usuario = User(
+            username=rf,
+            name=(dados.get("nome") or "")[:150],
+            email=normalizar_email(dados.get("email")),
+            cpf=normalizar_cpf(dados.get("cpf") or dados.get("numeroDocumento")),
+        )
+        usuario.set_unusable_password()
+        return usuario
+
+    @classmethod
+    def _gravar(cls, usuarios, resultado):
+        if not usuarios:
+            return
+        existentes = set(
+            User.objects.filter(username__in=[u.username for u in usuarios]).values_list("username", flat=True)
+        )
+        try:
+            with transaction.atomic():
+                cls._upsert(usuarios)
+        except IntegrityError:
+            # E-mail/CPF já usado por outro usuário: grava um a um para isolar o conflito.
+            gravados = []
+            for usuario in usuarios:
+                try:
+                    with transaction.atomic():
+                        cls._upsert([usuario])
+                    gravados.append(usuario)
+                except IntegrityError as e:
+                    logger.warning("Conflito ao provisionar RF %s: %s", usuario.username, e)
+                    resultado.falhas.append((usuario.username, "e-mail ou CPF já usado por outro usuário"))
+            usuarios = gravados
+
+        atualizados = sum(1 for u in usuarios if u.username in existentes)
+        resultado.atualizados += atualizados
+        resultado.criados += len(usuarios) - atualizados
+
+    @staticmethod
+    def _upsert(usuarios):
+        # Um bulk_create por combinação de campos presentes: o que veio vazio não sobrescreve o gravado.
+        grupos = {}
+        for usuario in usuarios:
+            campos = tuple(campo for campo in CAMPOS_ATUALIZADOS if getattr(usuario, campo))
+            grupos.setdefault(campos, []).append(usuario)
+        for campos, grupo in grupos.items():
+            if campos:
+                User.objects.bulk_create(
+                    grupo, update_conflicts=True, unique_fields=["username"], update_fields=list(campos)
+                )
+            else:
+                User.objects.bulk_create(grupo, ignore_conflicts=True)
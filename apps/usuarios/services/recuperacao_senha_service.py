@@ -0,0 +1,141 @@
+import logging
+from datetime import timedelta
+
+import environ
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from apps.helpers.exceptions import SmeIntegracaoException
+from apps.monitoramento.metricas import RECUPERACOES_SENHA, RECUPERACOES_SENHA_PENDENTES
+from apps.usuarios.models import PedidoRecuperacaoSenha
+from apps.usuarios.services.envia_email_service import EnviaEmailService
+from apps.usuarios.services.senha_service import SenhaService
+from apps.usuarios.services.sme_integracao_service import SmeIntegracaoService
+
+logger = logging.getLogger(__name__)
+User = get_user_model()
+env = environ.Env()
+
+
+class RecuperacaoSenhaService:
+    """
+    Recuperação de senha em duas etapas:
+
+    - ``solicitar``: chamado pela view, só grava o pedido (uma consulta,
+      exista ou não o RF);
+    - ``processar_pendentes``: chamado pelo worker, reserva os pedidos
+      disponíveis e, para cada um, busca o usuário local, o e-mail no SGP
+      (ou o local, se o SGP falhar) e envia o link.
+
+    A reserva adia ``disponivel_em`` por RECUPERACAO_SENHA_TRAVA segundos:
+    workers concorrentes não pegam o mesmo pedido e um worker que morre no
+    meio o devolve à fila quando a trava vence. Falhas transitórias (SGP
+    fora do ar sem e-mail local, SMTP) voltam à fila com espera exponencial
+    a partir de RECUPERACAO_SENHA_ESPERA, até RECUPERACAO_SENHA_TENTATIVAS.
+    """
+
+    @staticmethod
+    def solicitar(username):
+        PedidoRecuperacaoSenha.objects.create(username=username)
+
+    @classmethod
+    def processar_pendentes(cls, limite=20) -> int:
+        """ Processa até ``limite`` pedidos disponíveis; devolve quantos foram reservados. """
+        pedidos = cls._reservar(limite)
+        processados = set()
+        for pedido in pedidos:
+            if pedido.username in processados:
+                # Pedidos repetidos do mesmo RF no lote: um e-mail basta.
+                pedido.delete()
+                continue
+            processados.add(pedido.username)
+            cls._processar_pedido(pedido)
+        return len(pedidos)
+
+    @staticmethod
+    def medir_fila() -> int:
+        """ Atualiza a métrica de pedidos na fila (inclui os reservados e os em espera). """
+        pendentes = PedidoRecuperacaoSenha.objects.count()
+        RECUPERACOES_SENHA_PENDENTES.set(pendentes)
+        return pendentes
+
+    @staticmethod
+    def _reservar(limite):
+        agora = timezone.now()
+        with transaction.atomic():
+            pedidos = list(
+                PedidoRecuperacaoSenha.objects.select_for_update(skip_locked=True)
+                .filter(disponivel_em__lte=agora)
+                .order_by("disponivel_em")[:limite]
+            )
+            if pedidos:
+                PedidoRecuperacaoSenha.objects.filter(pk__in=[p.pk for p in pedidos]).update(
+                    disponivel_em=agora + timedelta(seconds=settings.RECUPERACAO_SENHA_TRAVA),
+                    tentativas=F("tentativas") + 1,
+                )
+        return pedidos
+
+    @classmethod
+    def _processar_pedido(cls, pedido):
+        tentativas = pedido.tentativas + 1
+        try:
+            resultado = cls.processar(pedido.username)
+        except Exception:
+            if tentativas >= settings.RECUPERACAO_SENHA_TENTATIVAS:
+                logger.exception("Recuperação de senha do RF %s descartada após %s tentativas", pedido.username, tentativas)
+                pedido.delete()
+                RECUPERACOES_SENHA.labels("descartado").inc()
+                return
+            espera = settings.RECUPERACAO_SENHA_ESPERA * 2 ** (tentativas - 1)
+            logger.warning(
+                "Falha na recuperação de senha do RF %s; nova tentativa em %ss", pedido.username, espera, exc_info=True
+            )
+            PedidoRecuperacaoSenha.objects.filter(pk=pedido.pk).update(
+                disponivel_em=timezone.now() + timedelta(seconds=espera)
+            )
+            RECUPERACOES_SENHA.labels("nova_tentativa").inc()
+            return
+
+        pedido.delete()
+        RECUPERACOES_SENHA.labels(resultado).inc()
+
+    @staticmethod
+    def processar(username) -> str:
+        """ Envia o link de redefinição para ``username``; devolve o resultado para a métrica. """
+        user = User.objects.filter(username=username).first()
+        if not user:
+            logger.warning("RF %s não encontrado no banco local", username)
+            return "sem_usuario"
+
+        email, erro_sgp = None, None
+        try:
+            email = SmeIntegracaoService.informacao_usuario_sgp(username).get("email")
+        except SmeIntegracaoException:
+            logger.warning("RF %s sem dados no SGP", username)
+        except Exception as e:
+            logger.warning("Falha ao consultar API externa para RF %s", username)
+            erro_sgp = e
+
+        email = email or user.email
+        if not email:
+            if erro_sgp is not None:
+                # Sem e-mail local, só o SGP pode dizer para onde enviar: tenta de novo depois.
+                raise erro_sgp
+            logger.warning("RF %s sem email cadastrado em nenhum lugar", username)
+            return "sem_email"
+
+        uid, token = SenhaService.gerar_token_para_usuario(user)
+        EnviaEmailService.enviar(
+            destinatario=email,
+            assunto="Redefinição de senha",
+            template_html="emails/reset_senha.html",
+            contexto={
+                "nome_usuario": user.name.split(" ")[0],
+                "link_reset": f"{env('AMBIENTE_URL')}/recuperar-senha/{uid}/{token}",
+                "aplicacao_url": env("AMBIENTE_URL"),
+            },
+        )
+        return "enviado"
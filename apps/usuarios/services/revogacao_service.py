@@ -0,0 +1,122 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+
+class RevogacaoService:
+    """
+    Revogação de tokens JWT sem consulta ao banco.
+
+    Cada revogação é uma chave própria no cache compartilhado, com TTL:
+    - por ``jti``: um token específico (logout), até o seu ``exp``;
+    - por usuário: tokens emitidos antes de um instante ("válidos após"), por
+      REFRESH_TOKEN_LIFETIME, depois do qual nenhum deles é aceito de qualquer forma.
+
+    Revogar é uma escrita da chave mais um ``incr`` atômico do contador de
+    versão: não há leitura-alteração-escrita, nem trava, nem custo que cresça
+    com o número de tokens revogados.
+
+    Cada processo guarda as respostas das consultas que já fez e só confere o
+    contador a cada REVOGACAO_SINCRONIZACAO segundos (0 confere a cada
+    requisição). Quando ele muda, as respostas guardadas são descartadas e
+    relidas sob demanda, uma consulta ao cache por token. Uma revogação feita
+    em outro worker passa a valer aqui em até REVOGACAO_SINCRONIZACAO segundos.
+    """
+
+    CHAVE_JTI = "tokens:revogados:jti:{}"
+    CHAVE_USUARIO = "tokens:revogados:usuario:{}"
+    CHAVE_VERSAO = "tokens:revogacoes:versao"
+    # Respostas guardadas por processo; acima disso a cópia local recomeça vazia.
+    LIMITE_LOCAL = 10000
+
+    _lock = threading.Lock()
+    _versao = None
+    _sincronizado_em = None
+    _jtis = {}
+    _usuarios = {}
+
+    @classmethod
+    def revogar_token(cls, token) -> None:
+        """ Revoga um token (access ou refresh) pelo jti, até ele expirar. """
+        restante = int(token["exp"] - time.time()) + 1
+        if restante > 0:
+            cache.set(cls.CHAVE_JTI.format(token[jwt_settings.JTI_CLAIM]), True, timeout=restante)
+        cls._nova_versao()
+
+    @classmethod
+    def revogar_tokens_do_usuario(cls, user_id) -> None:
+        """
+        Revoga os tokens do usuário emitidos até agora (troca de senha).
+
+        O ``iat`` do simplejwt é em segundos inteiros: o corte também é, e só
+        tokens de segundos anteriores são recusados. Um token emitido logo
+        após a troca, no mesmo segundo, continua válido. O preço é que um
+        emitido antes dela, nesse mesmo segundo, também continua.
+        """
+        duracao = int(jwt_settings.REFRESH_TOKEN_LIFETIME.total_seconds())
+        cache.set(cls.CHAVE_USUARIO.format(user_id), int(time.time()), timeout=duracao)
+        cls._nova_versao()
+
+    @classmethod
+    def revogado(cls, token) -> bool:
+        cls._sincronizar()
+        jtis, usuarios = cls._jtis, cls._usuarios
+        jti = token.get(jwt_settings.JTI_CLAIM)
+        user_id = str(token.get(jwt_settings.USER_ID_CLAIM))
+        if jti in jtis and user_id in usuarios:
+            jti_revogado, corte = jtis[jti], usuarios[user_id]
+        else:
+            jti_revogado, corte = cls._consultar(jti, user_id, jtis, usuarios)
+        return jti_revogado or (corte is not None and int(token.get("iat", 0)) < corte)
+
+    @classmethod
+    def descartar_estado_local(cls) -> None:
+        """ Esquece as respostas guardadas; a próxima verificação relê o cache. """
+        with cls._lock:
+            cls._versao = None
+            cls._sincronizado_em = None
+            cls._jtis = {}
+            cls._usuarios = {}
+
+    @classmethod
+    def _nova_versao(cls) -> None:
+        # add + incr: o contador nasce uma vez e cada revogação o avança atomicamente.
+        cache.add(cls.CHAVE_VERSAO, 0, timeout=None)
+        try:
+            cache.incr(cls.CHAVE_VERSAO)
+        except ValueError:
+            # Chave removida entre o add e o incr (ex.: cache.clear); basta que a versão mude.
+            cache.add(cls.CHAVE_VERSAO, 1, timeout=None)
+        # As próprias revogações valem neste processo imediatamente.
+        cls.descartar_estado_local()
+
+    @classmethod
+    def _sincronizar(cls) -> None:
+        agora = time.monotonic()
+        if cls._sincronizado_em is not None and agora - cls._sincronizado_em < settings.REVOGACAO_SINCRONIZACAO:
+            return
+        with cls._lock:
+            versao = cache.get(cls.CHAVE_VERSAO)
+            if versao != cls._versao:
+                # Dicionários novos, trocados de uma vez: leituras concorrentes não veem estado parcial.
+                cls._jtis = {}
+                cls._usuarios = {}
+                cls._versao = versao
+            cls._sincronizado_em = agora
+
+    @classmethod
+    def _consultar(cls, jti, user_id, jtis, usuarios):
+        chave_jti, chave_usuario = cls.CHAVE_JTI.format(jti), cls.CHAVE_USUARIO.format(user_id)
+        valores = cache.get_many([chave_jti, chave_usuario])
+        jti_revogado, corte = chave_jti in valores, valores.get(chave_usuario)
+        with cls._lock:
+            # Se a versão mudou durante a consulta, a resposta pode ser anterior a ela: não é guardada.
+            if cls._jtis is jtis and cls._usuarios is usuarios:
+                if len(jtis) >= cls.LIMITE_LOCAL or len(usuarios) >= cls.LIMITE_LOCAL:
+                    jtis, usuarios = cls._jtis, cls._usuarios = {}, {}
+                jtis[jti] = jti_revogado
+                usuarios[user_id] = corte
+        return jti_revogado, corte
@@ -1,5 +1,4 @@
 import logging
-import environ
 import requests
 
 from apps.helpers.exceptions import (
@@ -10,8 +9,11 @@ from apps.helpers.exceptions import (
 
 from rest_framework import status
 
+from apps.helpers.cliente_sme import sessao_sme
+from apps.helpers.configuracao_sme import configuracao_sme
+from apps.monitoramento.instrumentacao import medir_upstream
+
 
-env = environ.Env()
 logger = logging.getLogger(__name__)
 
 class SmeIntegracaoService:
@@ -19,29 +21,31 @@ class SmeIntegracaoService:
 
     DEFAULT_HEADERS = {
         "accept": "application/json",
-        "x-api-eol-key": env("SME_INTEGRACAO_TOKEN", default=""),
     }
     TIMEOUT = 30
 
     @classmethod
     def autentica(cls, login: str, senha: str) -> dict:
+        config = configuracao_sme()
         payload = {
             "usuario": login,
             "senha": senha,
-            "codigoSistema": env('CODIGO_SISTEMA_SIGNA', default='')
+            "codigoSistema": config.codigo_sistema
         }
 
-        url = f"{env('SME_INTEGRACAO_URL', default='')}/v1/autenticacao/externa"
+        url = f"{config.url}/v1/autenticacao/externa"
 
         logger.info("Autenticando no CoreSSO: %s", login)
 
         try:
-            response = requests.post(
-                url,
-                json=payload,
-                headers=cls.DEFAULT_HEADERS,
-                timeout=cls.TIMEOUT,
-            )
+            with medir_upstream("/v1/autenticacao/externa") as chamada:
+                response = sessao_sme().post(
+                    url,
+                    json=payload,
+                    headers=config.cabecalhos(cls.DEFAULT_HEADERS),
+                    timeout=cls.TIMEOUT,
+                )
+                chamada.status = response.status_code
 
             if response.status_code == 401:
                 raise AuthenticationError("Credenciais inválidas")
@@ -69,8 +73,11 @@ class SmeIntegracaoService:
     def informacao_usuario_sgp(cls, username):
         logger.info(f"Consultando dados na API externa para: {username}")
         try:
-            url = f"{env('SME_INTEGRACAO_URL', default='')}/AutenticacaoSgp/{username}/dados"  
-            response = requests.get(url, headers=cls.DEFAULT_HEADERS, timeout=10)
+            config = configuracao_sme()
+            url = f"{config.url}/AutenticacaoSgp/{username}/dados"
+            with medir_upstream("/AutenticacaoSgp/{}/dados") as chamada:
+                response = sessao_sme().get(url, headers=config.cabecalhos(cls.DEFAULT_HEADERS), timeout=10)
+                chamada.status = response.status_code
 
             if response.status_code == status.HTTP_200_OK:
                 return response.json()
@@ -118,9 +125,12 @@ class SmeIntegracaoService:
 
         try:
 
-            url = f"{env('SME_INTEGRACAO_URL', default='')}/AutenticacaoSgp/AlterarSenha"  
+            config = configuracao_sme()
+            url = f"{config.url}/AutenticacaoSgp/AlterarSenha"
 
-            response = requests.post(url, data=data, headers=cls.DEFAULT_HEADERS)
+            with medir_upstream("/AutenticacaoSgp/AlterarSenha") as chamada:
+                response = sessao_sme().post(url, data=data, headers=config.cabecalhos(cls.DEFAULT_HEADERS))
+                chamada.status = response.status_code
 
             if response.status_code == status.HTTP_200_OK:
                 result = "OK"
@@ -165,9 +175,12 @@ class SmeIntegracaoService:
 
         try:
 
-            url = f"{env('SME_INTEGRACAO_URL', default='')}/AutenticacaoSgp/AlterarEmail"
+            config = configuracao_sme()
+            url = f"{config.url}/AutenticacaoSgp/AlterarEmail"
 
-            response = requests.post(url, data=data, headers=cls.DEFAULT_HEADERS)
+            with medir_upstream("/AutenticacaoSgp/AlterarEmail") as chamada:
+                response = sessao_sme().post(url, data=data, headers=config.cabecalhos(cls.DEFAULT_HEADERS))
+                chamada.status = response.status_code
 
             if response.status_code == status.HTTP_200_OK:
                 result = "OK"
@@ -195,15 +208,16 @@ class SmeIntegracaoService:
         )
 
         try:
-            url = (
-                f"{env('SME_INTEGRACAO_URL', default='')}/funcionarios/cargo/{registro_funcional}"
-            )
-
-            response = requests.get(
-                url,
-                headers=cls.DEFAULT_HEADERS,
-                timeout=cls.TIMEOUT,
-            )
+            config = configuracao_sme()
+            url = f"{config.url}/funcionarios/cargo/{registro_funcional}"
+
+            with medir_upstream("/funcionarios/cargo/{}") as chamada:
+                response = sessao_sme().get(
+                    url,
+                    headers=config.cabecalhos(cls.DEFAULT_HEADERS),
+                    timeout=cls.TIMEOUT,
+                )
+                chamada.status = response.status_code
 
             if response.status_code == status.HTTP_200_OK:
                 return response.json()
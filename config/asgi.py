@@ -3,14 +3,125 @@ ASGI config for config project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Uso (worker assíncrono do uvicorn sob o gunicorn):
+    SERVIDOR_MODO=asgi ./entrypoint.sh
+    gunicorn config.asgi:application -c config/gunicorn.py -k uvicorn_worker.UvicornWorker
+
+O Django atende cada requisição em sua própria thread (as views são
+síncronas) enquanto o event loop cuida das conexões; ``LimiteConcorrencia``
+segura quantas podem esperar pelo EOL ao mesmo tempo e ``Lifespan`` aquece a
+aplicação e abre/fecha a sessão HTTP do SME.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
 """
 
+import asyncio
+import logging
 import os
 
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.local')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+logger = logging.getLogger(__name__)
+
+
+class LimiteConcorrencia:
+    """
+    Limita as requisições HTTP simultâneas por worker.
+
+    Acima do limite a requisição espera por uma vaga até ``espera_maxima``
+    segundos e então recebe 503 com Retry-After, em vez de acumular threads
+    bloqueadas no EOL.
+    """
+
+    def __init__(self, app, max_concorrencia, espera_maxima):
+        self.app = app
+        self.espera_maxima = espera_maxima
+        self.semaforo = asyncio.Semaphore(max_concorrencia)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        try:
+            await asyncio.wait_for(self.semaforo.acquire(), timeout=self.espera_maxima)
+        except asyncio.TimeoutError:
+            logger.warning("Limite de concorrência atingido: %s %s", scope["method"], scope["path"])
+            return await self._responder_ocupado(send)
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.semaforo.release()
+
+    async def _responder_ocupado(self, send):
+        corpo = b'{"detail": "Servidor ocupado, tente novamente."}'
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(corpo)).encode()),
+                (b"retry-after", b"1"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": corpo})
+
+
+class Lifespan:
+    """ Trata o protocolo lifespan, que o ASGIHandler do Django não suporta. """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "lifespan":
+            return await self.app(scope, receive, send)
+
+        while True:
+            mensagem = await receive()
+            if mensagem["type"] == "lifespan.startup":
+                try:
+                    await sync_to_async(iniciar)()
+                except Exception as e:
+                    logger.exception("Falha no startup ASGI")
+                    await send({"type": "lifespan.startup.failed", "message": str(e)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif mensagem["type"] == "lifespan.shutdown":
+                await sync_to_async(encerrar)()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+def iniciar():
+    from apps.helpers.cliente_sme import sessao_sme
+    from apps.helpers.configuracao_sme import configuracao_sme
+    from config.aquecimento import aquecer
+
+    aquecer()
+    configuracao_sme()
+    sessao_sme()
+
+
+def encerrar():
+    from django.db import connections
+    from apps.helpers.cliente_sme import fechar_sessao_sme
+
+    fechar_sessao_sme()
+    connections.close_all()
+
+
+application = Lifespan(
+    LimiteConcorrencia(
+        django_application,
+        max_concorrencia=settings.ASGI_MAX_CONCORRENCIA,
+        espera_maxima=settings.ASGI_ESPERA_MAXIMA,
+    )
+)
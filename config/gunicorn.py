@@ -0,0 +1,48 @@
+"""
+Configuração do gunicorn.
+
+Uso:
+    gunicorn config.wsgi:application -c config/gunicorn.py                  (SERVIDOR_MODO=wsgi)
+    SERVIDOR_MODO=asgi gunicorn config.asgi:application -c config/gunicorn.py
+
+Os valores podem ser ajustados pelas variáveis GUNICORN_* sem rebuild da imagem.
+"""
+import os
+
+# wsgi: workers gthread (uma thread por requisição em andamento)
+# asgi: workers uvicorn com event loop; o limite de concorrência fica em ASGI_MAX_CONCORRENCIA
+SERVIDOR_MODO = os.environ.get("SERVIDOR_MODO", "wsgi")
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+worker_class = os.environ.get(
+    "GUNICORN_WORKER_CLASS",
+    "uvicorn_worker.UvicornWorker" if SERVIDOR_MODO == "asgi" else "gthread",
+)
+workers = int(os.environ.get("GUNICORN_WORKERS", 4))
+threads = int(os.environ.get("GUNICORN_THREADS", 2))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 120))
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", 30))
+# Estáticos (FileResponse do WhiteNoise) saem via sendfile(), sem cópia pelo
+# processo Python; os workers uvicorn (asgi) não suportam e fazem streaming.
+sendfile = True
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 0))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", 0))
+
+# Com preload o master importa e aquece a aplicação uma vez e os workers
+# são criados por fork já prontos (ver config/aquecimento.py).
+preload_app = os.environ.get("GUNICORN_PRELOAD", "false").lower() in ("1", "true", "yes")
+
+
+def when_ready(server):
+    if server.cfg.preload_app:
+        from config.aquecimento import aquecer
+
+        aquecer()
+
+
+def child_exit(server, worker):
+    """ Remove as métricas "live" do worker encerrado (prometheus multiprocess). """
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
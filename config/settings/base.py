@@ -1,6 +1,7 @@
 from pathlib import Path
 import environ
 from datetime import timedelta
+from corsheaders.defaults import default_headers
 import os
 
 # Paths
@@ -56,6 +57,8 @@ INSTALLED_APPS = [
     'apps.usuarios',
     'apps.alteracao_email',
     'apps.designacao',
+    'apps.monitoramento',
+    'apps.desempenho',
 
 ]
 
@@ -64,8 +67,13 @@ AUTH_USER_MODEL = "usuarios.User"
 
 # Middleware (corsheaders deve vir antes do CommonMiddleware)
 MIDDLEWARE = [
+    'apps.monitoramento.middleware.MetricasMiddleware',
+    'apps.monitoramento.middleware.InstrumentacaoMiddleware',
+    'apps.monitoramento.middleware.OrcamentoConsultasMiddleware',
+    'apps.helpers.compressao.CompressaoMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -114,8 +122,16 @@ USE_I18N = True
 USE_TZ = True
 
 # Static & Media
+# Estáticos servidos pelo WhiteNoise: nomes com hash (manifest) e versões .gz/.br
+# geradas no collectstatic (build da imagem). Arquivos com hash recebem
+# Cache-Control de 10 anos + immutable; os demais, WHITENOISE_MAX_AGE.
 STATIC_ROOT = BASE_DIR / "staticfiles"
 STATIC_URL = "/static/"
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"},
+}
+WHITENOISE_MAX_AGE = env.int('WHITENOISE_MAX_AGE', default=3600)
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
@@ -123,12 +139,35 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Django REST Framework + Simple JWT (autenticação via Bearer tokens)
 REST_FRAMEWORK = {
+    # JWT do Simple JWT, recusando tokens revogados (apps/usuarios/services/revogacao_service.py)
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.usuarios.api.authentication.JWTRevogavelAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    # orjson com fallback para a stdlib (apps/helpers/renderers.py)
+    'DEFAULT_RENDERER_CLASSES': (
+        'apps.helpers.renderers.JSONRapidoRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'apps.helpers.renderers.JSONRapidoParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+    # Limites por IP e por RF (apps/helpers/throttles.py), em janela deslizante no
+    # cache padrão. Formato "N/período": "20/m", "10/15m". Vazio desliga o limite.
+    'DEFAULT_THROTTLE_RATES': {
+        'login_ip': env('THROTTLE_LOGIN_IP', default='30/m'),
+        'login_rf': env('THROTTLE_LOGIN_RF', default='10/15m'),
+        'esqueci_senha_ip': env('THROTTLE_ESQUECI_SENHA_IP', default='10/m'),
+        'esqueci_senha_rf': env('THROTTLE_ESQUECI_SENHA_RF', default='3/15m'),
+    },
+    # Proxies reversos confiáveis à frente da aplicação. 0 (padrão): o IP é o REMOTE_ADDR
+    # e o X-Forwarded-For é ignorado (o cliente pode forjá-lo). N > 0: o IP é o N-ésimo
+    # endereço do X-Forwarded-For contando do fim, o que o último proxy acrescentou.
+    'NUM_PROXIES': env.int('NUM_PROXIES', default=0),
 }
 
 SIMPLE_JWT = {
@@ -139,9 +178,77 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+# Assinatura dos tokens: JWT_ALGORITMO (HS256 com o SECRET_KEY, ou RS256/ES256/EdDSA
+# com JWT_CHAVE_PRIVADA[_ARQUIVO]) é lido em apps/helpers/chaves_jwt.py. Com algoritmo
+# assimétrico as chaves públicas ficam em /.well-known/jwks.json, em cache HTTP por:
+JWKS_CACHE_MAX_AGE = env.int('JWKS_CACHE_MAX_AGE', default=3600)
+
+# Cookie HttpOnly com o refresh token, enviado pelo login e lido em /api/token/refresh/.
+# Com o front em outro site (domínio diferente) use SAMESITE=None (exige SECURE=True).
+REFRESH_COOKIE_NOME = env('REFRESH_COOKIE_NOME', default='signa_refresh')
+REFRESH_COOKIE_SECURE = env.bool('REFRESH_COOKIE_SECURE', default=not DEBUG)
+REFRESH_COOKIE_SAMESITE = env('REFRESH_COOKIE_SAMESITE', default='Lax')
+
+# Idempotency-Key nas mutações que chamam o SME (apps/helpers/idempotencia.py):
+# respostas de sucesso guardadas por RETENCAO segundos; execução em andamento por até TRAVA.
+IDEMPOTENCIA_RETENCAO = env.int('IDEMPOTENCIA_RETENCAO', default=86400)
+IDEMPOTENCIA_TRAVA = env.int('IDEMPOTENCIA_TRAVA', default=60)
+
+# Tokens revogados (logout, troca de senha) ficam no cache padrão, uma chave por jti/usuário;
+# cada processo confere o contador de revogações a cada REVOGACAO_SINCRONIZACAO segundos.
+REVOGACAO_SINCRONIZACAO = env.float('REVOGACAO_SINCRONIZACAO', default=2.0)
+
+# Pedidos de "esqueci minha senha", processados pelo worker (processar_recuperacoes_senha):
+# reservados por TRAVA segundos; falhas voltam à fila após ESPERA, 2*ESPERA, 4*ESPERA...
+# até TENTATIVAS.
+RECUPERACAO_SENHA_TRAVA = env.int('RECUPERACAO_SENHA_TRAVA', default=300)
+RECUPERACAO_SENHA_ESPERA = env.int('RECUPERACAO_SENHA_ESPERA', default=30)
+RECUPERACAO_SENHA_TENTATIVAS = env.int('RECUPERACAO_SENHA_TENTATIVAS', default=5)
+# Porta do /metrics próprio do worker (o processo não passa pelo /metrics do web); 0 desliga.
+RECUPERACAO_SENHA_METRICAS_PORTA = env.int('RECUPERACAO_SENHA_METRICAS_PORTA', default=9101)
+
 # CORS - permitir seu Next.js local
 CORS_ALLOWED_ORIGINS = env.list('CORS_ALLOWED_ORIGINS', default=[
     "http://localhost:3000",
 ])
 CORS_ALLOW_CREDENTIALS = env.bool('CORS_ALLOW_CREDENTIALS', default=True)
+CORS_ALLOW_HEADERS = (*default_headers, 'idempotency-key')
 # Em dev você pode também usar CORS_ALLOW_ALL_ORIGINS=True (não recomendado em produção)
+
+# Instrumentação de requisições (Server-Timing + log estruturado)
+# A taxa de amostragem vai de 0.0 (desligado) a 1.0 (todas as requisições)
+INSTRUMENTACAO_HABILITADA = env.bool('INSTRUMENTACAO_HABILITADA', default=True)
+INSTRUMENTACAO_TAXA_AMOSTRAGEM = env.float('INSTRUMENTACAO_TAXA_AMOSTRAGEM', default=0.1)
+# O Server-Timing expõe a qualquer cliente nomes de endpoints do EOL, consultas e tempos:
+# desligado por padrão, ligado em config/settings/local.py
+INSTRUMENTACAO_SERVER_TIMING = env.bool('INSTRUMENTACAO_SERVER_TIMING', default=False)
+
+# Métricas Prometheus (/metrics): exige "Authorization: Bearer <token>".
+# Obrigatório com DEBUG=False (system check monitoramento.E001)
+METRICAS_TOKEN = env('METRICAS_TOKEN', default='')
+
+# Orçamento de consultas SQL por endpoint: "desligado", "log" ou "erro"
+ORCAMENTO_CONSULTAS_MODO = env('ORCAMENTO_CONSULTAS_MODO', default='log')
+
+# Integração SME: conexões keep-alive mantidas por processo (apps.helpers.cliente_sme)
+SME_INTEGRACAO_POOL_CONEXOES = env.int('SME_INTEGRACAO_POOL_CONEXOES', default=20)
+
+# Modo ASGI (config/asgi.py): requisições simultâneas por worker e espera máxima
+# (segundos) por uma vaga antes de responder 503
+ASGI_MAX_CONCORRENCIA = env.int('ASGI_MAX_CONCORRENCIA', default=100)
+ASGI_ESPERA_MAXIMA = env.float('ASGI_ESPERA_MAXIMA', default=5.0)
+
+# Cache padrão, compartilhado entre os workers: redis://redis:6379/1. Sem CACHE_URL fica
+# em memória local de cada processo, o que só é aceito com DEBUG=True
+# (check usuarios.E003 em apps/helpers/cache_compartilhado.py).
+CACHES = {'default': env.cache('CACHE_URL', default='locmemcache://')}
+
+# Compressão gzip/br das respostas da API a partir deste tamanho (bytes)
+COMPRESSAO_TAMANHO_MINIMO = env.int('COMPRESSAO_TAMANHO_MINIMO', default=1024)
+
+# Listagens de DREs/UEs em cache (segundos), guardadas já comprimidas
+UNIDADES_CACHE_TIMEOUT = env.int('UNIDADES_CACHE_TIMEOUT', default=900)
+
+# Validade (segundos) dos perfis do CoreSSO guardados no login, usados pelo
+# PerfilSignaPermission quando o token não traz a claim "perfis"
+PERFIS_SIGNA_TTL = env.int('PERFIS_SIGNA_TTL', default=43200)
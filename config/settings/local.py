@@ -16,6 +16,10 @@ EMAIL_BACKEND = env(
     "DJANGO_EMAIL_BACKEND", default="django.core.mail.backends.console.EmailBackend",
 )
 
+# Em desenvolvimento todas as requisições são instrumentadas
+INSTRUMENTACAO_TAXA_AMOSTRAGEM = env.float('INSTRUMENTACAO_TAXA_AMOSTRAGEM', default=1.0)
+INSTRUMENTACAO_SERVER_TIMING = env.bool('INSTRUMENTACAO_SERVER_TIMING', default=True)
+
 
 # Exemplo:
 # INSTALLED_APPS += ["debug_toolbar"]
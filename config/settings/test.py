@@ -12,3 +12,16 @@ DATABASES = {
         "NAME": ":memory:",
     }
 }
+
+# Requisições que excedem o orçamento de consultas da view falham nos testes
+ORCAMENTO_CONSULTAS_MODO = "erro"
+
+# Sem manifest nos testes (não há collectstatic)
+STORAGES = {
+    **STORAGES,
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+
+# Testes e comandos de medição rodam num processo só: o cache em memória local basta,
+# e o /metrics sem token é exercitado pelos próprios testes
+SILENCED_SYSTEM_CHECKS = ["usuarios.E003", "monitoramento.E001"]
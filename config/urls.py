@@ -1,11 +1,16 @@
 from django.urls import path, include
 from django.contrib import admin
-from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from rest_framework_simplejwt.views import TokenObtainPairView
+
+from apps.usuarios.api.views.token_view import JwksView, RenovarTokenView
 
 urlpatterns = [
     # Endpoints JWT (Simple JWT)
     path('api/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
-    path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    # Renovação sem banco nem CoreSSO (refresh token em cookie HttpOnly emitido no login)
+    path('api/token/refresh/', RenovarTokenView.as_view(), name='token_refresh'),
+    # Chaves públicas para validar os tokens fora daqui (JWT_ALGORITMO assimétrico)
+    path('.well-known/jwks.json', JwksView.as_view(), name='jwks'),
 
     # APIs da sua app (apps.usuarios)
     path('api/usuario/', include('apps.usuarios.urls')),
@@ -19,6 +24,9 @@ urlpatterns = [
     # APIs da sua app (apps.unidades)
     path("api/unidades/", include("apps.unidades.urls", namespace="unidades")),
 
+    # Métricas Prometheus (apps.monitoramento)
+    path("metrics", include("apps.monitoramento.urls", namespace="monitoramento")),
+
     # não enviar para produção
     path("admin/", admin.site.urls),
 ]
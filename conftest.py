@@ -0,0 +1,26 @@
+import pytest
+from django.core.cache import cache
+
+from apps.helpers.chaves_jwt import descartar_chaves_jwt
+from apps.helpers.configuracao_sme import descartar_configuracao_sme
+from apps.usuarios.services.revogacao_service import RevogacaoService
+
+
+@pytest.fixture(autouse=True)
+def configuracao_sme_do_teste():
+    """ Cada teste relê a configuração da integração SME e as chaves JWT do ambiente (monkeypatch/patch). """
+    descartar_configuracao_sme()
+    descartar_chaves_jwt()
+    yield
+    descartar_configuracao_sme()
+    descartar_chaves_jwt()
+
+
+@pytest.fixture(autouse=True)
+def cache_limpo():
+    """ O cache local (listagens de unidades, revogações etc.) não pode vazar entre testes. """
+    cache.clear()
+    RevogacaoService.descartar_estado_local()
+    yield
+    cache.clear()
+    RevogacaoService.descartar_estado_local()
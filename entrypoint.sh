@@ -8,13 +8,14 @@ set -e
 # done
 
 python manage.py migrate --noinput
-python manage.py collectstatic --noinput
-
-exec gunicorn config.wsgi:application \
-  --bind 0.0.0.0:8000 \
-  --workers ${GUNICORN_WORKERS:-4} \
-  --threads ${GUNICORN_THREADS:-2} \
-  --timeout ${GUNICORN_TIMEOUT:-120}
-
 
+# métricas prometheus compartilhadas entre os workers (limpas a cada boot)
+export PROMETHEUS_MULTIPROC_DIR=${PROMETHEUS_MULTIPROC_DIR:-/tmp/prometheus_multiproc}
+rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
 
+# SERVIDOR_MODO=asgi sobe config.asgi com workers uvicorn (ver config/gunicorn.py)
+if [ "${SERVIDOR_MODO:-wsgi}" = "asgi" ]; then
+  exec gunicorn config.asgi:application -c config/gunicorn.py
+fi
+exec gunicorn config.wsgi:application -c config/gunicorn.py